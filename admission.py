@@ -0,0 +1,123 @@
+"""
+Ingest admission control for KIU Meeting Intelligence System
+
+Each recording in the pipeline holds threads, disk and OpenAI quota in
+proportion to its length, so the in-flight budget is counted in
+audio-minutes rather than requests. Uploads that do not fit wait in a
+short queue that admits the shortest recording first; when the queue is
+full or the wait times out, the caller is told how long to back off.
+Budgets are per process.
+"""
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+import wave
+from typing import Callable, Optional, Tuple
+
+MB_PER_AUDIO_MINUTE = 1.0  # compressed uploads (mp3/m4a at ~128 kbit/s)
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 300
+
+def minutes_for_size(size: int) -> float:
+    """Rough length of a compressed recording of this many bytes"""
+    return size / (1024 * 1024) / MB_PER_AUDIO_MINUTE
+
+def estimate_audio_minutes(path: str) -> float:
+    """Length of a recording in minutes: exact from a WAV header, otherwise from its size"""
+    if path.lower().endswith('.wav'):
+        try:
+            with wave.open(path, 'rb') as source:
+                return source.getnframes() / source.getframerate() / 60
+        except (wave.Error, EOFError, OSError):
+            pass
+    return minutes_for_size(os.path.getsize(path))
+
+class AdmissionController:
+    """Bounded in-flight budget in audio-minutes; waiting recordings are admitted shortest first"""
+
+    def __init__(self, budget_minutes: float, max_queued: int, seconds_per_minute: float = 10.0,
+                 on_change: Callable[[float, int], None] = None):
+        self.budget_minutes = budget_minutes
+        self.max_queued = max_queued
+        self.seconds_per_minute = seconds_per_minute  # moving average of processing time per audio-minute
+        self._on_change = on_change
+        self._condition = threading.Condition()
+        self._in_flight = 0.0
+        self._waiting = []  # heap of (cost, arrival)
+        self._arrivals = itertools.count()
+
+    @property
+    def in_flight_minutes(self) -> float:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiting)
+
+    def cost(self, minutes: float) -> float:
+        # A recording longer than the whole budget runs once nothing else is in flight
+        return min(max(minutes, 0.0), self.budget_minutes)
+
+    def queue_full(self) -> bool:
+        return len(self._waiting) >= self.max_queued
+
+    def acquire(self, minutes: float, timeout: float) -> Optional[Tuple[float, float, float]]:
+        """Reserve budget for a recording, waiting up to timeout seconds; None if refused"""
+        cost = self.cost(minutes)
+        with self._condition:
+            if self._fits(cost) and (not self._waiting or cost < self._waiting[0][0]):
+                return self._admit(cost, minutes)
+            if timeout <= 0 or self.queue_full():
+                return None
+
+            entry = (cost, next(self._arrivals))
+            heapq.heappush(self._waiting, entry)
+            self._changed()
+            deadline = time.monotonic() + timeout
+            while not (self._waiting[0] == entry and self._fits(cost)):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self._changed()
+                    self._condition.notify_all()  # the next waiter may now be at the head
+                    return None
+                self._condition.wait(remaining)
+
+            heapq.heappop(self._waiting)
+            self._condition.notify_all()  # the next shortest may fit as well
+            return self._admit(cost, minutes)
+
+    def release(self, ticket: Tuple[float, float, float]):
+        """Return a recording's budget and learn how long it took per audio-minute"""
+        cost, minutes, started = ticket
+        with self._condition:
+            self._in_flight = max(round(self._in_flight - cost, 6), 0.0)
+            if minutes >= 1:
+                elapsed = time.monotonic() - started
+                self.seconds_per_minute = 0.8 * self.seconds_per_minute + 0.2 * elapsed / minutes
+            self._changed()
+            self._condition.notify_all()
+
+    def retry_after(self, minutes: float) -> int:
+        """Seconds until a recording of this length is likely to be admitted"""
+        cost = self.cost(minutes)
+        with self._condition:
+            ahead = sum(queued for queued, _ in self._waiting if queued <= cost)
+            backlog = max(self._in_flight + ahead + cost - self.budget_minutes, 0.0)
+        return int(min(max(math.ceil(backlog * self.seconds_per_minute), MIN_RETRY_AFTER), MAX_RETRY_AFTER))
+
+    def _fits(self, cost: float) -> bool:
+        return self._in_flight + cost <= self.budget_minutes
+
+    def _admit(self, cost: float, minutes: float) -> Tuple[float, float, float]:
+        self._in_flight = round(self._in_flight + cost, 6)
+        self._changed()
+        return cost, minutes, time.monotonic()
+
+    def _changed(self):
+        if self._on_change:
+            self._on_change(self._in_flight, len(self._waiting))
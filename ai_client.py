@@ -0,0 +1,64 @@
+"""
+Async OpenAI client runtime for KIU Meeting Intelligence System
+
+Every OpenAI call runs as a coroutine on one background event loop that
+owns a single AsyncOpenAI client. Concurrent uploads, imports and searches
+therefore share one HTTP connection pool, and a waiting API call costs a
+coroutine rather than a blocked thread. Synchronous callers (Flask views,
+the importer, the re-index job) hand coroutines to run() and wait for the
+result. openai and httpx are only imported when the first call is made.
+"""
+import asyncio
+import os
+import sys
+import threading
+
+class AsyncOpenAIRunner:
+    """Background event loop plus a lazily created, shared AsyncOpenAI client"""
+
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self._lock = threading.Lock()
+        self._loop = None
+        self._client = None
+        self._pid = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # A forked worker inherits the attribute but not the loop's thread
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='openai-event-loop', daemon=True).start()
+                self._loop, self._client, self._pid = loop, None, os.getpid()
+            return self._loop
+
+    @property
+    def client(self):
+        """Shared openai.AsyncOpenAI, built on first use from the module-level openai settings"""
+        if self._client is None:
+            import httpx
+            import openai
+
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_keepalive_connections)
+            self._client = openai.AsyncOpenAI(
+                api_key=openai.api_key,
+                base_url=openai.base_url,
+                max_retries=openai.max_retries,
+                http_client=openai.DefaultAsyncHttpxClient(limits=limits)
+            )
+        return self._client
+
+    def has_api_key(self) -> bool:
+        """Whether an API key is configured, without importing openai"""
+        openai = sys.modules.get('openai')
+        return bool((openai and openai.api_key) or os.getenv('OPENAI_API_KEY'))
+
+    def reset(self):
+        """Drop the client so the next call picks up changed openai settings"""
+        self._client = None
+
+    def run(self, coroutine, timeout: float = None):
+        """Run a coroutine on the shared loop and block until it finishes"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop()).result(timeout)
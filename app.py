@@ -1,17 +1,42 @@
-from flask import Flask, request, jsonify, render_template, send_file
+from flask import Flask, request, jsonify, render_template, send_file, g, Response
 from flask_cors import CORS
-import openai
 import os
 import sqlite3
 import json
-import numpy as np
 from datetime import datetime
 import io
 import base64
+import functools
+import gzip
+import hashlib
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 import logging
-from typing import List, Dict, Any
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
+import asyncio
+import contextvars
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+import metrics
+import topic_model
+from admission import AdmissionController, estimate_audio_minutes, minutes_for_size
+from ai_client import AsyncOpenAIRunner
+from audio_preprocess import PreparedAudio, prepare_audio
+from model_router import (ModelRouter, OutputValidationError, estimate_tokens, meeting_type, validate_extraction,
+                          validate_summary)
+from search_cache import SearchResultCache, normalize_query
+from search_index import SearchIndex
+from shards import (ShardManager, UnknownTenantError, current_shard, set_current_shard, sqlite_path, use_shard,
+                    valid_tenant)
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
 
 # Load environment variables
 load_dotenv()
@@ -23,8 +48,11 @@ CORS(app)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# OpenAI configuration
-openai.api_key = os.getenv('OPENAI_API_KEY')
+# OpenAI configuration (the client reads OPENAI_API_KEY). openai, numpy and
+# Pillow are imported on first use to keep process and worker start-up fast.
+# All API calls share one event loop and connection pool
+OPENAI_MAX_CONNECTIONS = int(os.getenv('OPENAI_MAX_CONNECTIONS', 100))
+OPENAI_RUNNER = AsyncOpenAIRunner(max_connections=OPENAI_MAX_CONNECTIONS)
 
 # File upload configuration
 UPLOAD_FOLDER = 'uploads'
@@ -35,14 +63,399 @@ app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max file size
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Database configuration: the default database, used by requests that name no tenant
+DATABASE = sqlite_path(os.getenv('DATABASE_URL', 'sqlite:///meetings.db'))
+app.config['DATABASE'] = DATABASE
+
+# Multi-tenant sharding: each tenant's meetings live in <TENANT_DATA_FOLDER>/<tenant>.db
+TENANT_HEADER = 'X-Tenant'
+TENANT_SEARCH_MAX_SHARDS = 20  # tenants one cross-shard search may fan out to
+TENANT_SEARCH_WORKERS = 8
+app.config['TENANT_DATA_FOLDER'] = os.getenv('TENANT_DATA_FOLDER', 'tenants')
+app.config['TENANT_MAX_OPEN_SHARDS'] = int(os.getenv('TENANT_MAX_OPEN_SHARDS', 32))  # per process
+SHARDS = ShardManager(app.config['TENANT_MAX_OPEN_SHARDS'])
+
+# Embeddings configuration
+EMBEDDING_BATCH_SIZE = 64  # chunks sent per embeddings API call
+app.config['EMBEDDING_MODEL'] = os.getenv('EMBEDDING_MODEL', 'text-embedding-ada-002')
+app.config['EMBEDDING_CHUNK_SIZE'] = int(os.getenv('EMBEDDING_CHUNK_SIZE', 1000))
+app.config['REINDEX_BATCH_SIZE'] = int(os.getenv('REINDEX_BATCH_SIZE', 10))  # meetings per batch
+app.config['REINDEX_PAUSE_SECONDS'] = float(os.getenv('REINDEX_PAUSE_SECONDS', 1.0))
+_reindex_states = {}  # database file -> progress of its re-index job
+_reindex_lock = threading.Lock()
+
+# Chunk embeddings of the default database held in memory for search; preloaded before forking in
+# production. Tenant shards each keep their own index (shards.py)
+SEARCH_INDEX = SearchIndex()
+SEARCH_RESULTS_LIMIT = 10
+SEARCH_MAX_RESULTS = 50
+
+# Retention and storage tiering (a 0 day limit disables that rule)
+app.config['VISUALS_FOLDER'] = os.getenv('VISUALS_FOLDER', 'static/visuals')  # served under /static/visuals
+app.config['AUDIO_COLD_FOLDER'] = os.getenv('AUDIO_COLD_FOLDER', '')  # default: <UPLOAD_FOLDER>/cold
+app.config['AUDIO_COLD_AFTER_DAYS'] = int(os.getenv('AUDIO_COLD_AFTER_DAYS', 30))
+app.config['AUDIO_RETENTION_DAYS'] = int(os.getenv('AUDIO_RETENTION_DAYS', 0))
+app.config['MEETING_RETENTION_DAYS'] = int(os.getenv('MEETING_RETENTION_DAYS', 0))
+app.config['DROP_AUDIO_AFTER_TRANSCRIPTION'] = os.getenv('DROP_AUDIO_AFTER_TRANSCRIPTION', 'False').lower() == 'true'
+VACUUM_PAGES_PER_STEP = 2000  # pages freed per incremental_vacuum call between lock releases
+
+# Precomputed "similar meetings" neighbor lists
+SIMILAR_MEETINGS_K = 10
+
+# /search result cache, invalidated by the corpus version
+app.config['SEARCH_CACHE_SIZE'] = int(os.getenv('SEARCH_CACHE_SIZE', 256))  # entries per process
+app.config['SEARCH_CACHE_TTL'] = int(os.getenv('SEARCH_CACHE_TTL', 300))  # seconds
+app.config['SEARCH_CACHE_SHARED'] = os.getenv('SEARCH_CACHE_SHARED', 'False').lower() == 'true'
+SEARCH_CACHE = SearchResultCache(app.config['SEARCH_CACHE_SIZE'], app.config['SEARCH_CACHE_TTL'])
+
+# Pagination for list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+ACTION_ITEM_STATUSES = ('open', 'in_progress', 'done')
+
+# Transcript paging configuration (characters)
+TRANSCRIPT_PAGE_SIZE = 20000
+TRANSCRIPT_MAX_PAGE_SIZE = 200000
+
+# Time-indexed transcript segments (from Whisper's verbose_json output)
+TRANSCRIPT_MAX_SEGMENTS = 2000  # segments returned per time-slice request
+SPEAKER_TURN_GAP_SECONDS = 1.0  # a pause this long is treated as a change of speaker
+app.config['SPEAKER_LABELS'] = os.getenv('SPEAKER_LABELS', 'True').lower() == 'true'
+
+# Recording playback
+AUDIO_MIMETYPES = {'.mp3': 'audio/mpeg', '.wav': 'audio/wav', '.m4a': 'audio/mp4', '.ogg': 'audio/ogg'}
+AUDIO_BLOCK_SIZE = 64 * 1024
+app.config['AUDIO_CACHE_MAX_AGE'] = int(os.getenv('AUDIO_CACHE_MAX_AGE', 24 * 3600))  # seconds
+
+# Local audio preprocessing before transcription (mono, 16kHz, silence removed)
+app.config['AUDIO_PREPROCESS'] = os.getenv('AUDIO_PREPROCESS', 'False').lower() == 'true'
+
+# Chat model routing per analysis task (rules and ladder in model_router.py)
+app.config['MODEL_ROUTES'] = os.getenv('MODEL_ROUTES', '')  # JSON {task: [rule, ...]}, replaces that task's rules
+app.config['MODEL_ESCALATION'] = os.getenv('MODEL_ESCALATION', '')  # comma-separated models, cheapest first
+
+# Checkpointed ingest pipeline: stage -> meeting status once it (and every stage before it) finished
+PIPELINE_STAGES = ('transcript', 'analysis', 'visual', 'embeddings', 'task_embeddings')
+PIPELINE_STATUSES = {'transcript': 'transcribed', 'analysis': 'analyzed', 'visual': 'visualized', 'embeddings': 'embedded',
+                     'task_embeddings': 'tasks_embedded'}
+app.config['RESUME_AFTER_MINUTES'] = int(os.getenv('RESUME_AFTER_MINUTES', 30))  # idle unfinished meetings count as crashed
+
+# Topic clustering of chunk embeddings: mini-batch k-means, updated by each ingest
+TOPIC_SEED_CHUNKS_PER_TOPIC = 4  # chunks a model needs per topic before its centroids are seeded
+TOPIC_FIT_SAMPLE = 5000  # chunks sampled to seed and fit the centroids
+TOPIC_TREND_WEEKS = 12
+TOPIC_TOP_MEETINGS = 3
+app.config['TOPIC_COUNT'] = int(os.getenv('TOPIC_COUNT', 12))
+_topics_cache = {}  # database -> ((model, corpus version), payload)
+_topics_cache_lock = threading.Lock()
+
+# Cross-meeting task ledger: action items are matched to open tasks of the same owner by task text embedding
+TASK_MATCH_MAX_CANDIDATES = 500  # most recently seen open tasks of an owner compared per ingest
+UNASSIGNED_OWNERS = {'', 'unassigned', 'tbd', 'none', 'n/a'}
+app.config['TASK_MATCH_THRESHOLD'] = float(os.getenv('TASK_MATCH_THRESHOLD', 0.9))  # cosine similarity
+
+# Ingest admission control (per process): recordings in flight, measured in audio-minutes
+app.config['INGEST_BUDGET_MINUTES'] = float(os.getenv('INGEST_BUDGET_MINUTES', 180))
+app.config['INGEST_MAX_QUEUED'] = int(os.getenv('INGEST_MAX_QUEUED', 2))
+app.config['INGEST_QUEUE_TIMEOUT'] = float(os.getenv('INGEST_QUEUE_TIMEOUT', 30))  # seconds
+
+# Meeting list cards show a summary snippet computed at ingest
+SUMMARY_SNIPPET_LENGTH = 150
+SUMMARY_TRANSCRIPT_CHARS = 2000  # leading part of the transcript the summary model is given
+
+# Fine-tuning export configuration
+FINE_TUNE_BATCH_SIZE = 100  # meetings read and written per export batch
+# The default database's file; each tenant exports to <folder>/<tenant>/<name> next to it
+app.config['FINE_TUNE_EXPORT_PATH'] = os.getenv('FINE_TUNE_EXPORT_PATH', os.path.join('exports', 'fine_tune.jsonl'))
+_fine_tune_export_locks = {}  # export path -> lock held while appending to it
+_fine_tune_export_lock = threading.Lock()
+
+# (example type, user prompt prefix, system prompt) for each fine-tuning example per meeting
+FINE_TUNE_EXAMPLES = (
+    ('summary', 'Summarize this meeting transcript: ',
+     'You are an expert meeting summarizer. Create concise, actionable summaries.'),
+    ('action_items', 'Extract action items from: ',
+     'You extract action items with owners, deadlines and priorities from meeting transcripts as JSON.'),
+)
+
+# Analytics configuration
+app.config['ANALYTICS_CACHE_TTL'] = int(os.getenv('ANALYTICS_CACHE_TTL', 30))  # seconds
+_analytics_cache = {}  # database -> (payload, expires at)
+_analytics_cache_lock = threading.Lock()
+
+# Response compression and static asset caching
+app.config['COMPRESSION_MIN_SIZE'] = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))  # bytes
+app.config['STATIC_CACHE_MAX_AGE'] = int(os.getenv('STATIC_CACHE_MAX_AGE', 365 * 24 * 3600))  # seconds
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/javascript', 'text/javascript', 'text/css',
+    'text/html', 'text/plain', 'image/svg+xml'
+}
+_static_hashes = {}  # filename -> (mtime, content hash)
+_static_compressed = {}  # (filename, encoding) -> (mtime, compressed body)
+
+# Visual summary thumbnails
+VISUAL_THUMBNAIL_SIZE = 384  # pixels on the longest side
+VISUAL_THUMBNAIL_QUALITY = 80
+
+# Approximate OpenAI list prices (USD) used to track API spend
+API_PRICING = {
+    'whisper-1': {'per_minute': 0.006},
+    'gpt-4': {'prompt_per_1k': 0.03, 'completion_per_1k': 0.06},
+    'gpt-4o': {'prompt_per_1k': 0.0025, 'completion_per_1k': 0.01},
+    'gpt-4o-mini': {'prompt_per_1k': 0.00015, 'completion_per_1k': 0.0006},
+    'gpt-3.5-turbo': {'prompt_per_1k': 0.0005, 'completion_per_1k': 0.0015},
+    'text-embedding-ada-002': {'prompt_per_1k': 0.0001},
+    'text-embedding-3-small': {'prompt_per_1k': 0.00002},
+    'text-embedding-3-large': {'prompt_per_1k': 0.00013},
+    'dall-e': {'per_image': 0.02},
+}
+
+# Instrumentation exported at /metrics
+PIPELINE_STAGE_SECONDS = metrics.histogram(
+    'meeting_pipeline_stage_seconds', 'Time spent in each ingest pipeline stage', ('stage',))
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by endpoint', ('method', 'endpoint', 'status'))
+SQLITE_QUERY_SECONDS = metrics.histogram(
+    'sqlite_query_duration_seconds', 'SQLite statement execution time', ('operation',),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1))
+OPENAI_REQUESTS = metrics.counter(
+    'openai_requests_total', 'OpenAI API calls', ('operation', 'model'))
+OPENAI_TOKENS = metrics.counter(
+    'openai_tokens_total', 'OpenAI tokens consumed', ('model', 'kind'))
+OPENAI_BYTES = metrics.counter(
+    'openai_bytes_total', 'Payload bytes exchanged with OpenAI', ('operation', 'direction'))
+SEARCH_CACHE_REQUESTS = metrics.counter(
+    'search_cache_requests_total', 'Search result cache lookups', ('result',))
+AUDIO_PREPROCESS_RESULTS = metrics.counter(
+    'audio_preprocess_total', 'Uploads run through local audio preprocessing', ('result',))
+AUDIO_PREPROCESS_BYTES = metrics.counter(
+    'audio_preprocess_bytes_total', 'Audio bytes before and after local preprocessing', ('stage',))
+AUDIO_PREPROCESS_SECONDS = metrics.counter(
+    'audio_preprocess_audio_seconds_total', 'Audio duration before and after silence removal', ('stage',))
+ANALYSIS_MODEL_ROUTES = metrics.counter(
+    'analysis_model_routes_total', 'Chat model chosen for each analysis task', ('task', 'model', 'reason'))
+ANALYSIS_MODEL_ESCALATIONS = metrics.counter(
+    'analysis_model_escalations_total', 'Analysis retried on a stronger model after invalid output',
+    ('task', 'from_model', 'to_model'))
+ANALYSIS_MODEL_SECONDS = metrics.histogram(
+    'analysis_model_request_seconds', 'Chat completion latency per analysis task and model', ('task', 'model'))
+ANALYSIS_MODEL_COST = metrics.counter(
+    'analysis_model_cost_usd_total', 'Estimated chat spend per analysis task and model', ('task', 'model'))
+INGEST_ADMISSIONS = metrics.counter(
+    'ingest_admissions_total', 'Upload admission decisions', ('result',))
+INGEST_QUEUE_DEPTH = metrics.gauge(
+    'ingest_queue_depth', 'Uploads waiting for ingest budget')
+INGEST_IN_FLIGHT_MINUTES = metrics.gauge(
+    'ingest_in_flight_audio_minutes', 'Audio-minutes currently being processed')
+
+def record_ingest_load(in_flight_minutes: float, queued: int):
+    INGEST_IN_FLIGHT_MINUTES.set(round(in_flight_minutes, 2))
+    INGEST_QUEUE_DEPTH.set(queued)
+
+INGEST_ADMISSION = AdmissionController(app.config['INGEST_BUDGET_MINUTES'], app.config['INGEST_MAX_QUEUED'],
+                                       on_change=record_ingest_load)
+
+def compress_response(response):
+    """Compress a response body with brotli or gzip if the client accepts it (quality above 0)"""
+    accepted = request.accept_encodings
+    if 'Content-Encoding' in response.headers:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    if brotli is not None and accepted['br'] > 0:
+        encoding = 'br'
+    elif accepted['gzip'] > 0:
+        encoding = 'gzip'
+    else:
+        return response
+    
+    # Static files are served as passthrough file wrappers; read them in
+    response.direct_passthrough = False
+    if request.endpoint == 'static':
+        body = compressed_static_file(response, request.view_args['filename'], encoding)
+    else:
+        body = compress_body(response.get_data(), encoding)
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    
+    # The compressed bytes differ from the original, so the ETag can only be weak
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    return brotli.compress(body) if encoding == 'br' else gzip.compress(body, compresslevel=6)
+
+def compressed_static_file(response, filename: str, encoding: str) -> bytes:
+    """Compressed body of a static file response, cached until the file's mtime changes"""
+    try:
+        mtime = os.path.getmtime(os.path.join(app.static_folder, filename))
+    except OSError:
+        return compress_body(response.get_data(), encoding)
+    
+    cached = _static_compressed.get((filename, encoding))
+    if cached and cached[0] == mtime:
+        response.response.close()  # the file wrapper send_file opened is not read
+        return cached[1]
+    
+    body = compress_body(response.get_data(), encoding)
+    _static_compressed[(filename, encoding)] = (mtime, body)
+    return body
+
+def static_file_hash(filename: str):
+    """Short content hash of a static file, cached until its mtime changes"""
+    path = os.path.join(app.static_folder, filename)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    
+    cached = _static_hashes.get(filename)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    with open(path, 'rb') as f:
+        digest = hashlib.md5(f.read()).hexdigest()[:12]
+    _static_hashes[filename] = (mtime, digest)
+    return digest
+
+@functools.lru_cache(maxsize=None)
+def pillow_image():
+    """PIL.Image, imported on first use; None when Pillow is not installed"""
+    try:
+        from PIL import Image
+    except ImportError:  # Pillow is optional; without it the full PNG is served
+        return None
+    return Image
+
+def visual_thumbnail_path(visual_path: str) -> str:
+    """WebP thumbnail location for a visual summary PNG"""
+    directory, filename = os.path.split(visual_path)
+    return os.path.join(directory, 'thumbs', os.path.splitext(filename)[0] + '.webp')
+
+def existing_visual_thumbnail(visual_path: str) -> Optional[str]:
+    """The thumbnail the pipeline created for a visual summary, if any (the full PNG is served otherwise)"""
+    if not visual_path:
+        return None
+    thumbnail_path = visual_thumbnail_path(visual_path)
+    return thumbnail_path if os.path.exists(thumbnail_path) else None
+
+def create_visual_thumbnail(visual_path: str) -> str:
+    """Create (or reuse) a WebP thumbnail of a visual summary; returns '' if unavailable"""
+    Image = pillow_image()
+    if Image is None or not visual_path or not os.path.exists(visual_path):
+        return ""
+    
+    thumbnail_path = visual_thumbnail_path(visual_path)
+    if os.path.exists(thumbnail_path):
+        return thumbnail_path
+    
+    try:
+        os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+        with Image.open(visual_path) as image:
+            image.thumbnail((VISUAL_THUMBNAIL_SIZE, VISUAL_THUMBNAIL_SIZE))
+            image.save(thumbnail_path, 'WEBP', quality=VISUAL_THUMBNAIL_QUALITY)
+        return thumbnail_path
+    except Exception as e:
+        logger.error(f"Error creating visual thumbnail: {str(e)}")
+        return ""
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that records statement execution time"""
+    
+    def execute(self, sql, parameters=()):
+        with SQLITE_QUERY_SECONDS.time(operation=sql.split(None, 1)[0].upper()):
+            return super().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        with SQLITE_QUERY_SECONDS.time(operation=sql.split(None, 1)[0].upper()):
+            return super().executemany(sql, seq_of_parameters)
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including conn.execute) are instrumented"""
+    
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+def current_database() -> str:
+    """Database file of the current tenant's shard, or the default database"""
+    shard = current_shard()
+    return shard.path if shard else app.config['DATABASE']
+
+def current_search_index() -> SearchIndex:
+    shard = current_shard()
+    return shard.index if shard else SEARCH_INDEX
+
+def get_db_connection(database: str = None):
+    """Open a connection to the meetings database (the current tenant's shard unless given)"""
+    return sqlite3.connect(database or current_database(), timeout=30, factory=InstrumentedConnection)
+
+@contextmanager
+def pipeline_stage(stage: str):
+    """Time an ingest pipeline stage, exporting and logging the duration"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        PIPELINE_STAGE_SECONDS.observe(elapsed, stage=stage)
+        logger.info(f"Stage '{stage}' took {elapsed:.2f}s")
+
+def record_openai_usage(operation: str, model: str, response=None,
+                        bytes_sent: int = 0, bytes_received: int = 0):
+    """Count an OpenAI call along with its token usage and payload sizes"""
+    OPENAI_REQUESTS.inc(operation=operation, model=model)
+    
+    usage = getattr(response, 'usage', None)
+    for kind in ('prompt', 'completion'):
+        tokens = getattr(usage, f'{kind}_tokens', None)
+        if isinstance(tokens, int):
+            OPENAI_TOKENS.inc(tokens, model=model, kind=kind)
+    
+    if bytes_sent:
+        OPENAI_BYTES.inc(bytes_sent, operation=operation, direction='sent')
+    if bytes_received:
+        OPENAI_BYTES.inc(bytes_received, operation=operation, direction='received')
+
+def ensure_column(cursor, table: str, column: str, definition: str) -> bool:
+    """Add a column to an existing table if an older schema lacks it; True if added"""
+    cursor.execute(f'PRAGMA table_info({table})')
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+        return True
+    return False
+
+def estimate_api_cost(model: str, usage=None, minutes: float = 0, images: int = 0) -> float:
+    """Estimate the USD cost of an OpenAI call from its usage figures"""
+    pricing = API_PRICING.get(model, {})
+    cost = pricing.get('per_minute', 0) * minutes + pricing.get('per_image', 0) * images
+    
+    if usage is not None:
+        prompt_tokens = getattr(usage, 'prompt_tokens', 0)
+        completion_tokens = getattr(usage, 'completion_tokens', 0)
+        if isinstance(prompt_tokens, (int, float)):
+            cost += pricing.get('prompt_per_1k', 0) * prompt_tokens / 1000
+        if isinstance(completion_tokens, (int, float)):
+            cost += pricing.get('completion_per_1k', 0) * completion_tokens / 1000
+    
+    return cost
+
 def init_database():
     """Initialize SQLite database with required tables"""
-    conn = sqlite3.connect('meetings.db')
+    conn = get_db_connection()
     cursor = conn.cursor()
     
+    # Let deletes hand pages back to the filesystem with incremental_vacuum.
+    # New databases get it immediately; older ones on their next full VACUUM.
+    cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+    
+    # WAL lets the production server's worker processes read while one writes
+    cursor.execute('PRAGMA journal_mode=WAL')
+    
     # Meetings table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS meetings (
@@ -57,9 +470,42 @@ def init_database():
             duration_minutes INTEGER,
             audio_file_path TEXT,
             visual_summary_path TEXT,
+            api_cost REAL DEFAULT 0,
+            audio_hash TEXT,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP
         )
     ''')
+    ensure_column(cursor, 'meetings', 'api_cost', 'REAL DEFAULT 0')
+    ensure_column(cursor, 'meetings', 'audio_hash', 'TEXT')
+    ensure_column(cursor, 'meetings', 'audio_tier', "TEXT DEFAULT 'hot'")  # hot, cold or dropped
+    if ensure_column(cursor, 'meetings', 'summary_snippet', 'TEXT'):
+        rows = cursor.execute('SELECT id, summary FROM meetings').fetchall()
+        cursor.executemany('UPDATE meetings SET summary_snippet = ? WHERE id = ?',
+                           [(summary_snippet(summary), meeting_id) for meeting_id, summary in rows])
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_meetings_audio_hash ON meetings (audio_hash)')
+    
+    # Ingest progress: 'complete', or the last pipeline stage finished in order
+    ensure_column(cursor, 'meetings', 'status', "TEXT NOT NULL DEFAULT 'complete'")
+    ensure_column(cursor, 'meetings', 'status_updated_at', 'DATETIME')
+    ensure_column(cursor, 'meetings', 'pipeline_error', 'TEXT')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_meetings_unfinished ON meetings (status) WHERE status != 'complete'")
+    
+    # Order in which meetings were completed; a meeting created early may finish after later ones
+    if ensure_column(cursor, 'meetings', 'completion_seq', 'INTEGER'):
+        cursor.execute("UPDATE meetings SET completion_seq = id WHERE status = 'complete'")
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_meetings_completion_seq ON meetings (completion_seq)')
+    
+    # Output of each finished stage of an unfinished meeting, so a retry resumes from it
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pipeline_checkpoints (
+            meeting_id INTEGER NOT NULL,
+            stage TEXT NOT NULL,
+            output TEXT NOT NULL,
+            api_cost REAL DEFAULT 0,
+            completed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (meeting_id, stage)
+        ) WITHOUT ROWID
+    ''')
     
     # Embeddings table for semantic search
     cursor.execute('''
@@ -69,9 +515,119 @@ def init_database():
             text_chunk TEXT,
             embedding BLOB,
             chunk_index INTEGER,
+            model TEXT DEFAULT 'text-embedding-ada-002',
+            chunk_size INTEGER DEFAULT 1000,
+            FOREIGN KEY (meeting_id) REFERENCES meetings (id)
+        )
+    ''')
+    # Vectors written before these columns existed came from ada-002 with 1000-char chunks
+    ensure_column(cursor, 'meeting_embeddings', 'model', "TEXT DEFAULT 'text-embedding-ada-002'")
+    ensure_column(cursor, 'meeting_embeddings', 'chunk_size', 'INTEGER DEFAULT 1000')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_meeting_embeddings_version
+        ON meeting_embeddings (meeting_id, model, chunk_size)
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_meeting_embeddings_model ON meeting_embeddings (model)')
+    
+    # Transcript segments keyed by meeting and position; times are integer
+    # milliseconds, and char offsets map a search hit back to a timestamp
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS transcript_segments (
+            meeting_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            start_ms INTEGER NOT NULL,
+            end_ms INTEGER NOT NULL,
+            char_start INTEGER NOT NULL,
+            speaker TEXT,
+            text TEXT NOT NULL,
+            PRIMARY KEY (meeting_id, position)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_transcript_segments_time ON transcript_segments (meeting_id, start_ms)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_transcript_segments_char ON transcript_segments (meeting_id, char_start)')
+    
+    # Meeting-level centroid of the chunk vectors, and each meeting's nearest neighbors
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meeting_vectors'")
+    backfill_similarity = cursor.fetchone() is None
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS meeting_vectors (
+            meeting_id INTEGER PRIMARY KEY,
+            model TEXT NOT NULL,
+            vector BLOB NOT NULL,
+            chunks INTEGER NOT NULL,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (meeting_id) REFERENCES meetings (id)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_meeting_vectors_model ON meeting_vectors (model)')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS meeting_neighbors (
+            meeting_id INTEGER NOT NULL,
+            neighbor_id INTEGER NOT NULL,
+            similarity REAL NOT NULL,
+            PRIMARY KEY (meeting_id, neighbor_id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_meeting_neighbors_rank
+        ON meeting_neighbors (meeting_id, similarity DESC)
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_meeting_neighbors_neighbor ON meeting_neighbors (neighbor_id)')
+    
+    # Topic centroids per embedding model and each meeting's topic distribution
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'topics'")
+    backfill_topics = cursor.fetchone() is None
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS topics (
+            model TEXT NOT NULL,
+            topic_id INTEGER NOT NULL,
+            centroid BLOB NOT NULL,
+            chunks INTEGER NOT NULL DEFAULT 0,
+            terms TEXT NOT NULL DEFAULT '{}',
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (model, topic_id)
+        ) WITHOUT ROWID
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS meeting_topics (
+            meeting_id INTEGER NOT NULL,
+            topic_id INTEGER NOT NULL,
+            model TEXT NOT NULL,
+            week TEXT NOT NULL,
+            weight REAL NOT NULL,
+            chunks INTEGER NOT NULL DEFAULT 0,
+            terms TEXT NOT NULL DEFAULT '{}',
+            PRIMARY KEY (meeting_id, topic_id),
             FOREIGN KEY (meeting_id) REFERENCES meetings (id)
         )
     ''')
+    # What each meeting added to its topics' chunk and word counts, so a delete can take it back out
+    ensure_column(cursor, 'meeting_topics', 'chunks', 'INTEGER NOT NULL DEFAULT 0')
+    ensure_column(cursor, 'meeting_topics', 'terms', "TEXT NOT NULL DEFAULT '{}'")
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_meeting_topics_week ON meeting_topics (model, week)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_meeting_topics_topic ON meeting_topics (model, topic_id, weight DESC)')
+    
+    # Bumped whenever searchable content changes; keys the search result cache
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS corpus_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO corpus_version (id, version) VALUES (1, 0)')
+    
+    # Search results shared between worker processes (SEARCH_CACHE_SHARED)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS search_cache (
+            cache_key TEXT PRIMARY KEY,
+            corpus_version INTEGER NOT NULL,
+            results TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+    ''')
     
     # Fine-tuning data table
     cursor.execute('''
@@ -84,9 +640,382 @@ def init_database():
             FOREIGN KEY (meeting_id) REFERENCES meetings (id)
         )
     ''')
+    if ensure_column(cursor, 'fine_tuning_data', 'example_type', 'TEXT'):
+        # Classify and drop the duplicates older versions inserted on every call
+        cursor.execute('''
+            UPDATE fine_tuning_data SET example_type =
+                CASE WHEN prompt LIKE 'Summarize%' THEN 'summary' ELSE 'action_items' END
+        ''')
+        cursor.execute('''
+            DELETE FROM fine_tuning_data WHERE id NOT IN (
+                SELECT MIN(id) FROM fine_tuning_data GROUP BY meeting_id, example_type
+            )
+        ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_fine_tuning_data_example
+        ON fine_tuning_data (meeting_id, example_type)
+    ''')
+    
+    # High-water marks for incremental fine-tuning exports
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fine_tune_exports (
+            path TEXT PRIMARY KEY,
+            last_meeting_id INTEGER NOT NULL DEFAULT 0,
+            examples INTEGER NOT NULL DEFAULT 0,
+            bytes INTEGER NOT NULL DEFAULT 0,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    if ensure_column(cursor, 'fine_tune_exports', 'last_completion_seq', 'INTEGER NOT NULL DEFAULT 0'):
+        # Older marks are meeting ids, which completion_seq was backfilled from
+        cursor.execute('UPDATE fine_tune_exports SET last_completion_seq = last_meeting_id')
+    
+    # Normalized action items and decisions, populated at ingest
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'action_items'")
+    needs_backfill = cursor.fetchone() is None
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS action_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            meeting_id INTEGER NOT NULL,
+            position INTEGER,
+            task TEXT,
+            owner TEXT COLLATE NOCASE,
+            deadline TEXT,
+            due_date DATE,
+            priority TEXT COLLATE NOCASE,
+            status TEXT NOT NULL DEFAULT 'open',
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (meeting_id) REFERENCES meetings (id)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_action_items_owner ON action_items (owner, status, priority)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_action_items_priority ON action_items (priority, status)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_action_items_due_date ON action_items (due_date)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_action_items_meeting ON action_items (meeting_id)')
+    
+    # Deduplicated task ledger; each action item links to the task it mentions
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task TEXT,
+            owner TEXT COLLATE NOCASE,
+            owner_key TEXT NOT NULL DEFAULT '',
+            priority TEXT COLLATE NOCASE,
+            due_date DATE,
+            status TEXT NOT NULL DEFAULT 'open',
+            mentions INTEGER NOT NULL DEFAULT 0,
+            first_meeting_id INTEGER,
+            last_meeting_id INTEGER,
+            first_seen DATETIME DEFAULT CURRENT_TIMESTAMP,
+            last_seen DATETIME DEFAULT CURRENT_TIMESTAMP,
+            model TEXT,
+            vector BLOB
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_owner ON tasks (owner_key, status, last_seen)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status)')
+    ensure_column(cursor, 'action_items', 'task_id', 'INTEGER')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_action_items_task ON action_items (task_id)')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS decisions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            meeting_id INTEGER NOT NULL,
+            position INTEGER,
+            decision TEXT,
+            rationale TEXT,
+            impact TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (meeting_id) REFERENCES meetings (id)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_decisions_meeting ON decisions (meeting_id)')
+    
+    if needs_backfill:
+        rows = conn.execute('SELECT id, action_items, decisions FROM meetings')
+        for meeting_id, action_items, decisions in rows:
+            store_action_items_and_decisions(
+                cursor, meeting_id,
+                json.loads(action_items) if action_items else [],
+                json.loads(decisions) if decisions else []
+            )
+    
+    # Materialized analytics, maintained incrementally at ingest
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS analytics_totals (
+            name TEXT PRIMARY KEY,
+            value REAL NOT NULL DEFAULT 0
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS analytics_weekly (
+            week TEXT PRIMARY KEY,
+            meetings INTEGER NOT NULL DEFAULT 0,
+            action_items INTEGER NOT NULL DEFAULT 0,
+            decisions INTEGER NOT NULL DEFAULT 0,
+            api_spend REAL NOT NULL DEFAULT 0
+        )
+    ''')
+    
+    # What each meeting added to which week, so deleting it reverses every amount where it was booked
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'analytics_meeting_weeks'")
+    backfill_meeting_weeks = cursor.fetchone() is None
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS analytics_meeting_weeks (
+            meeting_id INTEGER NOT NULL,
+            week TEXT NOT NULL,
+            meetings INTEGER NOT NULL DEFAULT 0,
+            action_items INTEGER NOT NULL DEFAULT 0,
+            decisions INTEGER NOT NULL DEFAULT 0,
+            api_spend REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (meeting_id, week)
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS analytics_owners (
+            owner TEXT PRIMARY KEY,
+            action_items INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_analytics_owners_items
+        ON analytics_owners (action_items DESC)
+    ''')
+    
+    # Backfill the aggregates for databases created before they existed
+    cursor.execute('SELECT COUNT(*) FROM analytics_totals')
+    if cursor.fetchone()[0] == 0 or backfill_meeting_weeks:
+        rebuild_analytics_stats(conn)
+    
+    if backfill_similarity:
+        rebuild_meeting_similarity(cursor)
+    if backfill_topics:
+        fit_topics(cursor, app.config['EMBEDDING_MODEL'])
     
     conn.commit()
     conn.close()
+    invalidate_analytics_cache()
+
+def summary_snippet(summary: str) -> str:
+    """Whitespace-collapsed summary cut to SUMMARY_SNIPPET_LENGTH at a word boundary"""
+    text = ' '.join((summary or '').split())
+    if len(text) <= SUMMARY_SNIPPET_LENGTH:
+        return text
+    cut = text.rfind(' ', 0, SUMMARY_SNIPPET_LENGTH + 1)
+    return text[:cut if cut > 0 else SUMMARY_SNIPPET_LENGTH].rstrip(' ,;:.') + '...'
+
+def get_corpus_version(conn) -> int:
+    row = conn.execute('SELECT version FROM corpus_version WHERE id = 1').fetchone()
+    return row[0] if row else 0
+
+def bump_corpus_version(cursor):
+    """Invalidate cached search results; call in the transaction that changes the corpus"""
+    cursor.execute('UPDATE corpus_version SET version = version + 1 WHERE id = 1')
+
+def meeting_week(timestamp: datetime = None) -> str:
+    """ISO week bucket (e.g. 2024-W03) used by the weekly analytics"""
+    timestamp = timestamp or datetime.utcnow()
+    return timestamp.strftime('%G-W%V')
+
+def created_week(created_at: str) -> str:
+    """Weekly analytics bucket for a meetings.created_at value"""
+    try:
+        return meeting_week(datetime.fromisoformat(created_at))
+    except (TypeError, ValueError):
+        return meeting_week()
+
+WEEKLY_COUNTERS = ('meetings', 'action_items', 'decisions', 'api_spend')
+
+def update_analytics_stats(cursor, week: str = None, owners: List[str] = (), owner_delta: int = 1,
+                           meeting_id: int = None, **deltas):
+    """Apply incremental deltas to the materialized analytics tables.
+    
+    Runs on the caller's cursor so the aggregates are committed (or rolled
+    back) in the same transaction as the rows they describe. Weekly amounts
+    booked for a meeting_id are also kept per meeting, for delete_meeting.
+    """
+    for name, delta in deltas.items():
+        if delta:
+            cursor.execute('''
+                INSERT INTO analytics_totals (name, value) VALUES (?, ?)
+                ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+            ''', (name, delta))
+    
+    weekly = {name: deltas.get(name, 0) for name in WEEKLY_COUNTERS}
+    if week and any(weekly.values()):
+        cursor.execute('''
+            INSERT INTO analytics_weekly (week, meetings, action_items, decisions, api_spend)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(week) DO UPDATE SET
+                meetings = meetings + excluded.meetings,
+                action_items = action_items + excluded.action_items,
+                decisions = decisions + excluded.decisions,
+                api_spend = api_spend + excluded.api_spend
+        ''', (week, weekly['meetings'], weekly['action_items'], weekly['decisions'], weekly['api_spend']))
+        if meeting_id is not None:
+            cursor.execute('''
+                INSERT INTO analytics_meeting_weeks (meeting_id, week, meetings, action_items, decisions, api_spend)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(meeting_id, week) DO UPDATE SET
+                    meetings = meetings + excluded.meetings,
+                    action_items = action_items + excluded.action_items,
+                    decisions = decisions + excluded.decisions,
+                    api_spend = api_spend + excluded.api_spend
+            ''', (meeting_id, week, weekly['meetings'], weekly['action_items'], weekly['decisions'],
+                  weekly['api_spend']))
+    
+    for owner in owners:
+        cursor.execute('''
+            INSERT INTO analytics_owners (owner, action_items) VALUES (?, ?)
+            ON CONFLICT(owner) DO UPDATE SET action_items = action_items + excluded.action_items
+        ''', (owner or 'Unassigned', owner_delta))
+
+def rebuild_analytics_stats(conn):
+    """Recompute the materialized analytics from the source tables
+    
+    Weekly amounts stay in the weeks analytics_meeting_weeks says they were
+    booked in; meetings without such rows (stored before it existed) are
+    booked in the week they were created.
+    """
+    cursor = conn.cursor()
+    for table in ('analytics_totals', 'analytics_weekly', 'analytics_owners'):
+        cursor.execute(f'DELETE FROM {table}')
+    cursor.execute("DELETE FROM analytics_meeting_weeks WHERE meeting_id NOT IN (SELECT id FROM meetings WHERE status = 'complete')")
+    
+    chunk_counts = dict(conn.execute('''
+        SELECT meeting_id, COUNT(*) FROM meeting_embeddings GROUP BY meeting_id
+    ''').fetchall())
+    booked = {row[0] for row in conn.execute('SELECT DISTINCT meeting_id FROM analytics_meeting_weeks')}
+    
+    rows = conn.execute('''
+        SELECT id, created_at, duration_minutes, action_items, decisions, api_cost
+        FROM meetings WHERE status = 'complete'
+    ''').fetchall()
+    for meeting_id, created_at, duration, action_items, decisions, api_cost in rows:
+        action_items = json.loads(action_items) if action_items else []
+        decisions = json.loads(decisions) if decisions else []
+        
+        update_analytics_stats(
+            cursor,
+            owners=[item.get('owner') for item in action_items],
+            duration_total=duration if duration and duration > 0 else 0,
+            duration_count=1 if duration and duration > 0 else 0,
+            searchable_chunks=chunk_counts.get(meeting_id, 0)
+        )
+        if meeting_id not in booked:
+            cursor.execute('''
+                INSERT INTO analytics_meeting_weeks (meeting_id, week, meetings, action_items, decisions, api_spend)
+                VALUES (?, ?, 1, ?, ?, ?)
+            ''', (meeting_id, created_week(created_at), len(action_items), len(decisions), api_cost or 0))
+    
+    cursor.execute('''
+        INSERT INTO analytics_weekly (week, meetings, action_items, decisions, api_spend)
+        SELECT week, SUM(meetings), SUM(action_items), SUM(decisions), SUM(api_spend)
+        FROM analytics_meeting_weeks GROUP BY week
+    ''')
+    for name in WEEKLY_COUNTERS:
+        cursor.execute(f'''
+            INSERT INTO analytics_totals (name, value)
+            SELECT ?, SUM({name}) FROM analytics_meeting_weeks HAVING SUM({name}) != 0
+        ''', (name,))
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+def tenant_database(tenant: str) -> str:
+    return os.path.join(app.config['TENANT_DATA_FOLDER'], f'{tenant}.db')
+
+def initialize_shard(shard):
+    """Create (or migrate) a tenant shard's schema when it is first opened"""
+    os.makedirs(os.path.dirname(shard.path) or '.', exist_ok=True)
+    with use_shard(shard):
+        init_database()
+
+def open_tenant_shard(tenant: str, create: bool = False):
+    """The shard for a tenant, opened on first use
+    
+    Only existing shards are opened (UnknownTenantError otherwise) unless
+    create is set, so requests can never create database files.
+    """
+    if not valid_tenant(tenant):
+        raise ValueError(f"Invalid tenant name: {tenant!r}")
+    return SHARDS.open(tenant, tenant_database(tenant), initialize_shard, create=create)
+
+def all_databases() -> List[str]:
+    """The default database and every tenant shard on disk"""
+    folder = app.config['TENANT_DATA_FOLDER']
+    tenant_databases = sorted(entry.path for entry in os.scandir(folder)
+                              if entry.is_file() and entry.name.endswith('.db')) if os.path.isdir(folder) else []
+    return [app.config['DATABASE']] + tenant_databases
+
+@app.before_request
+def select_tenant_shard():
+    """Route the request to the shard of the tenant in X-Tenant; without one it uses the default database"""
+    # Server threads are reused across requests, so the shard is set (or cleared) every time
+    set_current_shard(None)
+    tenant = request.headers.get(TENANT_HEADER, '').strip().lower()
+    if not tenant:
+        return None
+    if not valid_tenant(tenant):
+        return jsonify({'error': 'Invalid tenant name'}), 400
+    try:
+        set_current_shard(open_tenant_shard(tenant))
+    except UnknownTenantError:
+        return jsonify({'error': f'Unknown tenant: {tenant}'}), 404
+
+@app.teardown_request
+def release_tenant_shard(exception=None):
+    set_current_shard(None)
+
+@app.after_request
+def record_request_latency(response):
+    if 'request_start' in g:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - g.request_start,
+            method=request.method, endpoint=endpoint, status=response.status_code
+        )
+    return response
+
+@app.url_defaults
+def hashed_static_url(endpoint, values):
+    """Add a content hash to static URLs so they can be cached indefinitely"""
+    if endpoint == 'static' and 'filename' in values and 'v' not in values:
+        version = static_file_hash(values['filename'])
+        if version:
+            values['v'] = version
+
+@app.after_request
+def set_static_cache_headers(response):
+    """Long-lived caching for content-hashed assets and timestamped visuals"""
+    if request.endpoint != 'static' or response.status_code not in (200, 304):
+        return response
+    
+    if request.args.get('v') or request.path.startswith('/static/visuals/'):
+        response.cache_control.public = True
+        response.cache_control.max_age = app.config['STATIC_CACHE_MAX_AGE']
+        response.cache_control.immutable = True
+    return response
+
+@app.after_request
+def compress_large_responses(response):
+    """Compress text responses above COMPRESSION_MIN_SIZE"""
+    if (request.method == 'HEAD' or response.status_code != 200
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or (response.is_streamed and not response.direct_passthrough)):
+        return response
+    
+    size = response.content_length
+    if size is None:
+        size = len(response.get_data())
+    if size < app.config['COMPRESSION_MIN_SIZE']:
+        response.vary.add('Accept-Encoding')
+        return response
+    return compress_response(response)
 
 @app.route('/')
 def index():
@@ -97,6 +1026,10 @@ def index():
 def upload_meeting():
     """Upload and process meeting audio file"""
     try:
+        # Refuse before reading the request body when the queue is already full
+        if INGEST_ADMISSION.queue_full():
+            return ingest_busy(minutes_for_size(request.content_length or 0))
+        
         if 'audio_file' not in request.files:
             return jsonify({'error': 'No audio file provided'}), 400
         
@@ -112,10 +1045,29 @@ def upload_meeting():
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"{timestamp}_{filename}"
             file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(file_path)
+            os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+            with pipeline_stage('upload_save'):
+                file.save(file_path)
             
-            # Process the audio file
-            meeting_id = process_meeting_audio(file_path, meeting_title, attendees)
+            # Wait for ingest budget; shorter recordings are admitted first
+            minutes = estimate_audio_minutes(file_path)
+            with pipeline_stage('admission'):
+                ticket = INGEST_ADMISSION.acquire(minutes, app.config['INGEST_QUEUE_TIMEOUT'])
+            if ticket is None:
+                os.remove(file_path)
+                return ingest_busy(minutes)
+            INGEST_ADMISSIONS.inc(result='admitted')
+            
+            # Process the audio file; the meeting exists from the start, so a failure can be resumed
+            meeting_id = None
+            try:
+                meeting_id = create_pending_meeting(meeting_title, attendees, file_path)
+                process_meeting_audio(file_path, meeting_title, attendees, meeting_id=meeting_id)
+            except Exception as e:
+                logger.error(f"Error uploading meeting: {str(e)}")
+                return pipeline_failed(meeting_id, e)
+            finally:
+                INGEST_ADMISSION.release(ticket)
             
             return jsonify({
                 'success': True,
@@ -129,22 +1081,200 @@ def upload_meeting():
         logger.error(f"Error uploading meeting: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-def process_meeting_audio(file_path: str, title: str, attendees: str) -> int:
-    """Process audio file through all AI APIs"""
+def pipeline_failed(meeting_id: Optional[int], error: Exception):
+    """500 response pointing at the resume endpoint when the meeting was created"""
+    body = {'error': str(error)}
+    if meeting_id is not None:
+        body.update(meeting_id=meeting_id, resume_url=f'/meeting/{meeting_id}/resume')
+    return jsonify(body), 500
+
+@app.route('/meeting/<int:meeting_id>/resume', methods=['POST'])
+def resume_meeting_route(meeting_id):
+    """Finish an unfinished meeting from its last checkpoint; a no-op once it is complete"""
+    conn = get_db_connection()
+    row = conn.execute('''
+        SELECT m.status, m.audio_file_path, EXISTS (
+            SELECT 1 FROM pipeline_checkpoints c WHERE c.meeting_id = m.id AND c.stage = 'transcript'
+        )
+        FROM meetings m WHERE m.id = ?
+    ''', (meeting_id,)).fetchone()
+    conn.close()
+    if not row:
+        return jsonify({'error': 'Meeting not found'}), 404
+    status, audio_path, transcribed = row
+    if status == 'complete':
+        return jsonify({'success': True, 'meeting_id': meeting_id, 'status': status})
+    
+    # Only the transcription stage still needs the recording
+    minutes = 0 if transcribed or not audio_path or not os.path.exists(audio_path) else estimate_audio_minutes(audio_path)
+    ticket = INGEST_ADMISSION.acquire(minutes, app.config['INGEST_QUEUE_TIMEOUT'])
+    if ticket is None:
+        return ingest_busy(minutes)
+    INGEST_ADMISSIONS.inc(result='admitted')
+    try:
+        # Never run a second pipeline next to one that is still making progress
+        if not claim_meeting(meeting_id):
+            return jsonify({'error': 'Meeting is still being processed', 'meeting_id': meeting_id}), 409
+        resume_meeting(meeting_id)
+    except Exception as e:
+        logger.error(f"Error resuming meeting {meeting_id}: {str(e)}")
+        return pipeline_failed(meeting_id, e)
+    finally:
+        INGEST_ADMISSION.release(ticket)
+    
+    return jsonify({'success': True, 'meeting_id': meeting_id, 'status': 'complete'})
+
+def ingest_busy(minutes: float):
+    """429 response telling the client when a recording of this length is likely to be admitted"""
+    INGEST_ADMISSIONS.inc(result='rejected')
+    retry_after = INGEST_ADMISSION.retry_after(minutes)
+    response = jsonify({
+        'error': 'Too many meetings are being processed, please retry later',
+        'retry_after': retry_after,
+        'queued': INGEST_ADMISSION.queued
+    })
+    response.headers['Retry-After'] = str(retry_after)
+    return response, 429
+
+def preprocess_meeting_audio(file_path: str) -> Optional[PreparedAudio]:
+    """Downmix, resample and strip silence locally; None to transcribe the file as is"""
+    try:
+        # Only uploads are replaced by their normalized copy; imports stay in place
+        prepared = prepare_audio(file_path, keep_normalized=is_managed_file(file_path, app.config['UPLOAD_FOLDER']))
+    except Exception as e:
+        logger.error(f"Error preprocessing audio, sending it unchanged: {str(e)}")
+        prepared = None
+    
+    AUDIO_PREPROCESS_RESULTS.inc(result='applied' if prepared else 'skipped')
+    if prepared:
+        AUDIO_PREPROCESS_BYTES.inc(prepared.original_bytes, stage='original')
+        AUDIO_PREPROCESS_BYTES.inc(prepared.speech_bytes, stage='transcribed')
+        AUDIO_PREPROCESS_SECONDS.inc(prepared.original_seconds, stage='original')
+        AUDIO_PREPROCESS_SECONDS.inc(prepared.speech_seconds, stage='transcribed')
+        logger.info(f"Preprocessed audio: {prepared.original_bytes} -> {prepared.speech_bytes} bytes, "
+                    f"{prepared.original_seconds:.1f}s -> {prepared.speech_seconds:.1f}s")
+    return prepared
+
+def process_meeting_audio(file_path: str, title: str, attendees: str, audio_hash: str = None,
+                          meeting_id: int = None) -> int:
+    """Process audio file through all AI APIs (blocks until the async pipeline finishes)"""
+    return OPENAI_RUNNER.run(process_meeting_audio_async(file_path, title, attendees, audio_hash, meeting_id))
+
+async def process_meeting_audio_async(file_path: str, title: str, attendees: str, audio_hash: str = None,
+                                      meeting_id: int = None) -> int:
+    """Process audio file through all AI APIs
+    
+    The meeting row is created first with status 'pending'; a recording
+    whose audio_hash matches an unfinished meeting resumes that meeting
+    instead of starting over.
+    """
+    if meeting_id is None:
+        meeting_id = await asyncio.to_thread(create_pending_meeting, title, attendees, file_path, audio_hash)
+    return await run_meeting_pipeline(meeting_id)
+
+def resume_meeting(meeting_id: int) -> int:
+    """Finish an unfinished meeting from its checkpoints (blocks until done)"""
+    return OPENAI_RUNNER.run(run_meeting_pipeline(meeting_id))
+
+async def run_meeting_pipeline(meeting_id: int) -> int:
+    """Run every stage a meeting has no checkpoint for, then publish it
+    
+    Each stage saves its output to pipeline_checkpoints as soon as it
+    finishes, so after a failure or crash only the missing stages run
+    again and Whisper and GPT-4 are not paid for twice.
+    """
+    title, file_path, status = await asyncio.to_thread(load_pipeline_meeting, meeting_id)
+    if status == 'complete':
+        return meeting_id
+    checkpoints = await asyncio.to_thread(load_checkpoints, meeting_id)
+    
     try:
         # Step 1: Transcribe audio using Whisper API
+        if 'transcript' not in checkpoints:
+            checkpoints['transcript'] = await transcribe_meeting(meeting_id, file_path)
+        transcript_text = checkpoints['transcript']['output']['text']
+        
+        # Steps 2-3: Analyze content using GPT-4, then create the visual summary using DALL-E 3
+        async def analyze_and_visualize():
+            if 'analysis' not in checkpoints:
+                logger.info("Analyzing meeting content...")
+                analysis = await analyze_meeting_content(transcript_text, title)
+                checkpoints['analysis'] = await asyncio.to_thread(
+                    save_checkpoint, meeting_id, 'analysis', analysis, analysis.get('api_cost', 0))
+            
+            if 'visual' not in checkpoints:
+                logger.info("Creating visual summary...")
+                visual_summary_path = await create_visual_summary(checkpoints['analysis']['output']['summary'], title)
+                if visual_summary_path:
+                    with pipeline_stage('thumbnail'):
+                        await asyncio.to_thread(create_visual_thumbnail, visual_summary_path)
+                checkpoints['visual'] = await asyncio.to_thread(
+                    save_checkpoint, meeting_id, 'visual', {'path': visual_summary_path},
+                    estimate_api_cost('dall-e', images=1) if visual_summary_path else 0)
+            
+            if 'task_embeddings' not in checkpoints:
+                with pipeline_stage('task_embeddings'):
+                    task_embeddings = await embed_action_items(checkpoints['analysis']['output']['action_items'])
+                checkpoints['task_embeddings'] = await asyncio.to_thread(
+                    save_checkpoint, meeting_id, 'task_embeddings', task_embeddings, task_embeddings['api_cost'])
+        
+        # Embeddings only need the transcript, so they are created alongside the analysis
+        async def embed():
+            if 'embeddings' not in checkpoints:
+                logger.info("Creating embeddings for semantic search...")
+                with pipeline_stage('embeddings'):
+                    embeddings = await embed_transcript(transcript_text)
+                checkpoints['embeddings'] = await asyncio.to_thread(
+                    save_checkpoint, meeting_id, 'embeddings', embeddings, embeddings['api_cost'])
+        
+        # Let both branches finish (and checkpoint) before reporting a failure
+        for result in await asyncio.gather(analyze_and_visualize(), embed(), return_exceptions=True):
+            if isinstance(result, BaseException):
+                raise result
+        
+        # Step 4: Store in database and index for semantic search, in one transaction
+        with pipeline_stage('db_write'):
+            audio_path = await asyncio.to_thread(complete_meeting, meeting_id, checkpoints)
+        
+        await asyncio.to_thread(release_meeting_audio, meeting_id, audio_path)
+        return meeting_id
+    
+    except Exception as e:
+        logger.error(f"Error processing meeting audio: {str(e)}")
+        await asyncio.to_thread(record_pipeline_error, meeting_id, str(e))
+        raise e
+
+async def transcribe_meeting(meeting_id: int, file_path: str) -> Dict[str, Any]:
+    """Transcribe a recording with Whisper and checkpoint the transcript"""
+    prepared = None
+    saved = False
+    try:
+        # Optionally shrink the audio locally before it is uploaded to Whisper
+        if app.config['AUDIO_PREPROCESS']:
+            with pipeline_stage('audio_preprocess'):
+                prepared = await asyncio.to_thread(preprocess_meeting_audio, file_path)
+        transcribe_path = prepared.speech_path if prepared else file_path
+        
         logger.info("Starting audio transcription...")
-        with open(file_path, 'rb') as audio_file:
-            transcription = openai.Audio.transcribe(
+        with pipeline_stage('transcription'), open(transcribe_path, 'rb') as audio_file:
+            transcription = await OPENAI_RUNNER.client.audio.transcriptions.create(
                 model="whisper-1",
                 file=audio_file,
                 response_format="verbose_json"
             )
         
-        transcript_text = transcription['text']
+        transcript_text = transcription.text
+        segments = transcript_segments(transcription, transcript_text, prepared.timeline if prepared else None)
+        record_openai_usage('transcription', 'whisper-1', transcription,
+                            bytes_sent=os.path.getsize(transcribe_path),
+                            bytes_received=len(transcript_text.encode('utf-8')))
         
-        # Calculate duration properly (OpenAI 0.28 API format)
-        duration = transcription.get('duration', 0)
+        # Whisper reports the audio duration in seconds
+        duration = getattr(transcription, 'duration', 0) or 0
+        api_cost = estimate_api_cost('whisper-1', minutes=duration / 60)
+        if prepared:
+            # Whisper only heard the speech; the meeting lasted the whole recording
+            duration = prepared.original_seconds
         
         # Convert duration to minutes if it's in seconds
         if duration > 60:  # Likely in seconds, convert to minutes
@@ -154,7 +1284,6 @@ def process_meeting_audio(file_path: str, title: str, attendees: str) -> int:
         # If duration is still 0 or seems wrong, estimate from audio file
         if duration == 0 or duration > 1000:
             try:
-                import os
                 file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
                 # Rough estimate: 1MB ≈ 1 minute for typical audio compression
                 duration = max(1, round(file_size_mb, 1))
@@ -162,37 +1291,208 @@ def process_meeting_audio(file_path: str, title: str, attendees: str) -> int:
             except:
                 duration = 5  # Default fallback
         
-        # Step 2: Analyze content using GPT-4
-        logger.info("Analyzing meeting content...")
-        analysis = analyze_meeting_content(transcript_text)
-        
-        # Step 3: Create visual summary using DALL-E 3
-        logger.info("Creating visual summary...")
-        visual_summary_path = create_visual_summary(analysis['summary'], title)
-        
-        # Step 4: Store in database
-        meeting_id = store_meeting_data(
-            title, transcript_text, analysis, attendees, 
-            duration, file_path, visual_summary_path
-        )
-        
-        # Step 5: Create embeddings for semantic search
-        logger.info("Creating embeddings for semantic search...")
-        create_meeting_embeddings(meeting_id, transcript_text)
-        
-        return meeting_id
-        
-    except Exception as e:
-        logger.error(f"Error processing meeting audio: {str(e)}")
-        raise e
+        # Keep the smaller normalized recording if there is one
+        audio_path = prepared.normalized_path if prepared and prepared.normalized_path else file_path
+        transcript = {'text': transcript_text, 'segments': segments, 'duration': duration}
+        checkpoint = await asyncio.to_thread(save_checkpoint, meeting_id, 'transcript', transcript, api_cost,
+                                             audio_file_path=audio_path)
+        saved = True
+    finally:
+        if prepared:
+            prepared.discard(keep_normalized=saved)
+    
+    if audio_path != file_path:
+        await asyncio.to_thread(remove_upload, file_path)
+    return checkpoint
 
-def analyze_meeting_content(transcript: str) -> Dict[str, Any]:
-    """Analyze meeting transcript using GPT-4 with function calling"""
+def create_pending_meeting(title: str, attendees: str, audio_path: str, audio_hash: str = None) -> int:
+    """Insert a meeting that has not been processed yet
     
-    # Define functions for GPT-4 to call
-    functions = [
-        {
-            "name": "extract_action_items",
+    An unfinished meeting with the same audio is reused instead when it can
+    be claimed, i.e. no other pipeline is still working on it.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    candidates = []
+    if audio_hash:
+        candidates = [row[0] for row in cursor.execute(
+            "SELECT id FROM meetings WHERE audio_hash = ? AND status != 'complete' ORDER BY id", (audio_hash,))]
+    meeting_id = next((candidate for candidate in candidates if claim_meeting(candidate)), None)
+    if meeting_id is None:
+        cursor.execute('''
+            INSERT INTO meetings (title, attendees, audio_file_path, audio_hash, status, status_updated_at)
+            VALUES (?, ?, ?, ?, 'pending', CURRENT_TIMESTAMP)
+        ''', (title, attendees, audio_path, audio_hash))
+        meeting_id = cursor.lastrowid
+    conn.commit()
+    conn.close()
+    return meeting_id
+
+def claim_meeting(meeting_id: int, include_recent: bool = False) -> bool:
+    """Take over an unfinished meeting before running its pipeline; False if that is not allowed
+    
+    A meeting can be claimed when its pipeline failed or made no progress
+    for RESUME_AFTER_MINUTES (include_recent: any unfinished meeting). The
+    claim clears the error and refreshes status_updated_at in one
+    statement, so of two concurrent resumes only one runs.
+    """
+    conn = get_db_connection()
+    if include_recent:
+        cursor = conn.execute('''
+            UPDATE meetings SET status_updated_at = CURRENT_TIMESTAMP, pipeline_error = NULL
+            WHERE id = ? AND status != 'complete'
+        ''', (meeting_id,))
+    else:
+        cursor = conn.execute('''
+            UPDATE meetings SET status_updated_at = CURRENT_TIMESTAMP, pipeline_error = NULL
+            WHERE id = ? AND status != 'complete'
+              AND (pipeline_error IS NOT NULL OR status_updated_at < datetime('now', ?))
+        ''', (meeting_id, f"-{app.config['RESUME_AFTER_MINUTES']} minutes"))
+    claimed = cursor.rowcount == 1
+    conn.commit()
+    conn.close()
+    return claimed
+
+def load_pipeline_meeting(meeting_id: int):
+    """(title, audio path, status) of a meeting about to go through the pipeline"""
+    conn = get_db_connection()
+    row = conn.execute('SELECT title, audio_file_path, status FROM meetings WHERE id = ?', (meeting_id,)).fetchone()
+    conn.close()
+    if row is None:
+        raise ValueError(f'Meeting {meeting_id} does not exist')
+    return row
+
+def load_checkpoints(meeting_id: int) -> Dict[str, Dict[str, Any]]:
+    """Finished stages of a meeting: stage -> {'output', 'api_cost'}"""
+    conn = get_db_connection()
+    rows = conn.execute('SELECT stage, output, api_cost FROM pipeline_checkpoints WHERE meeting_id = ?',
+                        (meeting_id,)).fetchall()
+    conn.close()
+    return {stage: {'output': json.loads(output), 'api_cost': api_cost or 0} for stage, output, api_cost in rows}
+
+def save_checkpoint(meeting_id: int, stage: str, output: Dict[str, Any], api_cost: float = 0,
+                    **columns) -> Dict[str, Any]:
+    """Persist a stage's output and advance the meeting's status; columns are also set on the meeting"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT OR REPLACE INTO pipeline_checkpoints (meeting_id, stage, output, api_cost)
+        VALUES (?, ?, ?, ?)
+    ''', (meeting_id, stage, json.dumps(output), api_cost))
+    
+    # The status names the last stage finished in order; concurrent stages may finish early
+    finished = {row[0] for row in cursor.execute(
+        'SELECT stage FROM pipeline_checkpoints WHERE meeting_id = ?', (meeting_id,))}
+    status = 'pending'
+    for name in PIPELINE_STAGES:
+        if name not in finished:
+            break
+        status = PIPELINE_STATUSES[name]
+    
+    assignments = ''.join(f', {column} = ?' for column in columns)
+    cursor.execute(f'''
+        UPDATE meetings SET status = ?, status_updated_at = CURRENT_TIMESTAMP, pipeline_error = NULL{assignments}
+        WHERE id = ?
+    ''', [status, *columns.values(), meeting_id])
+    conn.commit()
+    conn.close()
+    return {'output': output, 'api_cost': api_cost}
+
+def record_pipeline_error(meeting_id: int, error: str):
+    conn = get_db_connection()
+    conn.execute('UPDATE meetings SET pipeline_error = ?, status_updated_at = CURRENT_TIMESTAMP WHERE id = ?',
+                 (error, meeting_id))
+    conn.commit()
+    conn.close()
+
+def complete_meeting(meeting_id: int, checkpoints: Dict[str, Dict[str, Any]]) -> Optional[str]:
+    """Publish a meeting from its checkpoints in one transaction; returns its audio path
+    
+    The results, the search index rows, the 'complete' status and the
+    removal of the checkpoints commit together, so a crash here leaves the
+    checkpoints to finish from and nothing is counted twice. A meeting
+    another pipeline already completed is left alone (None is returned).
+    """
+    transcript = checkpoints['transcript']['output']
+    api_cost = sum(checkpoints[stage]['api_cost'] for stage in ('transcript', 'analysis', 'visual', 'task_embeddings'))
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    # Take the write lock before reading the status, so two completions cannot both see it unfinished
+    cursor.execute('BEGIN IMMEDIATE')
+    title, attendees, audio_path, audio_hash, status = cursor.execute(
+        'SELECT title, attendees, audio_file_path, audio_hash, status FROM meetings WHERE id = ?', (meeting_id,)
+    ).fetchone()
+    if status == 'complete':
+        conn.rollback()
+        conn.close()
+        return None
+    write_meeting_data(cursor, title, transcript['text'], checkpoints['analysis']['output'], attendees,
+                       transcript['duration'], audio_path, checkpoints['visual']['output']['path'], api_cost,
+                       audio_hash, transcript['segments'], meeting_id=meeting_id)
+    resolve_action_items(cursor, meeting_id, checkpoints['task_embeddings']['output'])
+    write_meeting_embeddings(cursor, meeting_id, checkpoints['embeddings']['output'])
+    cursor.execute('DELETE FROM pipeline_checkpoints WHERE meeting_id = ?', (meeting_id,))
+    conn.commit()
+    conn.close()
+    invalidate_analytics_cache()
+    return audio_path
+
+def find_unfinished_meetings(include_recent: bool = False) -> List[int]:
+    """Meetings whose pipeline failed, or made no progress for RESUME_AFTER_MINUTES (e.g. the process died)"""
+    conn = get_db_connection()
+    if include_recent:
+        rows = conn.execute("SELECT id FROM meetings WHERE status != 'complete' ORDER BY id").fetchall()
+    else:
+        rows = conn.execute('''
+            SELECT id FROM meetings
+            WHERE status != 'complete' AND (pipeline_error IS NOT NULL OR status_updated_at < datetime('now', ?))
+            ORDER BY id
+        ''', (f"-{app.config['RESUME_AFTER_MINUTES']} minutes",)).fetchall()
+    conn.close()
+    return [row[0] for row in rows]
+
+def resume_unfinished_meetings(include_recent: bool = False, progress=None) -> Dict[str, Any]:
+    """Resume every unfinished meeting from its last checkpoint"""
+    meeting_ids = find_unfinished_meetings(include_recent)
+    summary = {'meetings': len(meeting_ids), 'resumed': 0, 'skipped': 0, 'failed': 0}
+    start = time.perf_counter()
+    
+    for meeting_id in meeting_ids:
+        # Another process (the server, or a second sweep) may have taken it over since it was found
+        if not claim_meeting(meeting_id, include_recent):
+            summary['skipped'] += 1
+            if progress:
+                progress({'meeting_id': meeting_id, 'status': 'skipped'})
+            continue
+        try:
+            resume_meeting(meeting_id)
+            summary['resumed'] += 1
+            result = {'meeting_id': meeting_id, 'status': 'resumed'}
+        except Exception as e:
+            summary['failed'] += 1
+            result = {'meeting_id': meeting_id, 'status': 'failed', 'error': str(e)}
+        if progress:
+            progress(result)
+    
+    summary['elapsed_seconds'] = round(time.perf_counter() - start, 2)
+    return summary
+
+async def analyze_meeting_content(transcript: str, title: str = '') -> Dict[str, Any]:
+    """Analyze meeting transcript with function calling, on the model routed for each task
+    
+    The extraction and summary models are picked from the estimated token
+    count of the text each is sent and the meeting type. Output that fails
+    validation is retried one step up the escalation ladder.
+    """
+    router = ModelRouter.from_config(app.config['MODEL_ROUTES'], app.config['MODEL_ESCALATION'])
+    summary_input = transcript[:SUMMARY_TRANSCRIPT_CHARS]
+    kind = meeting_type(title)
+    
+    # Define functions for the model to call
+    functions = [
+        {
+            "name": "extract_action_items",
             "description": "Extract action items with owners and deadlines",
             "parameters": {
                 "type": "object",
@@ -235,65 +1535,97 @@ def analyze_meeting_content(transcript: str) -> Dict[str, Any]:
     ]
     
     # Analyze the transcript
-    response = openai.ChatCompletion.create(
-        model="gpt-4",
-        messages=[
-            {
-                "role": "system",
-                "content": """You are an AI assistant specialized in analyzing business meeting transcripts. 
+    async def extract(model):
+        with pipeline_stage('analysis_extraction'):
+            return await OPENAI_RUNNER.client.chat.completions.create(
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": """You are an AI assistant specialized in analyzing business meeting transcripts. 
                 Your task is to extract actionable insights, decisions, and create comprehensive summaries.
                 Focus on identifying specific action items with clear ownership and deadlines."""
-            },
-            {
-                "role": "user",
-                "content": f"""Please analyze this meeting transcript and extract:
+                    },
+                    {
+                        "role": "user",
+                        "content": f"""Please analyze this meeting transcript and extract:
                 1. A comprehensive summary
                 2. Action items with owners and deadlines
                 3. Key decisions made
                 
                 Transcript: {transcript}"""
-            }
-        ],
-        functions=functions,
-        function_call="auto",
-        temperature=0.3
-    )
+                    }
+                ],
+                functions=functions,
+                function_call="auto",
+                temperature=0.3
+            )
     
     # Create summary
-    summary_response = openai.ChatCompletion.create(
-        model="gpt-4",
-        messages=[
-            {
-                "role": "system",
-                "content": "You are an expert meeting summarizer. Create concise, actionable summaries."
-            },
-            {
-                "role": "user",
-                "content": f"Create a comprehensive but concise summary of this meeting: {transcript[:2000]}..."
-            }
-        ],
-        temperature=0.3
+    async def summarize(model):
+        with pipeline_stage('analysis_summary'):
+            return await OPENAI_RUNNER.client.chat.completions.create(
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are an expert meeting summarizer. Create concise, actionable summaries."
+                    },
+                    {
+                        "role": "user",
+                        "content": f"Create a comprehensive but concise summary of this meeting: {summary_input}..."
+                    }
+                ],
+                temperature=0.3
+            )
+    
+    # The extraction and the summary are independent, so request both at once
+    (extracted, extraction_cost), (summary, summary_cost) = await asyncio.gather(
+        run_routed_task(router, 'extraction', estimate_tokens(transcript), kind, extract, validate_extraction,
+                        len(transcript.encode('utf-8'))),
+        run_routed_task(router, 'summary', estimate_tokens(summary_input), kind, summarize, validate_summary,
+                        len(summary_input.encode('utf-8')))
     )
     
-    analysis = {
-        'summary': summary_response['choices'][0]['message']['content'],
-        'action_items': [],
-        'decisions': []
+    return {
+        'summary': summary,
+        'action_items': extracted.get('action_items', []),
+        'decisions': extracted.get('decisions', []),
+        'api_cost': extraction_cost + summary_cost
     }
+
+async def run_routed_task(router: ModelRouter, task: str, tokens: int, kind: str, request, validate,
+                          bytes_sent: int = 0):
+    """Run one analysis task on its routed model; returns (validated output, api cost of every attempt)
     
-    # Process function calls if any
-    if response['choices'][0]['message'].get('function_call'):
-        function_name = response['choices'][0]['message']['function_call']['name']
-        function_args = json.loads(response['choices'][0]['message']['function_call']['arguments'])
-        
-        if function_name == "extract_action_items":
-            analysis['action_items'] = function_args.get('action_items', [])
-        elif function_name == "extract_decisions":
-            analysis['decisions'] = function_args.get('decisions', [])
+    request(model) makes the chat completion call and validate(choice)
+    parses it or raises OutputValidationError, which moves the task one
+    model up the escalation ladder. The strongest model's failure is raised.
+    """
+    model, reason = router.route(task, tokens, kind)
+    ANALYSIS_MODEL_ROUTES.inc(task=task, model=model, reason=reason)
+    api_cost = 0
     
-    return analysis
+    while True:
+        start = time.perf_counter()
+        response = await request(model)
+        ANALYSIS_MODEL_SECONDS.observe(time.perf_counter() - start, task=task, model=model)
+        record_openai_usage('chat', model, response, bytes_sent=bytes_sent)
+        cost = estimate_api_cost(model, getattr(response, 'usage', None))
+        ANALYSIS_MODEL_COST.inc(cost, task=task, model=model)
+        api_cost += cost
+        
+        try:
+            return validate(response.choices[0]), api_cost
+        except OutputValidationError as e:
+            stronger = router.escalate(model)
+            if stronger is None:
+                raise
+            logger.warning(f"Invalid {task} output from {model} ({str(e)}), retrying with {stronger}")
+            ANALYSIS_MODEL_ESCALATIONS.inc(task=task, from_model=model, to_model=stronger)
+            model = stronger
 
-def create_visual_summary(summary: str, title: str) -> str:
+async def create_visual_summary(summary: str, title: str) -> str:
     """Create visual summary using DALL-E 3"""
     try:
         # Extract key themes for better visual representation
@@ -313,23 +1645,28 @@ def create_visual_summary(summary: str, title: str) -> str:
         else:
             visual_prompt = """A minimal flat design illustration showing teamwork and collaboration concepts. Blue and gray color palette. Simple geometric shapes like interlocking circles, connecting lines, and grouped elements. No text, no labels, no words. Pure abstract geometric design."""
         
-        response = openai.Image.create(
-            prompt=visual_prompt,
-            size="1024x1024",
-            n=1
-        )
+        with pipeline_stage('visual_generation'):
+            response = await OPENAI_RUNNER.client.images.generate(
+                prompt=visual_prompt,
+                size="1024x1024",
+                n=1
+            )
         
         # Download and save the image
-        image_url = response['data'][0]['url']
+        image_url = response.data[0].url
         import requests
-        img_response = requests.get(image_url)
+        with pipeline_stage('image_download'):
+            img_response = await asyncio.to_thread(requests.get, image_url)
+        record_openai_usage('image', 'dall-e', response, bytes_sent=len(visual_prompt),
+                            bytes_received=len(img_response.content))
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        visual_path = f"static/visuals/{timestamp}_{secure_filename(title)}.png"
+        visual_path = f"{app.config['VISUALS_FOLDER']}/{timestamp}_{secure_filename(title)}.png"
         os.makedirs(os.path.dirname(visual_path), exist_ok=True)
         
         with open(visual_path, 'wb') as f:
             f.write(img_response.content)
+        await asyncio.to_thread(create_visual_thumbnail, visual_path)
         
         return visual_path
         
@@ -337,70 +1674,853 @@ def create_visual_summary(summary: str, title: str) -> str:
         logger.error(f"Error creating visual summary: {str(e)}")
         return ""
 
+def transcript_segments(transcription, transcript: str, timeline=None) -> List[Dict[str, Any]]:
+    """Whisper's verbose_json segments with character offsets into the transcript text
+    
+    A timeline from audio preprocessing maps times in the trimmed audio
+    Whisper heard back onto the original recording.
+    """
+    segments = []
+    position = 0
+    for segment in getattr(transcription, 'segments', None) or []:
+        get = segment.get if isinstance(segment, dict) else lambda name: getattr(segment, name, None)
+        text = (get('text') or '').strip()
+        if not text:
+            continue
+        
+        char_start = transcript.find(text, position)
+        if char_start < 0:
+            char_start = position
+        position = char_start + len(text)
+        start, end = float(get('start') or 0), float(get('end') or 0)
+        if timeline:
+            start, end = timeline.to_original(start), timeline.to_original(end, end=True)
+        segments.append({'start': start, 'end': end, 'text': text, 'char_start': char_start, 'speaker': None})
+    
+    if app.config['SPEAKER_LABELS']:
+        label_speakers(segments)
+    return segments
+
+def label_speakers(segments: List[Dict[str, Any]]):
+    """Assign alternating speaker labels at likely turn boundaries
+    
+    A lightweight local stand-in for diarization: a pause of at least
+    SPEAKER_TURN_GAP_SECONDS, or a segment following a question, starts a
+    new turn. Labels alternate between two speakers, so they identify turns
+    reliably but only approximate who is talking in larger meetings.
+    """
+    speaker = 0
+    for previous, segment in zip([None] + segments, segments):
+        if previous and (segment['start'] - previous['end'] >= SPEAKER_TURN_GAP_SECONDS
+                         or previous['text'].endswith('?')):
+            speaker = 1 - speaker
+        segment['speaker'] = f'Speaker {speaker + 1}'
+
 def store_meeting_data(title: str, transcript: str, analysis: Dict, attendees: str, 
-                      duration: int, audio_path: str, visual_path: str) -> int:
+                      duration: int, audio_path: str, visual_path: str, api_cost: float = 0,
+                      audio_hash: str = None, segments: List[Dict[str, Any]] = None) -> int:
     """Store meeting data in database"""
-    conn = sqlite3.connect('meetings.db')
+    conn = get_db_connection()
     cursor = conn.cursor()
+    meeting_id = write_meeting_data(cursor, title, transcript, analysis, attendees, duration,
+                                    audio_path, visual_path, api_cost, audio_hash, segments)
+    conn.commit()
+    conn.close()
+    invalidate_analytics_cache()
     
-    cursor.execute('''
-        INSERT INTO meetings (title, transcription, summary, action_items, decisions, 
-                            attendees, duration_minutes, audio_file_path, visual_summary_path)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
+    return meeting_id
+
+def write_meeting_data(cursor, title: str, transcript: str, analysis: Dict, attendees: str,
+                       duration: int, audio_path: str, visual_path: str, api_cost: float = 0,
+                       audio_hash: str = None, segments: List[Dict[str, Any]] = None,
+                       meeting_id: int = None) -> int:
+    """Write a processed meeting and what was extracted from it, completing meeting_id if given
+    
+    A completed meeting is dated when it is published, which keeps it in
+    the analytics week its totals are added to.
+    """
+    if meeting_id is None:
+        statement = '''
+            INSERT INTO meetings (title, transcription, summary, summary_snippet, action_items, decisions, 
+                                attendees, duration_minutes, audio_file_path, visual_summary_path,
+                                api_cost, audio_hash, completion_seq)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(completion_seq), 0) + 1 FROM meetings))
+        '''
+    else:
+        statement = '''
+            UPDATE meetings SET title = ?, transcription = ?, summary = ?, summary_snippet = ?, action_items = ?,
+                                decisions = ?, attendees = ?, duration_minutes = ?, audio_file_path = ?,
+                                visual_summary_path = ?, api_cost = ?, audio_hash = ?,
+                                status = 'complete', status_updated_at = CURRENT_TIMESTAMP, pipeline_error = NULL,
+                                created_at = CURRENT_TIMESTAMP,
+                                completion_seq = (SELECT COALESCE(MAX(completion_seq), 0) + 1 FROM meetings)
+            WHERE id = ?
+        '''
+    cursor.execute(statement, (
         title,
         transcript,
         analysis['summary'],
+        summary_snippet(analysis['summary']),
         json.dumps(analysis['action_items']),
         json.dumps(analysis['decisions']),
         attendees,
         duration,
         audio_path,
-        visual_path
-    ))
+        visual_path,
+        api_cost,
+        audio_hash
+    ) + ((meeting_id,) if meeting_id is not None else ()))
     
-    meeting_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    if meeting_id is None:
+        meeting_id = cursor.lastrowid
+    store_action_items_and_decisions(cursor, meeting_id, analysis['action_items'], analysis['decisions'])
+    cursor.executemany('''
+        INSERT INTO transcript_segments (meeting_id, position, start_ms, end_ms, char_start, speaker, text)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', [(meeting_id, position, round(segment['start'] * 1000), round(segment['end'] * 1000),
+           segment['char_start'], segment['speaker'], segment['text'])
+          for position, segment in enumerate(segments or [])])
     
+    update_analytics_stats(
+        cursor, meeting_week(),
+        owners=[item.get('owner') for item in analysis['action_items']],
+        meeting_id=meeting_id,
+        meetings=1,
+        duration_total=duration if duration and duration > 0 else 0,
+        duration_count=1 if duration and duration > 0 else 0,
+        action_items=len(analysis['action_items']),
+        decisions=len(analysis['decisions']),
+        api_spend=api_cost
+    )
     return meeting_id
 
-def create_meeting_embeddings(meeting_id: int, transcript: str):
-    """Create embeddings for semantic search"""
+def parse_due_date(deadline: str):
+    """Normalize an extracted deadline to YYYY-MM-DD when it is a recognizable date"""
+    if not deadline:
+        return None
+    for fmt in ('%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%B %d, %Y', '%b %d, %Y', '%d %B %Y'):
+        try:
+            return datetime.strptime(deadline.strip(), fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+def store_action_items_and_decisions(cursor, meeting_id: int, action_items: List[Dict], decisions: List[Dict]):
+    """Write a meeting's extracted action items and decisions to their tables"""
+    cursor.executemany('''
+        INSERT INTO action_items (meeting_id, position, task, owner, deadline, due_date, priority)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', [(
+        meeting_id, position, item.get('task'), item.get('owner'), item.get('deadline'),
+        parse_due_date(item.get('deadline')), (item.get('priority') or '').capitalize() or None
+    ) for position, item in enumerate(action_items)])
+    
+    cursor.executemany('''
+        INSERT INTO decisions (meeting_id, position, decision, rationale, impact)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [(
+        meeting_id, position, decision.get('decision'), decision.get('rationale'), decision.get('impact')
+    ) for position, decision in enumerate(decisions)])
+
+def owner_key(owner: str) -> str:
+    """Blocking key for task matching: the owner, case- and whitespace-insensitive; '' when unassigned"""
+    key = ' '.join((owner or '').casefold().split())
+    return '' if key in UNASSIGNED_OWNERS else key
+
+async def embed_action_items(action_items: List[Dict]) -> Dict[str, Any]:
+    """Embed each action item's task text in one request; items without text get no vector"""
+    model = app.config['EMBEDDING_MODEL']
+    texts = [' '.join((item.get('task') or '').split()) for item in action_items]
+    inputs = [text for text in texts if text]
+    if not inputs:
+        return {'model': model, 'vectors': [None] * len(texts), 'api_cost': 0}
+    
+    response = await OPENAI_RUNNER.client.embeddings.create(model=model, input=inputs)
+    record_openai_usage('embedding', model, response, bytes_sent=sum(len(text.encode('utf-8')) for text in inputs))
+    
+    embedded = iter([item.embedding for item in response.data])
+    vectors = [next(embedded, None) if text else None for text in texts]
+    return {'model': model, 'vectors': vectors, 'api_cost': estimate_api_cost(model, getattr(response, 'usage', None))}
+
+def resolve_action_items(cursor, meeting_id: int, task_embeddings: Dict[str, Any]) -> int:
+    """Link a meeting's action items to the task ledger; returns how many joined an existing task
+    
+    Matching is blocked by owner: an item is only compared with the open
+    tasks of the same owner embedded with the same model, so an ingest costs
+    O(new items) however large the ledger grows. An item joins its most
+    similar candidate at TASK_MATCH_THRESHOLD or above, and otherwise starts
+    a new task. A task's vector is the normalized mean of its mentions.
+    """
+    import numpy as np
+    
+    model = task_embeddings['model']
+    threshold = app.config['TASK_MATCH_THRESHOLD']
+    items = cursor.execute('''
+        SELECT id, task, owner, priority, due_date FROM action_items WHERE meeting_id = ? ORDER BY position
+    ''', (meeting_id,)).fetchall()
+    
+    blocks = {}  # owner key -> [[task id, vector, mentions], ...]
+    matched = 0
+    for (item_id, task, owner, priority, due_date), vector in zip(items, task_embeddings['vectors']):
+        if vector is None:
+            continue
+        vector = np.array(vector, dtype=np.float32)
+        vector /= max(float(np.linalg.norm(vector)), 1e-12)
+        key = owner_key(owner)
+        if key not in blocks:
+            blocks[key] = [[row[0], np.frombuffer(row[1], dtype=np.float32), row[2]] for row in cursor.execute('''
+                SELECT id, vector, mentions FROM tasks
+                WHERE owner_key = ? AND status != 'done' AND model = ?
+                ORDER BY last_seen DESC LIMIT ?
+            ''', (key, model, TASK_MATCH_MAX_CANDIDATES))]
+        candidates = blocks[key]
+        
+        best = None
+        if candidates:
+            similarities = np.vstack([candidate[1] for candidate in candidates]) @ vector
+            if similarities.max() >= threshold:
+                best = candidates[int(similarities.argmax())]
+        
+        if best:
+            centroid = best[1] * best[2] + vector
+            best[1], best[2] = centroid / max(float(np.linalg.norm(centroid)), 1e-12), best[2] + 1
+            # The latest wording, owner spelling, priority and deadline win
+            cursor.execute('''
+                UPDATE tasks SET task = ?, owner = ?, priority = COALESCE(?, priority), due_date = COALESCE(?, due_date),
+                                 mentions = mentions + 1, last_meeting_id = ?, last_seen = CURRENT_TIMESTAMP, vector = ?
+                WHERE id = ?
+            ''', (task, owner, priority, due_date, meeting_id, best[1].tobytes(), best[0]))
+            task_id = best[0]
+            matched += 1
+        else:
+            cursor.execute('''
+                INSERT INTO tasks (task, owner, owner_key, priority, due_date, mentions, first_meeting_id,
+                                   last_meeting_id, model, vector)
+                VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?)
+            ''', (task, owner, key, priority, due_date, meeting_id, meeting_id, model, vector.tobytes()))
+            task_id = cursor.lastrowid
+            candidates.append([task_id, vector, 1])
+        cursor.execute('UPDATE action_items SET task_id = ? WHERE id = ?', (task_id, item_id))
+    return matched
+
+def refresh_tasks(cursor, task_ids: List[int]):
+    """Recompute tasks from the action items still linked to them
+    
+    Follows the ingest rules: the latest mention's wording and owner win,
+    priority and due date come from the latest mention that set them, and
+    the status is the items' shared status (in_progress when they differ).
+    Tasks nothing mentions any more are dropped.
+    """
+    latest = 'FROM action_items WHERE task_id = tasks.id {} ORDER BY meeting_id DESC, position DESC LIMIT 1'
+    parameters = [(task_id,) for task_id in task_ids]
+    cursor.executemany(f'''
+        UPDATE tasks SET
+            mentions = (SELECT COUNT(*) FROM action_items WHERE task_id = tasks.id),
+            first_meeting_id = (SELECT MIN(meeting_id) FROM action_items WHERE task_id = tasks.id),
+            last_meeting_id = (SELECT MAX(meeting_id) FROM action_items WHERE task_id = tasks.id),
+            task = COALESCE((SELECT task {latest.format('')}), task),
+            owner = COALESCE((SELECT owner {latest.format('')}), owner),
+            priority = (SELECT priority {latest.format('AND priority IS NOT NULL')}),
+            due_date = (SELECT due_date {latest.format('AND due_date IS NOT NULL')}),
+            status = COALESCE((SELECT CASE WHEN MIN(status) = MAX(status) THEN MIN(status) ELSE 'in_progress' END
+                               FROM action_items WHERE task_id = tasks.id), status)
+        WHERE id = ?
+    ''', parameters)
+    cursor.executemany('DELETE FROM tasks WHERE id = ? AND mentions = 0', parameters)
+
+def create_meeting_embeddings(meeting_id: int, transcript: str, replace_existing: bool = False):
+    """Create embeddings for semantic search
+    
+    Uses the configured EMBEDDING_MODEL and EMBEDDING_CHUNK_SIZE and tags each
+    vector with them. With replace_existing, the meeting's previous vectors
+    are swapped out in the same transaction, so search never sees a
+    half-indexed meeting.
+    """
+    embeddings = OPENAI_RUNNER.run(embed_transcript(transcript))
+    store_meeting_embeddings(meeting_id, embeddings, replace_existing)
+
+async def embed_transcript(transcript: str) -> Dict[str, Any]:
+    """Chunk a transcript and embed the chunks, requesting all batches concurrently"""
+    model = app.config['EMBEDDING_MODEL']
+    chunk_size = app.config['EMBEDDING_CHUNK_SIZE']
+    
     # Split transcript into chunks for better search granularity
-    chunk_size = 1000
     chunks = [transcript[i:i+chunk_size] for i in range(0, len(transcript), chunk_size)]
+    batches = [chunks[start:start + EMBEDDING_BATCH_SIZE] for start in range(0, len(chunks), EMBEDDING_BATCH_SIZE)]
     
-    conn = sqlite3.connect('meetings.db')
+    # Embed several chunks per API call
+    responses = await asyncio.gather(*(
+        OPENAI_RUNNER.client.embeddings.create(model=model, input=batch) for batch in batches
+    ))
+    
+    items = []
+    api_cost = 0
+    for number, (batch, response) in enumerate(zip(batches, responses)):
+        record_openai_usage('embedding', model, response,
+                            bytes_sent=sum(len(chunk.encode('utf-8')) for chunk in batch))
+        api_cost += estimate_api_cost(model, getattr(response, 'usage', None))
+        
+        for offset, (chunk, item) in enumerate(zip(batch, response.data)):
+            items.append((number * EMBEDDING_BATCH_SIZE + offset, chunk, item.embedding))
+    
+    return {'model': model, 'chunk_size': chunk_size, 'items': items, 'api_cost': api_cost}
+
+def store_meeting_embeddings(meeting_id: int, embeddings: Dict[str, Any], replace_existing: bool = False):
+    """Write the vectors from embed_transcript() for a meeting"""
+    conn = get_db_connection()
     cursor = conn.cursor()
+    write_meeting_embeddings(cursor, meeting_id, embeddings, replace_existing)
+    conn.commit()
+    conn.close()
+    invalidate_analytics_cache()
+
+def write_meeting_embeddings(cursor, meeting_id: int, embeddings: Dict[str, Any], replace_existing: bool = False):
+    import numpy as np
     
-    for i, chunk in enumerate(chunks):
-        # Create embedding using OpenAI Embeddings API
-        response = openai.Embedding.create(
-            model="text-embedding-ada-002",
-            input=chunk
-        )
+    model, chunk_size = embeddings['model'], embeddings['chunk_size']
+    rows = [(meeting_id, chunk, np.array(vector).tobytes(), chunk_index, model, chunk_size)
+            for chunk_index, chunk, vector in embeddings['items']]
+    api_cost = embeddings['api_cost']
+    
+    removed = 0
+    if replace_existing:
+        cursor.execute('DELETE FROM meeting_embeddings WHERE meeting_id = ?', (meeting_id,))
+        removed = cursor.rowcount
+    
+    cursor.executemany('''
+        INSERT INTO meeting_embeddings (meeting_id, text_chunk, embedding, chunk_index, model, chunk_size)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', rows)
+    
+    cursor.execute('UPDATE meetings SET api_cost = api_cost + ? WHERE id = ?', (api_cost, meeting_id))
+    update_analytics_stats(cursor, meeting_week(), meeting_id=meeting_id, searchable_chunks=len(rows) - removed,
+                           api_spend=api_cost)
+    bump_corpus_version(cursor)
+    
+    if rows:
+        store_meeting_vector(cursor, meeting_id, model, [vector for _, _, vector in embeddings['items']])
+        update_meeting_neighbors(cursor, meeting_id)
+        update_meeting_topics(cursor, meeting_id, model, embeddings['items'])
+
+def store_meeting_vector(cursor, meeting_id: int, model: str, vectors: List):
+    """Save a meeting's centroid: the normalized mean of its normalized chunk vectors"""
+    import numpy as np
+    
+    matrix = np.array(vectors, dtype=np.float64)
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    centroid = matrix.mean(axis=0)
+    centroid /= max(np.linalg.norm(centroid), 1e-12)
+    
+    cursor.execute('''
+        INSERT INTO meeting_vectors (meeting_id, model, vector, chunks) VALUES (?, ?, ?, ?)
+        ON CONFLICT(meeting_id) DO UPDATE SET
+            model = excluded.model, vector = excluded.vector, chunks = excluded.chunks,
+            updated_at = CURRENT_TIMESTAMP
+    ''', (meeting_id, model, centroid.astype(np.float32).tobytes(), len(vectors)))
+
+def load_meeting_vectors(cursor, model: str):
+    """(meeting ids, centroid matrix) for every meeting embedded with a model"""
+    import numpy as np
+    
+    rows = cursor.execute('SELECT meeting_id, vector FROM meeting_vectors WHERE model = ? ORDER BY meeting_id',
+                          (model,)).fetchall()
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 0), dtype=np.float32)
+    return (np.array([row[0] for row in rows], dtype=np.int64),
+            np.vstack([np.frombuffer(row[1], dtype=np.float32) for row in rows]))
+
+def write_neighbor_list(cursor, meeting_id: int, ids, similarities):
+    """Replace a meeting's neighbor list with its top SIMILAR_MEETINGS_K other meetings"""
+    import numpy as np
+    
+    candidates = ids != meeting_id
+    ids, similarities = ids[candidates], similarities[candidates]
+    top = np.argsort(-similarities)[:SIMILAR_MEETINGS_K]
+    
+    cursor.execute('DELETE FROM meeting_neighbors WHERE meeting_id = ?', (meeting_id,))
+    cursor.executemany('INSERT INTO meeting_neighbors (meeting_id, neighbor_id, similarity) VALUES (?, ?, ?)',
+                       [(meeting_id, int(ids[i]), float(similarities[i])) for i in top])
+
+def refresh_neighbor_lists(cursor, meeting_ids):
+    """Recompute the given meetings' neighbor lists from scratch"""
+    by_model = {}
+    for meeting_id in meeting_ids:
+        row = cursor.execute('SELECT model FROM meeting_vectors WHERE meeting_id = ?', (meeting_id,)).fetchone()
+        if row is None:
+            cursor.execute('DELETE FROM meeting_neighbors WHERE meeting_id = ?', (meeting_id,))
+        else:
+            by_model.setdefault(row[0], []).append(meeting_id)
+    
+    for model, model_meeting_ids in by_model.items():
+        ids, vectors = load_meeting_vectors(cursor, model)
+        for meeting_id in model_meeting_ids:
+            write_neighbor_list(cursor, meeting_id, ids, vectors @ vectors[ids == meeting_id][0])
+
+def remove_from_neighbor_lists(cursor, meeting_id: int):
+    """Drop a meeting's list and refill every list it appeared in; call after deleting its vector"""
+    affected = [row[0] for row in cursor.execute(
+        'SELECT meeting_id FROM meeting_neighbors WHERE neighbor_id = ?', (meeting_id,))]
+    cursor.execute('DELETE FROM meeting_neighbors WHERE meeting_id = ? OR neighbor_id = ?', (meeting_id, meeting_id))
+    refresh_neighbor_lists(cursor, affected)
+
+def update_meeting_neighbors(cursor, meeting_id: int):
+    """Fold a new or re-embedded meeting into the precomputed neighbor lists
+    
+    The meeting gets a fresh top-k list, and it is inserted into any other
+    list whose k-th entry it beats. Lists that referenced the meeting's old
+    centroid are recomputed in full, since its score there may have dropped.
+    """
+    model = cursor.execute('SELECT model FROM meeting_vectors WHERE meeting_id = ?', (meeting_id,)).fetchone()[0]
+    ids, vectors = load_meeting_vectors(cursor, model)
+    similarities = vectors @ vectors[ids == meeting_id][0]
+    write_neighbor_list(cursor, meeting_id, ids, similarities)
+    
+    stale = {row[0] for row in cursor.execute(
+        'SELECT meeting_id FROM meeting_neighbors WHERE neighbor_id = ?', (meeting_id,))}
+    cutoffs = {row[0]: (row[1], row[2]) for row in cursor.execute('''
+        SELECT meeting_id, COUNT(*), MIN(similarity) FROM meeting_neighbors GROUP BY meeting_id
+    ''')}
+    
+    # A re-embed under a new model leaves stale lists in the old model's space
+    refresh_neighbor_lists(cursor, stale.difference(ids.tolist()))
+    
+    for other_id, similarity in zip(ids.tolist(), similarities.tolist()):
+        if other_id == meeting_id:
+            continue
+        if other_id in stale:
+            write_neighbor_list(cursor, other_id, ids, vectors @ vectors[ids == other_id][0])
+            continue
         
-        embedding = response['data'][0]['embedding']
-        embedding_blob = np.array(embedding).tobytes()
+        count, weakest = cutoffs.get(other_id, (0, None))
+        if count < SIMILAR_MEETINGS_K or similarity > weakest:
+            cursor.execute('''
+                INSERT OR REPLACE INTO meeting_neighbors (meeting_id, neighbor_id, similarity) VALUES (?, ?, ?)
+            ''', (other_id, meeting_id, similarity))
+            if count >= SIMILAR_MEETINGS_K:
+                cursor.execute('''
+                    DELETE FROM meeting_neighbors WHERE meeting_id = ? AND neighbor_id = (
+                        SELECT neighbor_id FROM meeting_neighbors WHERE meeting_id = ?
+                        ORDER BY similarity ASC LIMIT 1
+                    )
+                ''', (other_id, other_id))
+
+def rebuild_meeting_similarity(cursor):
+    """Recompute every centroid and neighbor list from meeting_embeddings"""
+    import numpy as np
+    
+    cursor.execute('DELETE FROM meeting_vectors')
+    cursor.execute('DELETE FROM meeting_neighbors')
+    
+    # Each meeting's centroid comes from its most recently written model
+    rows = cursor.execute('''
+        SELECT me.meeting_id, me.model, me.embedding FROM meeting_embeddings me
+        WHERE me.model = (SELECT model FROM meeting_embeddings WHERE meeting_id = me.meeting_id
+                          ORDER BY id DESC LIMIT 1)
+        ORDER BY me.meeting_id, me.chunk_index
+    ''').fetchall()
+    
+    chunks = {}
+    for meeting_id, model, blob in rows:
+        chunks.setdefault((meeting_id, model), []).append(np.frombuffer(blob, dtype=np.float64))
+    for (meeting_id, model), vectors in chunks.items():
+        store_meeting_vector(cursor, meeting_id, model, vectors)
+    
+    for (model,) in cursor.execute('SELECT DISTINCT model FROM meeting_vectors').fetchall():
+        ids, vectors = load_meeting_vectors(cursor, model)
+        for start in range(0, len(ids), 256):
+            block = vectors[start:start + 256] @ vectors.T
+            for offset, similarities in enumerate(block):
+                write_neighbor_list(cursor, int(ids[start + offset]), ids, similarities)
+
+def load_topics(cursor, model: str):
+    """(centroids, chunks seen, word counts) of a model's topics, or None before they are seeded"""
+    import numpy as np
+    
+    rows = cursor.execute('SELECT centroid, chunks, terms FROM topics WHERE model = ? ORDER BY topic_id',
+                          (model,)).fetchall()
+    if not rows:
+        return None
+    return (np.vstack([np.frombuffer(row[0], dtype=np.float32) for row in rows]),
+            np.array([row[1] for row in rows], dtype=np.int64),
+            [json.loads(row[2]) for row in rows])
+
+def save_topics(cursor, model: str, centroids, counts, terms: List[Dict[str, int]], topic_ids):
+    cursor.executemany('''
+        INSERT INTO topics (model, topic_id, centroid, chunks, terms) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(model, topic_id) DO UPDATE SET
+            centroid = excluded.centroid, chunks = excluded.chunks, terms = excluded.terms,
+            updated_at = CURRENT_TIMESTAMP
+    ''', [(model, int(topic), centroids[topic].tobytes(), int(counts[topic]), json.dumps(terms[topic]))
+          for topic in topic_ids])
+
+def assign_meeting_topics(cursor, meeting_id: int, model: str, labels, chunks: List[str], terms: List[Dict[str, int]],
+                          week: str = None, counted: bool = True):
+    """Replace a meeting's topic distribution and add its words to the topics its chunks joined
+    
+    counted says whether its chunks were also added to the topics' chunk
+    counts (a mini-batch) or only assigned (seeding).
+    """
+    if week is None:
+        row = cursor.execute('SELECT created_at FROM meetings WHERE id = ?', (meeting_id,)).fetchone()
+        week = created_week(row[0] if row else None)
+    
+    grouped = topic_model.terms_by_topic(labels, chunks)
+    for topic, counts in grouped.items():
+        terms[topic] = topic_model.merge_terms(terms[topic], counts)
+    
+    sizes = Counter(int(label) for label in labels) if counted else Counter()
+    cursor.execute('DELETE FROM meeting_topics WHERE meeting_id = ?', (meeting_id,))
+    cursor.executemany('''
+        INSERT INTO meeting_topics (meeting_id, topic_id, model, week, weight, chunks, terms) VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', [(meeting_id, topic, model, week, weight, sizes[topic], json.dumps(grouped[topic]))
+          for topic, weight in topic_model.distribution(labels).items()])
+
+def remove_meeting_topics(cursor, meeting_id: int):
+    """Take a meeting's chunks and words back out of its topics and drop its distribution"""
+    rows = cursor.execute('''
+        SELECT mt.model, mt.topic_id, mt.chunks, mt.terms, t.terms FROM meeting_topics mt
+        JOIN topics t ON t.model = mt.model AND t.topic_id = mt.topic_id
+        WHERE mt.meeting_id = ?
+    ''', (meeting_id,)).fetchall()
+    cursor.executemany('''
+        UPDATE topics SET chunks = MAX(chunks - ?, 0), terms = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE model = ? AND topic_id = ?
+    ''', [(chunks, json.dumps(topic_model.subtract_terms(json.loads(terms), json.loads(added))), model, topic)
+          for model, topic, chunks, added, terms in rows])
+    cursor.execute('DELETE FROM meeting_topics WHERE meeting_id = ?', (meeting_id,))
+
+def update_meeting_topics(cursor, meeting_id: int, model: str, items: List):
+    """Fold a newly embedded meeting into the topic model as one mini-batch
+    
+    Only the centroids its chunks are assigned to move, and only this
+    meeting's distribution is written; other meetings keep theirs. The
+    centroids are seeded from the archive once a model has enough chunks.
+    """
+    # A re-embedded meeting replaces what it added before
+    remove_meeting_topics(cursor, meeting_id)
+    topics = load_topics(cursor, model)
+    if topics is None:
+        fit_topics(cursor, model)
+        return
+    
+    centroids, counts, terms = topics
+    labels = topic_model.minibatch_update(centroids, counts, topic_model.normalize([vector for _, _, vector in items]))
+    assign_meeting_topics(cursor, meeting_id, model, labels, [chunk for _, chunk, _ in items], terms)
+    save_topics(cursor, model, centroids, counts, terms, set(labels.tolist()))
+
+def fit_topics(cursor, model: str) -> bool:
+    """Seed a model's topics from a sample of its chunks and assign every meeting; False if there are too few
+    
+    Runs once per embedding model: when it first has TOPIC_COUNT *
+    TOPIC_SEED_CHUNKS_PER_TOPIC chunks, or to backfill a database created
+    before topics existed.
+    """
+    import numpy as np
+    
+    k = app.config['TOPIC_COUNT']
+    if k < 1:
+        return False
+    rows = cursor.execute('SELECT embedding FROM meeting_embeddings WHERE model = ? ORDER BY random() LIMIT ?',
+                          (model, TOPIC_FIT_SAMPLE)).fetchall()
+    if len(rows) < k * TOPIC_SEED_CHUNKS_PER_TOPIC:
+        return False
+    centroids, counts = topic_model.fit(
+        topic_model.normalize([np.frombuffer(row[0], dtype=np.float64) for row in rows]), k)
+    terms = [{} for _ in range(k)]
+    
+    cursor.execute('DELETE FROM meeting_topics WHERE model = ?', (model,))
+    meetings = cursor.execute('''
+        SELECT m.id, m.created_at FROM meetings m
+        WHERE EXISTS (SELECT 1 FROM meeting_embeddings me WHERE me.meeting_id = m.id AND me.model = ?)
+        ORDER BY m.id
+    ''', (model,)).fetchall()
+    for meeting_id, created_at in meetings:
+        chunks = cursor.execute('''
+            SELECT text_chunk, embedding FROM meeting_embeddings WHERE meeting_id = ? AND model = ? ORDER BY chunk_index
+        ''', (meeting_id, model)).fetchall()
+        labels = topic_model.assign(centroids, topic_model.normalize(
+            [np.frombuffer(blob, dtype=np.float64) for _, blob in chunks]))
+        assign_meeting_topics(cursor, meeting_id, model, labels, [chunk for chunk, _ in chunks], terms,
+                              created_week(created_at), counted=False)
+    
+    save_topics(cursor, model, centroids, counts, terms, range(k))
+    return True
+
+STALE_MEETINGS_WHERE = '''
+    WHERE transcription IS NOT NULL AND transcription != '' AND id > ?
+      AND NOT EXISTS (
+          SELECT 1 FROM meeting_embeddings me
+          WHERE me.meeting_id = m.id AND me.model = ? AND me.chunk_size = ?
+      )
+'''
+
+def find_stale_meetings(conn, after_id: int = 0, limit: int = -1) -> List:
+    """Meetings with a transcript but no vectors for the current model and chunking"""
+    return conn.execute(
+        f'SELECT id, transcription FROM meetings m {STALE_MEETINGS_WHERE} ORDER BY id LIMIT ?',
+        (after_id, app.config['EMBEDDING_MODEL'], app.config['EMBEDDING_CHUNK_SIZE'], limit)
+    ).fetchall()
+
+def count_stale_meetings(conn) -> int:
+    return conn.execute(
+        f'SELECT COUNT(*) FROM meetings m {STALE_MEETINGS_WHERE}',
+        (0, app.config['EMBEDDING_MODEL'], app.config['EMBEDDING_CHUNK_SIZE'])
+    ).fetchone()[0]
+
+def reindex_embeddings(batch_size: int = None, pause_seconds: float = None, stop_event=None) -> Dict[str, int]:
+    """Re-embed meetings indexed with another model or chunk size, in throttled batches
+    
+    Each meeting is swapped atomically, and search reads every model present
+    in the index, so results stay available for the whole migration.
+    """
+    batch_size = batch_size or app.config['REINDEX_BATCH_SIZE']
+    pause_seconds = app.config['REINDEX_PAUSE_SECONDS'] if pause_seconds is None else pause_seconds
+    result = {'processed': 0, 'failed': 0}
+    last_id = 0
+    
+    while not (stop_event and stop_event.is_set()):
+        conn = get_db_connection()
+        batch = find_stale_meetings(conn, last_id, batch_size)
+        conn.close()
+        if not batch:
+            break
         
-        cursor.execute('''
-            INSERT INTO meeting_embeddings (meeting_id, text_chunk, embedding, chunk_index)
-            VALUES (?, ?, ?, ?)
-        ''', (meeting_id, chunk, embedding_blob, i))
+        for meeting_id, transcript in batch:
+            last_id = meeting_id
+            try:
+                create_meeting_embeddings(meeting_id, transcript, replace_existing=True)
+                result['processed'] += 1
+            except Exception as e:
+                logger.error(f"Error re-indexing meeting {meeting_id}: {str(e)}")
+                result['failed'] += 1
+        
+        with _reindex_lock:
+            reindex_state().update(processed=result['processed'], failed=result['failed'])
+        logger.info(f"Re-indexed {result['processed']} meetings ({result['failed']} failed)")
+        time.sleep(pause_seconds)
     
+    return result
+
+def reindex_state() -> Dict[str, Any]:
+    """The current database's re-index progress; call with _reindex_lock held"""
+    shard = current_shard()
+    return _reindex_states.setdefault(current_database(), {
+        'running': False, 'tenant': shard.tenant if shard else None, 'processed': 0, 'failed': 0,
+        'started_at': None, 'finished_at': None
+    })
+
+def start_reindex_job() -> bool:
+    """Run reindex_embeddings on a background thread; False if one is already running for this database"""
+    with _reindex_lock:
+        state = reindex_state()
+        if state['running']:
+            return False
+        state.update(running=True, processed=0, failed=0, started_at=datetime.now().isoformat(), finished_at=None)
+    
+    def run():
+        try:
+            reindex_embeddings()
+        finally:
+            with _reindex_lock:
+                reindex_state().update(running=False, finished_at=datetime.now().isoformat())
+    
+    # The job runs against the shard of the request that started it
+    threading.Thread(target=contextvars.copy_context().run, args=(run,), name='reindex', daemon=True).start()
+    return True
+
+def cold_audio_folder() -> str:
+    return app.config['AUDIO_COLD_FOLDER'] or os.path.join(app.config['UPLOAD_FOLDER'], 'cold')
+
+def is_managed_file(path: str, *folders: str) -> bool:
+    """Whether path lies inside one of folders; files elsewhere (e.g. imported archives) are never removed"""
+    if not path:
+        return False
+    path = os.path.realpath(path)
+    return any(os.path.commonpath([path, os.path.realpath(folder)]) == os.path.realpath(folder)
+               for folder in folders)
+
+def remove_unreferenced_files(conn, paths: List[str], *folders: str) -> int:
+    """Delete managed files no remaining meeting points at; returns bytes freed"""
+    freed = 0
+    for path in paths:
+        if not path or not os.path.exists(path) or not is_managed_file(path, *folders):
+            continue
+        # Timestamped names can still collide (same title, same second)
+        referenced = conn.execute(
+            'SELECT 1 FROM meetings WHERE audio_file_path = ? OR visual_summary_path = ? LIMIT 1', (path, path)
+        ).fetchone()
+        if referenced:
+            continue
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            freed += size
+        except OSError as e:
+            logger.error(f"Error removing {path}: {str(e)}")
+    return freed
+
+def remove_upload(path: str):
+    """Delete an upload no meeting refers to (e.g. one replaced by its normalized copy)"""
+    conn = get_db_connection()
+    remove_unreferenced_files(conn, [path], app.config['UPLOAD_FOLDER'])
+    conn.close()
+
+def release_meeting_audio(meeting_id: int, audio_path: str):
+    """Drop a meeting's uploaded recording once it has been transcribed, if configured"""
+    if not app.config['DROP_AUDIO_AFTER_TRANSCRIPTION'] or not is_managed_file(audio_path, app.config['UPLOAD_FOLDER']):
+        return
+    
+    conn = get_db_connection()
+    conn.execute("UPDATE meetings SET audio_file_path = NULL, audio_tier = 'dropped' WHERE id = ?", (meeting_id,))
     conn.commit()
+    remove_unreferenced_files(conn, [audio_path], app.config['UPLOAD_FOLDER'])
+    conn.close()
+
+def delete_meeting(meeting_id: int) -> Optional[Dict[str, int]]:
+    """Delete a meeting with everything derived from it; None if it does not exist
+    
+    Rows, neighbor lists and analytics are updated in one transaction, then
+    the meeting's audio, visual summary and thumbnail are removed and the
+    freed pages are returned to the filesystem in the background.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    row = cursor.execute('''
+        SELECT duration_minutes, action_items, decisions, audio_file_path,
+               COALESCE(visual_summary_path, (
+                   SELECT json_extract(output, '$.path') FROM pipeline_checkpoints c
+                   WHERE c.meeting_id = m.id AND c.stage = 'visual'
+               )),
+               status
+        FROM meetings m WHERE id = ?
+    ''', (meeting_id,)).fetchone()
+    if row is None:
+        conn.close()
+        return None
+    duration, action_items, decisions, audio_path, visual_path, status = row
+    action_items = json.loads(action_items) if action_items else []
+    decisions = json.loads(decisions) if decisions else []
+    
+    task_ids = [row[0] for row in cursor.execute(
+        'SELECT DISTINCT task_id FROM action_items WHERE meeting_id = ? AND task_id IS NOT NULL', (meeting_id,))]
+    cursor.execute('DELETE FROM meeting_embeddings WHERE meeting_id = ?', (meeting_id,))
+    chunks = cursor.rowcount
+    for table in ('action_items', 'decisions', 'fine_tuning_data', 'meeting_vectors',
+                  'transcript_segments', 'pipeline_checkpoints'):
+        cursor.execute(f'DELETE FROM {table} WHERE meeting_id = ?', (meeting_id,))
+    refresh_tasks(cursor, task_ids)
+    remove_meeting_topics(cursor, meeting_id)
+    remove_from_neighbor_lists(cursor, meeting_id)
+    cursor.execute('DELETE FROM meetings WHERE id = ?', (meeting_id,))
+    
+    # Unfinished meetings were never counted
+    if status == 'complete':
+        update_analytics_stats(
+            cursor,
+            owners=[item.get('owner') for item in action_items],
+            owner_delta=-1,
+            duration_total=-duration if duration and duration > 0 else 0,
+            duration_count=-1 if duration and duration > 0 else 0,
+            searchable_chunks=-chunks
+        )
+        # Ingest, re-embedding and reindex spend may each have been booked in a different week
+        for week, meetings, items, decision_count, spend in cursor.execute('''
+            SELECT week, meetings, action_items, decisions, api_spend FROM analytics_meeting_weeks WHERE meeting_id = ?
+        ''', (meeting_id,)).fetchall():
+            update_analytics_stats(cursor, week, meetings=-meetings, action_items=-items, decisions=-decision_count,
+                                   api_spend=-spend)
+        cursor.execute('''
+            DELETE FROM analytics_weekly
+            WHERE meetings <= 0 AND action_items <= 0 AND decisions <= 0 AND ABS(api_spend) < 1e-9
+        ''')
+        cursor.execute('DELETE FROM analytics_owners WHERE action_items <= 0')
+    cursor.execute('DELETE FROM analytics_meeting_weeks WHERE meeting_id = ?', (meeting_id,))
+    bump_corpus_version(cursor)
+    conn.commit()
+    invalidate_analytics_cache()
+    
+    files = [audio_path, visual_path, visual_thumbnail_path(visual_path) if visual_path else None]
+    freed = remove_unreferenced_files(conn, files, app.config['UPLOAD_FOLDER'], cold_audio_folder(),
+                                     app.config['VISUALS_FOLDER'])
     conn.close()
+    
+    schedule_vacuum()
+    return {'embeddings': chunks, 'action_items': len(action_items), 'decisions': len(decisions),
+            'bytes_freed': freed}
+
+def vacuum_database(full: bool = False, database: str = None) -> Dict[str, int]:
+    """Return free pages to the filesystem
+    
+    With auto_vacuum=INCREMENTAL this frees VACUUM_PAGES_PER_STEP pages at a
+    time so writers are never blocked for long. A full VACUUM rewrites the
+    whole file (and switches older databases to incremental mode); it only
+    runs when asked for.
+    """
+    conn = get_db_connection(database)
+    page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+    free_pages = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    incremental = conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+    
+    if full:
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+    elif incremental:
+        remaining = free_pages
+        while remaining:
+            conn.execute(f'PRAGMA incremental_vacuum({VACUUM_PAGES_PER_STEP})').fetchall()
+            left = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            if left >= remaining:
+                break
+            remaining = left
+            time.sleep(0)
+    else:
+        free_pages = 0
+    
+    # Fold the vacuumed pages back into the database file and truncate the WAL
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchall()
+    conn.close()
+    return {'pages_freed': free_pages, 'bytes_freed': free_pages * page_size}
+
+_vacuum_lock = threading.Lock()
+_vacuum_running = set()  # databases with a background vacuum in progress
+
+def schedule_vacuum() -> bool:
+    """Run an incremental vacuum on a background thread; False if one is already running"""
+    database = current_database()
+    with _vacuum_lock:
+        if database in _vacuum_running:
+            return False
+        _vacuum_running.add(database)
+    
+    def run():
+        try:
+            vacuum_database(database=database)
+        except Exception as e:
+            logger.error(f"Error vacuuming database: {str(e)}")
+        finally:
+            with _vacuum_lock:
+                _vacuum_running.discard(database)
+    
+    threading.Thread(target=run, name='vacuum', daemon=True).start()
+    return True
 
 @app.route('/meetings', methods=['GET'])
 def get_meetings():
-    """Get all meetings"""
-    conn = sqlite3.connect('meetings.db')
+    """Get all meetings, or one page of list cards when limit or cursor is given
+    
+    Pages are newest first, carry summary_snippet instead of the full
+    summary, and continue from the returned next_cursor.
+    """
+    if 'limit' in request.args or 'cursor' in request.args:
+        return get_meetings_page()
+    
+    conn = get_db_connection()
     cursor = conn.cursor()
     
     cursor.execute('''
         SELECT id, title, date_recorded, summary, attendees, duration_minutes, created_at
-        FROM meetings ORDER BY created_at DESC
+        FROM meetings WHERE status = 'complete' ORDER BY created_at DESC
     ''')
     
     meetings = []
@@ -418,17 +2538,91 @@ def get_meetings():
     conn.close()
     return jsonify(meetings)
 
+def get_transcript_time_slice(meeting_id: int):
+    start = request.args.get('from', 0, type=float)
+    end = request.args.get('to', type=float)
+    if start is None or start < 0 or (end is not None and end <= start):
+        return jsonify({'error': 'from must be >= 0 and to must be greater than from'}), 400
+    start_ms = round(start * 1000)
+    end_ms = round(end * 1000) if end is not None else 2 ** 63 - 1
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    # Two seeks on (meeting_id, start_ms): the segment in progress at
+    # 'from', then forward until 'to'
+    cursor.execute('''
+        SELECT start_ms, end_ms, speaker, text FROM transcript_segments
+        WHERE meeting_id = ? AND start_ms < ? AND end_ms > ? AND start_ms >= COALESCE((
+            SELECT MAX(start_ms) FROM transcript_segments WHERE meeting_id = ? AND start_ms <= ?
+        ), 0)
+        ORDER BY start_ms LIMIT ?
+    ''', (meeting_id, end_ms, start_ms, meeting_id, start_ms, TRANSCRIPT_MAX_SEGMENTS + 1))
+    rows = cursor.fetchall()
+    
+    if not rows and not cursor.execute('SELECT 1 FROM meetings WHERE id = ?', (meeting_id,)).fetchone():
+        conn.close()
+        return jsonify({'error': 'Meeting not found'}), 404
+    conn.close()
+    
+    segments = [{
+        'start': row[0] / 1000,
+        'end': row[1] / 1000,
+        'speaker': row[2],
+        'text': row[3]
+    } for row in rows[:TRANSCRIPT_MAX_SEGMENTS]]
+    
+    return jsonify({
+        'meeting_id': meeting_id,
+        'from': start,
+        'to': end,
+        'segments': segments,
+        'next_from': segments[-1]['end'] if len(rows) > TRANSCRIPT_MAX_SEGMENTS else None
+    })
+
+def get_meetings_page():
+    limit, page_cursor = page_params()
+    where, params = ("WHERE status = 'complete' AND id < ?", [page_cursor]) if page_cursor else ("WHERE status = 'complete'", [])
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT id, title, date_recorded, summary_snippet, attendees, duration_minutes, created_at
+        FROM meetings {where}
+        ORDER BY id DESC LIMIT ?
+    ''', params + [limit + 1])
+    rows = cursor.fetchall()
+    conn.close()
+    
+    meetings = [{
+        'id': row[0],
+        'title': row[1],
+        'date_recorded': row[2],
+        'summary_snippet': row[3],
+        'attendees': row[4],
+        'duration_minutes': row[5],
+        'created_at': row[6]
+    } for row in rows[:limit]]
+    
+    return jsonify({
+        'items': meetings,
+        'next_cursor': meetings[-1]['id'] if len(rows) > limit else None
+    })
+
 @app.route('/meeting/<int:meeting_id>', methods=['GET'])
 def get_meeting_details(meeting_id):
-    """Get detailed meeting information"""
-    conn = sqlite3.connect('meetings.db')
+    """Get meeting metadata and summary (the transcript is fetched separately)"""
+    conn = get_db_connection()
     cursor = conn.cursor()
     
     cursor.execute('''
-        SELECT * FROM meetings WHERE id = ?
+        SELECT id, title, date_recorded, summary, action_items, decisions, attendees,
+               duration_minutes, audio_file_path, visual_summary_path, created_at, status, pipeline_error
+        FROM meetings WHERE id = ?
     ''', (meeting_id,))
     
     row = cursor.fetchone()
+    conn.close()
     if not row:
         return jsonify({'error': 'Meeting not found'}), 404
     
@@ -436,148 +2630,891 @@ def get_meeting_details(meeting_id):
         'id': row[0],
         'title': row[1],
         'date_recorded': row[2],
-        'transcription': row[3],
-        'summary': row[4],
-        'action_items': json.loads(row[5]) if row[5] else [],
-        'decisions': json.loads(row[6]) if row[6] else [],
-        'attendees': row[7],
-        'duration_minutes': row[8],
-        'audio_file_path': row[9],
-        'visual_summary_path': row[10],
-        'created_at': row[11]
+        'summary': row[3],
+        'action_items': json.loads(row[4]) if row[4] else [],
+        'decisions': json.loads(row[5]) if row[5] else [],
+        'attendees': row[6],
+        'duration_minutes': row[7],
+        'audio_file_path': row[8],
+        'visual_summary_path': row[9],
+        'visual_thumbnail_path': existing_visual_thumbnail(row[9]),
+        'created_at': row[10],
+        'status': row[11],
+        'pipeline_error': row[12],
+        'transcript_url': f'/meeting/{row[0]}/transcript',
+        'audio_url': f'/meeting/{row[0]}/audio' if row[8] else None
     }
     
-    conn.close()
     return jsonify(meeting)
 
+@app.route('/meeting/<int:meeting_id>', methods=['DELETE'])
+def delete_meeting_route(meeting_id):
+    """Delete a meeting, its derived data and its files"""
+    removed = delete_meeting(meeting_id)
+    if removed is None:
+        return jsonify({'error': 'Meeting not found'}), 404
+    return jsonify({'success': True, 'meeting_id': meeting_id, 'removed': removed})
+
+@app.route('/meeting/<int:meeting_id>/audio', methods=['GET'])
+def get_meeting_audio(meeting_id):
+    """Stream a meeting's recording with Range, If-Range and conditional GET support
+    
+    Browsers fetch only the bytes around the position they seek to, so
+    playback can start at a search hit without downloading the whole file.
+    """
+    conn = get_db_connection()
+    row = conn.execute('SELECT audio_file_path, audio_tier FROM meetings WHERE id = ?', (meeting_id,)).fetchone()
+    conn.close()
+    if not row:
+        return jsonify({'error': 'Meeting not found'}), 404
+    path, tier = row
+    if tier == 'dropped':
+        return jsonify({'error': 'Audio was removed by the retention policy'}), 410
+    if not path or not os.path.exists(path):
+        return jsonify({'error': 'Audio not available'}), 404
+    
+    if path.endswith('.gz'):
+        response = stream_archived_audio(path)
+    else:
+        response = send_file(
+            os.path.abspath(path),
+            mimetype=AUDIO_MIMETYPES.get(os.path.splitext(path)[1].lower(), 'application/octet-stream'),
+            conditional=True,
+            max_age=app.config['AUDIO_CACHE_MAX_AGE']
+        )
+        response = sendfile_range(response, path)
+        # werkzeug only advertises ranges on responses to Range requests
+        response.accept_ranges = 'bytes'
+    
+    # Recordings are private, but stable per path, so browsers may reuse fetched ranges
+    response.cache_control.public = False
+    response.cache_control.private = True
+    response.cache_control.max_age = app.config['AUDIO_CACHE_MAX_AGE']
+    return response
+
+def sendfile_range(response, path: str):
+    """Serve a 206 body through the server's wsgi.file_wrapper so it can use sendfile()
+    
+    werkzeug wraps partial file responses in an iterator that copies the
+    range through Python. gunicorn's file wrapper instead sends
+    Content-Length bytes from the file's current offset with os.sendfile,
+    so it is handed the file already positioned at the range start. Other
+    wrappers (werkzeug, wsgiref) read to EOF, so only ranges that end at EOF
+    take this path; bounded ranges keep werkzeug's length-limited body.
+    """
+    file_wrapper = request.environ.get('wsgi.file_wrapper')
+    if response.status_code != 206 or file_wrapper is None or request.method == 'HEAD':
+        return response
+    if response.content_range.stop != response.content_range.length:
+        return response
+    
+    response.response.close()
+    audio_file = open(path, 'rb')
+    audio_file.seek(response.content_range.start)
+    response.response = file_wrapper(audio_file, AUDIO_BLOCK_SIZE)
+    return response
+
+def stream_archived_audio(path: str):
+    """Decompress a gzip cold-tier recording on the fly (no Range support)"""
+    inner_extension = os.path.splitext(path[:-len('.gz')])[1].lower()
+    
+    def generate():
+        with gzip.open(path, 'rb') as audio_file:
+            for block in iter(lambda: audio_file.read(AUDIO_BLOCK_SIZE), b''):
+                yield block
+    
+    response = Response(generate(), mimetype=AUDIO_MIMETYPES.get(inner_extension, 'application/octet-stream'))
+    response.headers['Accept-Ranges'] = 'none'
+    return response
+
+@app.route('/meeting/<int:meeting_id>/transcript', methods=['GET'])
+def get_meeting_transcript(meeting_id):
+    """Get a slice of a meeting transcript by character offset and limit,
+    or by time (from/to, in seconds) when the meeting has segments
+    """
+    if 'from' in request.args or 'to' in request.args:
+        return get_transcript_time_slice(meeting_id)
+    
+    offset = request.args.get('offset', 0, type=int)
+    limit = request.args.get('limit', TRANSCRIPT_PAGE_SIZE, type=int)
+    if offset < 0 or limit <= 0:
+        return jsonify({'error': 'offset must be >= 0 and limit > 0'}), 400
+    limit = min(limit, TRANSCRIPT_MAX_PAGE_SIZE)
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    # Slice inside SQLite so only the requested page leaves the database
+    cursor.execute('''
+        SELECT substr(transcription, ? + 1, ?), length(transcription)
+        FROM meetings WHERE id = ?
+    ''', (offset, limit, meeting_id))
+    
+    row = cursor.fetchone()
+    conn.close()
+    if not row:
+        return jsonify({'error': 'Meeting not found'}), 404
+    
+    text, total_length = row[0] or '', row[1] or 0
+    next_offset = offset + len(text)
+    
+    return jsonify({
+        'meeting_id': meeting_id,
+        'offset': offset,
+        'limit': limit,
+        'total_length': total_length,
+        'text': text,
+        'next_offset': next_offset if next_offset < total_length else None
+    })
+
+@app.route('/meeting/<int:meeting_id>/similar', methods=['GET'])
+def get_similar_meetings(meeting_id):
+    """Meetings closest to this one, from the neighbor lists maintained at ingest"""
+    limit = request.args.get('limit', SIMILAR_MEETINGS_K, type=int)
+    if limit is None or not 1 <= limit <= SIMILAR_MEETINGS_K:
+        return jsonify({'error': f'limit must be an integer between 1 and {SIMILAR_MEETINGS_K}'}), 400
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    # One read on the (meeting_id, similarity) index; the outer join tells
+    # a meeting without neighbors apart from one that does not exist
+    cursor.execute('''
+        SELECT m.id, n.neighbor_id, n.similarity, o.title, o.date_recorded, o.summary
+        FROM meetings m
+        LEFT JOIN meeting_neighbors n ON n.meeting_id = m.id
+        LEFT JOIN meetings o ON o.id = n.neighbor_id
+        WHERE m.id = ?
+        ORDER BY n.similarity DESC
+        LIMIT ?
+    ''', (meeting_id, limit))
+    
+    rows = cursor.fetchall()
+    conn.close()
+    if not rows:
+        return jsonify({'error': 'Meeting not found'}), 404
+    
+    similar = [{
+        'meeting_id': row[1],
+        'similarity': round(row[2], 4),
+        'title': row[3],
+        'date': row[4],
+        'summary': row[5]
+    } for row in rows if row[1] is not None and row[3] is not None]
+    
+    return jsonify({'meeting_id': meeting_id, 'similar': similar})
+
+def page_params():
+    """Read keyset pagination parameters: limit and cursor (last id seen)"""
+    limit = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+    cursor = request.args.get('cursor', type=int)
+    return limit, cursor
+
+@app.route('/action-items', methods=['GET'])
+def get_action_items():
+    """Query action items across all meetings, newest first
+    
+    Filters: owner, priority, status, meeting_id, task_id, due_before,
+    due_after (YYYY-MM-DD). Paginate with limit and the returned next_cursor.
+    """
+    limit, page_cursor = page_params()
+    clauses, params = [], []
+    
+    for field in ('owner', 'priority', 'status', 'meeting_id', 'task_id'):
+        value = request.args.get(field)
+        if value:
+            clauses.append(f'ai.{field} = ?')
+            params.append(value)
+    if request.args.get('due_before'):
+        clauses.append('ai.due_date <= ?')
+        params.append(request.args['due_before'])
+    if request.args.get('due_after'):
+        clauses.append('ai.due_date >= ?')
+        params.append(request.args['due_after'])
+    if page_cursor:
+        clauses.append('ai.id < ?')
+        params.append(page_cursor)
+    
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT ai.id, ai.meeting_id, m.title, ai.task, ai.owner, ai.deadline, ai.due_date,
+               ai.priority, ai.status, ai.created_at, ai.task_id
+        FROM action_items ai JOIN meetings m ON ai.meeting_id = m.id
+        {where}
+        ORDER BY ai.id DESC LIMIT ?
+    ''', params + [limit + 1])
+    rows = cursor.fetchall()
+    conn.close()
+    
+    items = [{
+        'id': row[0],
+        'meeting_id': row[1],
+        'meeting_title': row[2],
+        'task': row[3],
+        'owner': row[4],
+        'deadline': row[5],
+        'due_date': row[6],
+        'priority': row[7],
+        'status': row[8],
+        'created_at': row[9],
+        'task_id': row[10]
+    } for row in rows[:limit]]
+    
+    return jsonify({
+        'items': items,
+        'next_cursor': items[-1]['id'] if len(rows) > limit else None
+    })
+
+@app.route('/action-items/<int:item_id>', methods=['PATCH'])
+def update_action_item(item_id):
+    """Update an action item's status (open, in_progress, done)
+    
+    A linked task is recomputed from its action items, so it is done once
+    every mention is done and in_progress while they disagree.
+    """
+    data = request.get_json(silent=True) or {}
+    status = data.get('status')
+    if status not in ACTION_ITEM_STATUSES:
+        return jsonify({'error': f"status must be one of {', '.join(ACTION_ITEM_STATUSES)}"}), 400
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute('UPDATE action_items SET status = ? WHERE id = ?', (status, item_id))
+    updated = cursor.rowcount
+    cursor.execute('SELECT task_id FROM action_items WHERE id = ? AND task_id IS NOT NULL', (item_id,))
+    refresh_tasks(cursor, [row[0] for row in cursor.fetchall()])
+    conn.commit()
+    conn.close()
+    
+    if not updated:
+        return jsonify({'error': 'Action item not found'}), 404
+    return jsonify({'id': item_id, 'status': status})
+
+@app.route('/tasks', methods=['GET'])
+def get_tasks():
+    """Query the deduplicated task ledger, most recently created first
+    
+    Filters: owner, status, min_mentions (e.g. 2 for tasks repeated across
+    meetings). Paginate with limit and the returned next_cursor.
+    """
+    limit, page_cursor = page_params()
+    clauses, params = [], []
+    
+    if request.args.get('owner'):
+        clauses.append('owner_key = ?')
+        params.append(owner_key(request.args['owner']))
+    if request.args.get('status'):
+        clauses.append('status = ?')
+        params.append(request.args['status'])
+    if request.args.get('min_mentions'):
+        clauses.append('mentions >= ?')
+        params.append(request.args.get('min_mentions', type=int))
+    if page_cursor:
+        clauses.append('id < ?')
+        params.append(page_cursor)
+    
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT id, task, owner, priority, due_date, status, mentions, first_meeting_id, last_meeting_id,
+               first_seen, last_seen
+        FROM tasks
+        {where}
+        ORDER BY id DESC LIMIT ?
+    ''', params + [limit + 1])
+    rows = cursor.fetchall()
+    conn.close()
+    
+    tasks = [{
+        'id': row[0],
+        'task': row[1],
+        'owner': row[2],
+        'priority': row[3],
+        'due_date': row[4],
+        'status': row[5],
+        'mentions': row[6],
+        'first_meeting_id': row[7],
+        'last_meeting_id': row[8],
+        'first_seen': row[9],
+        'last_seen': row[10]
+    } for row in rows[:limit]]
+    
+    return jsonify({
+        'items': tasks,
+        'next_cursor': tasks[-1]['id'] if len(rows) > limit else None
+    })
+
+@app.route('/tasks/<int:task_id>', methods=['PATCH'])
+def update_task(task_id):
+    """Update a task's status (open, in_progress, done) along with every action item that mentions it"""
+    data = request.get_json(silent=True) or {}
+    status = data.get('status')
+    if status not in ACTION_ITEM_STATUSES:
+        return jsonify({'error': f"status must be one of {', '.join(ACTION_ITEM_STATUSES)}"}), 400
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute('UPDATE tasks SET status = ? WHERE id = ?', (status, task_id))
+    updated = cursor.rowcount
+    cursor.execute('UPDATE action_items SET status = ? WHERE task_id = ?', (status, task_id))
+    conn.commit()
+    conn.close()
+    
+    if not updated:
+        return jsonify({'error': 'Task not found'}), 404
+    return jsonify({'id': task_id, 'status': status})
+
+@app.route('/decisions', methods=['GET'])
+def get_decisions():
+    """Query decisions across all meetings, newest first
+    
+    Filters: meeting_id, q (substring of the decision text). Paginate with
+    limit and the returned next_cursor.
+    """
+    limit, page_cursor = page_params()
+    clauses, params = [], []
+    
+    if request.args.get('meeting_id'):
+        clauses.append('d.meeting_id = ?')
+        params.append(request.args['meeting_id'])
+    if request.args.get('q'):
+        clauses.append('d.decision LIKE ?')
+        params.append(f"%{request.args['q']}%")
+    if page_cursor:
+        clauses.append('d.id < ?')
+        params.append(page_cursor)
+    
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT d.id, d.meeting_id, m.title, d.decision, d.rationale, d.impact, d.created_at
+        FROM decisions d JOIN meetings m ON d.meeting_id = m.id
+        {where}
+        ORDER BY d.id DESC LIMIT ?
+    ''', params + [limit + 1])
+    rows = cursor.fetchall()
+    conn.close()
+    
+    decisions = [{
+        'id': row[0],
+        'meeting_id': row[1],
+        'meeting_title': row[2],
+        'decision': row[3],
+        'rationale': row[4],
+        'impact': row[5],
+        'created_at': row[6]
+    } for row in rows[:limit]]
+    
+    return jsonify({
+        'items': decisions,
+        'next_cursor': decisions[-1]['id'] if len(rows) > limit else None
+    })
+
+def search_cache_key(query: str, limit: int) -> str:
+    """Cache key for a search: the database, normalized query and parameters"""
+    key = json.dumps([current_database(), normalize_query(query), limit])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def embed_search_query(query: str, models: List[str]) -> Dict[str, List[float]]:
+    """The query's embedding for each model, requested concurrently"""
+    async def embed_query():
+        return await asyncio.gather(*(
+            OPENAI_RUNNER.client.embeddings.create(model=model, input=query) for model in models
+        ))
+    
+    embeddings = {}
+    for model, response in zip(models, OPENAI_RUNNER.run(embed_query())):
+        record_openai_usage('embedding', model, response,
+                            bytes_sent=len(query.encode('utf-8')))
+        embeddings[model] = response.data[0].embedding
+    return embeddings
+
+def search_current_shard(conn, embeddings: Dict[str, List[float]], limit: int) -> List[Dict[str, Any]]:
+    """Top matches in the current shard's (refreshed) index, with their text read from conn"""
+    index = current_search_index()
+    matches = []
+    for model, embedding in embeddings.items():
+        matches.extend(index.search(model, embedding, limit))
+    
+    # Keep the top matches and fetch only their text from the database
+    similarities = dict(heapq.nlargest(limit, matches, key=lambda match: match[1]))
+    placeholders = ','.join('?' * len(similarities))
+    # The segment a chunk starts in gives the moment to seek to
+    rows = conn.execute(f'''
+        SELECT me.id, me.meeting_id, me.text_chunk, m.title, m.summary,
+               (SELECT ts.start_ms FROM transcript_segments ts
+                WHERE ts.meeting_id = me.meeting_id AND ts.char_start <= me.chunk_index * me.chunk_size
+                ORDER BY ts.char_start DESC LIMIT 1)
+        FROM meeting_embeddings me
+        JOIN meetings m ON me.meeting_id = m.id
+        WHERE me.id IN ({placeholders})
+    ''', list(similarities)).fetchall() if similarities else []
+    
+    results = [{
+        'meeting_id': row[1],
+        'text_chunk': row[2],
+        'similarity': similarities[row[0]],
+        'meeting_title': row[3],
+        'meeting_summary': row[4],
+        'start_time': row[5] / 1000 if row[5] is not None else None
+    } for row in rows]
+    
+    # Sort by similarity and return the top matches
+    results.sort(key=lambda x: x['similarity'], reverse=True)
+    return results
+
+def search_shards(tenants: List[str], query: str, limit: int) -> List[Dict[str, Any]]:
+    """Search several tenants' shards at once and merge their top matches
+    
+    Each shard's index is refreshed and searched on its own thread; the
+    query is embedded once for the union of the shards' models in between.
+    Every result names the tenant it came from.
+    """
+    opened = [open_tenant_shard(tenant) for tenant in tenants]
+    
+    def refresh(shard):
+        with use_shard(shard):
+            conn = get_db_connection()
+            shard.index.refresh(conn)
+            conn.close()
+    
+    def search(shard):
+        with use_shard(shard):
+            conn = get_db_connection()
+            results = search_current_shard(conn, embeddings, limit)
+            conn.close()
+        return [dict(result, tenant=shard.tenant) for result in results]
+    
+    with ThreadPoolExecutor(max_workers=min(len(opened), TENANT_SEARCH_WORKERS)) as pool:
+        list(pool.map(refresh, opened))
+        models = sorted({model for shard in opened for model in shard.index.models()}) or [app.config['EMBEDDING_MODEL']]
+        embeddings = embed_search_query(query, models)
+        per_shard = list(pool.map(search, opened))
+    
+    return heapq.nlargest(limit, (result for results in per_shard for result in results),
+                          key=lambda result: result['similarity'])
+
 @app.route('/search', methods=['POST'])
 def semantic_search():
-    """Semantic search across all meetings"""
+    """Semantic search across all meetings
+    
+    Searches the request's tenant (X-Tenant) by default; a "tenants" list
+    fans the search out across those tenants' shards instead.
+    """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         query = data.get('query', '')
         
         if not query:
             return jsonify({'error': 'Query is required'}), 400
         
-        # Create embedding for search query
-        response = openai.Embedding.create(
-            model="text-embedding-ada-002",
-            input=query
-        )
+        limit = data.get('limit', SEARCH_RESULTS_LIMIT)
+        if not isinstance(limit, int) or not 1 <= limit <= SEARCH_MAX_RESULTS:
+            return jsonify({'error': f'limit must be an integer between 1 and {SEARCH_MAX_RESULTS}'}), 400
         
-        query_embedding = np.array(response['data'][0]['embedding'])
+        tenants = data.get('tenants')
+        if tenants is not None:
+            if (not isinstance(tenants, list) or not 1 <= len(tenants) <= TENANT_SEARCH_MAX_SHARDS
+                    or not all(isinstance(tenant, str) and valid_tenant(tenant) for tenant in tenants)):
+                return jsonify({'error': f'tenants must be a list of 1 to {TENANT_SEARCH_MAX_SHARDS} tenant names'}), 400
+            try:
+                return jsonify(search_shards(list(dict.fromkeys(tenants)), query, limit))
+            except UnknownTenantError as e:
+                return jsonify({'error': f'Unknown tenant: {e}'}), 404
         
-        # Search similar chunks
-        conn = sqlite3.connect('meetings.db')
-        cursor = conn.cursor()
+        conn = get_db_connection()
+        shared = conn if app.config['SEARCH_CACHE_SHARED'] else None
+        cache_key = search_cache_key(query, limit)
+        version = get_corpus_version(conn)
         
-        cursor.execute('''
-            SELECT me.meeting_id, me.text_chunk, me.embedding, m.title, m.summary
-            FROM meeting_embeddings me
-            JOIN meetings m ON me.meeting_id = m.id
-        ''')
+        results = SEARCH_CACHE.get(cache_key, version, shared)
+        SEARCH_CACHE_REQUESTS.inc(result='hit' if results is not None else 'miss')
+        if results is not None:
+            conn.close()
+            response = jsonify(results)
+            response.headers['X-Cache'] = 'HIT'
+            return response
         
-        results = []
-        for row in cursor.fetchall():
-            chunk_embedding = np.frombuffer(row[2], dtype=np.float64)
-            similarity = np.dot(query_embedding, chunk_embedding) / (
-                np.linalg.norm(query_embedding) * np.linalg.norm(chunk_embedding)
-            )
-            
-            results.append({
-                'meeting_id': row[0],
-                'text_chunk': row[1],
-                'similarity': float(similarity),
-                'meeting_title': row[3],
-                'meeting_summary': row[4]
-            })
+        index = current_search_index()
+        index.refresh(conn)
         
-        # Sort by similarity and return top 10
-        results.sort(key=lambda x: x['similarity'], reverse=True)
+        # Meetings may be indexed with different models mid-migration, so
+        # embed the query once per model and compare like with like
+        models = index.models() or [app.config['EMBEDDING_MODEL']]
+        results = search_current_shard(conn, embed_search_query(query, models), limit)
         
+        # Cached under the version read before searching, so a concurrent
+        # ingest can only make this entry unreachable, never stale
+        SEARCH_CACHE.put(cache_key, version, results, shared)
         conn.close()
-        return jsonify(results[:10])
+        
+        response = jsonify(results)
+        response.headers['X-Cache'] = 'MISS'
+        return response
         
     except Exception as e:
         logger.error(f"Error in semantic search: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/fine-tune-data', methods=['POST'])
-def create_fine_tune_data():
-    """Prepare data for fine-tuning"""
-    try:
-        # Get all meetings for fine-tuning data preparation
-        conn = sqlite3.connect('meetings.db')
+def fine_tune_export_path() -> str:
+    """The current shard's JSONL export file; each database keeps its own, with its own high-water mark"""
+    path = app.config['FINE_TUNE_EXPORT_PATH']
+    shard = current_shard()
+    if shard is None:
+        return path
+    folder, name = os.path.split(path)
+    return os.path.join(folder, shard.tenant, name)
+
+def export_fine_tune_data(batch_size: int = FINE_TUNE_BATCH_SIZE) -> Dict[str, Any]:
+    """Append examples for meetings completed since the last export to the JSONL file
+    
+    Meetings are read in keyset-paginated batches past a high-water mark on
+    their completion order (not their id: a meeting is created when its
+    upload starts and may finish after later ones), so memory stays
+    constant and each meeting is exported exactly once. The
+    file's committed length is stored with the mark; anything past it (from
+    an interrupted run) is truncated before appending.
+    """
+    path = fine_tune_export_path()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with _fine_tune_export_lock:
+        export_lock = _fine_tune_export_locks.setdefault(path, threading.Lock())
+    
+    with export_lock:
+        conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute('SELECT id, transcription, summary, action_items FROM meetings')
-        meetings = cursor.fetchall()
+        cursor.execute(
+            'SELECT last_completion_seq, last_meeting_id, examples, bytes FROM fine_tune_exports WHERE path = ?', (path,))
+        last_completion_seq, last_meeting_id, total_examples, committed_bytes = cursor.fetchone() or (0, 0, 0, 0)
         
-        fine_tune_examples = []
+        # Start over if the file was removed or is shorter than what was recorded
+        if not os.path.exists(path) or os.path.getsize(path) < committed_bytes:
+            last_completion_seq, last_meeting_id, total_examples, committed_bytes = 0, 0, 0, 0
         
-        for meeting in meetings:
-            meeting_id, transcript, summary, action_items = meeting
+        new_examples = 0
+        with open(path, 'ab') as export_file:
+            export_file.truncate(committed_bytes)
             
-            # Create training examples for company-specific terminology
-            examples = [
-                {
-                    "prompt": f"Summarize this meeting transcript: {transcript[:500]}",
-                    "completion": summary
-                },
-                {
-                    "prompt": f"Extract action items from: {transcript[:500]}",
-                    "completion": action_items
-                }
-            ]
-            
-            for example in examples:
+            while True:
                 cursor.execute('''
-                    INSERT INTO fine_tuning_data (prompt, completion, meeting_id)
-                    VALUES (?, ?, ?)
-                ''', (example['prompt'], example['completion'], meeting_id))
+                    SELECT id, completion_seq, substr(transcription, 1, 500), summary, action_items
+                    FROM meetings WHERE completion_seq > ? ORDER BY completion_seq LIMIT ?
+                ''', (last_completion_seq, batch_size))
+                
+                fetched = 0
+                rows = []
+                lines = []
+                for meeting_id, completion_seq, transcript, summary, action_items in cursor:
+                    fetched += 1
+                    last_meeting_id, last_completion_seq = meeting_id, completion_seq
+                    completions = {'summary': summary, 'action_items': action_items}
+                    
+                    # Create training examples for company-specific terminology
+                    for example_type, prompt_prefix, system_prompt in FINE_TUNE_EXAMPLES:
+                        prompt = f"{prompt_prefix}{transcript or ''}"
+                        completion = completions[example_type]
+                        if not completion:
+                            continue
+                        
+                        rows.append((prompt, completion, meeting_id, example_type))
+                        lines.append(json.dumps({'messages': [
+                            {'role': 'system', 'content': system_prompt},
+                            {'role': 'user', 'content': prompt},
+                            {'role': 'assistant', 'content': completion}
+                        ]}) + '\n')
+                
+                if not fetched:
+                    break
                 
-                fine_tune_examples.append(example)
+                payload = ''.join(lines).encode('utf-8')
+                export_file.write(payload)
+                export_file.flush()
+                os.fsync(export_file.fileno())
+                
+                committed_bytes += len(payload)
+                total_examples += len(lines)
+                new_examples += len(lines)
+                
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO fine_tuning_data (prompt, completion, meeting_id, example_type)
+                    VALUES (?, ?, ?, ?)
+                ''', rows)
+                cursor.execute('''
+                    INSERT INTO fine_tune_exports (path, last_completion_seq, last_meeting_id, examples, bytes, updated_at)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(path) DO UPDATE SET
+                        last_completion_seq = excluded.last_completion_seq,
+                        last_meeting_id = excluded.last_meeting_id, examples = excluded.examples,
+                        bytes = excluded.bytes, updated_at = excluded.updated_at
+                ''', (path, last_completion_seq, last_meeting_id, total_examples, committed_bytes))
+                conn.commit()
         
-        conn.commit()
         conn.close()
+    
+    return {
+        'new_examples': new_examples,
+        'total_examples': total_examples,
+        'last_meeting_id': last_meeting_id,
+        'path': path,
+        'bytes': committed_bytes
+    }
+
+@app.route('/fine-tune-data', methods=['POST'])
+def create_fine_tune_data():
+    """Prepare data for fine-tuning"""
+    try:
+        result = export_fine_tune_data()
         
         return jsonify({
-            'message': f'Created {len(fine_tune_examples)} fine-tuning examples',
-            'examples_count': len(fine_tune_examples)
+            'message': f"Created {result['new_examples']} fine-tuning examples",
+            'examples_count': result['new_examples'],
+            'total_examples': result['total_examples']
         })
         
     except Exception as e:
         logger.error(f"Error creating fine-tune data: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/fine-tune-data/export', methods=['GET'])
+def download_fine_tune_data():
+    """Download the chat-format JSONL dataset written by POST /fine-tune-data (supports Range requests to resume)"""
+    path = fine_tune_export_path()
+    if not os.path.exists(path):
+        return jsonify({'error': 'No fine-tuning export yet; create one with POST /fine-tune-data'}), 404
+    
+    try:
+        return send_file(
+            os.path.abspath(path),
+            mimetype='application/jsonl',
+            as_attachment=True,
+            download_name='meeting_fine_tune.jsonl',
+            conditional=True
+        )
+    
+    except Exception as e:
+        logger.error(f"Error serving fine-tune data: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+def invalidate_analytics_cache():
+    """Drop the current database's cached analytics payload so the next request re-reads it"""
+    with _analytics_cache_lock:
+        _analytics_cache.pop(current_database(), None)
+
+def load_analytics_stats() -> Dict[str, Any]:
+    """Read the materialized analytics tables"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute('SELECT name, value FROM analytics_totals')
+    totals = dict(cursor.fetchall())
+    
+    cursor.execute('''
+        SELECT week, meetings, action_items, decisions, api_spend
+        FROM analytics_weekly ORDER BY week DESC LIMIT 12
+    ''')
+    weekly = [{
+        'week': row[0],
+        'meetings': row[1],
+        'action_items': row[2],
+        'decisions': row[3],
+        'api_spend_usd': round(row[4], 4)
+    } for row in reversed(cursor.fetchall())]
+    
+    cursor.execute('''
+        SELECT owner, action_items FROM analytics_owners
+        ORDER BY action_items DESC LIMIT 10
+    ''')
+    owners = [{'owner': row[0], 'action_items': row[1]} for row in cursor.fetchall()]
+    
+    conn.close()
+    
+    duration_count = totals.get('duration_count', 0)
+    avg_duration = totals.get('duration_total', 0) / duration_count if duration_count else 0
+    
+    return {
+        'total_meetings': int(totals.get('meetings', 0)),
+        'average_duration_minutes': round(avg_duration, 2),
+        'searchable_chunks': int(totals.get('searchable_chunks', 0)),
+        'total_action_items': int(totals.get('action_items', 0)),
+        'total_decisions': int(totals.get('decisions', 0)),
+        'api_spend_usd': round(totals.get('api_spend', 0), 4),
+        'meetings_per_week': weekly,
+        'action_items_per_owner': owners,
+        'apis_integrated': ['Whisper', 'GPT-4', 'Embeddings', 'DALL-E 3']
+    }
+
 @app.route('/analytics', methods=['GET'])
 def get_analytics():
     """Get meeting analytics and insights"""
-    conn = sqlite3.connect('meetings.db')
+    database = current_database()
+    with _analytics_cache_lock:
+        payload, expires_at = _analytics_cache.get(database, (None, 0.0))
+        if payload is not None and time.monotonic() < expires_at:
+            return jsonify(payload)
+    
+    payload = load_analytics_stats()
+    
+    with _analytics_cache_lock:
+        _analytics_cache[database] = (payload, time.monotonic() + app.config['ANALYTICS_CACHE_TTL'])
+    
+    return jsonify(payload)
+
+def load_topic_stats(conn, model: str) -> Dict[str, Any]:
+    """Topics with their keywords, weight and top meetings, plus each topic's weekly trend
+    
+    A meeting contributes the share of its chunks in a topic, so a topic's
+    weight is measured in meetings.
+    """
     cursor = conn.cursor()
+    topics = load_topics(cursor, model)
+    if topics is None:
+        return {'model': model, 'weeks': [], 'topics': []}
+    _, counts, terms = topics
+    labels = topic_model.keywords(terms)
+    
+    weeks = sorted(row[0] for row in cursor.execute(
+        'SELECT DISTINCT week FROM meeting_topics WHERE model = ? ORDER BY week DESC LIMIT ?',
+        (model, TOPIC_TREND_WEEKS)))
+    trends = {}
+    if weeks:
+        for week, topic, weight in cursor.execute('''
+            SELECT week, topic_id, SUM(weight) FROM meeting_topics
+            WHERE model = ? AND week >= ? GROUP BY week, topic_id
+        ''', (model, weeks[0])):
+            trends.setdefault(topic, [0.0] * len(weeks))[weeks.index(week)] = round(weight, 2)
     
-    # Basic analytics
-    cursor.execute('SELECT COUNT(*) FROM meetings')
-    total_meetings = cursor.fetchone()[0]
+    totals = dict(cursor.execute(
+        'SELECT topic_id, SUM(weight) FROM meeting_topics WHERE model = ? GROUP BY topic_id', (model,)).fetchall())
+    grand_total = sum(totals.values())
+    results = []
+    for topic, weight in sorted(totals.items(), key=lambda item: -item[1]):
+        cursor.execute('''
+            SELECT mt.meeting_id, m.title, mt.weight FROM meeting_topics mt JOIN meetings m ON m.id = mt.meeting_id
+            WHERE mt.model = ? AND mt.topic_id = ?
+            ORDER BY mt.weight DESC, mt.meeting_id DESC LIMIT ?
+        ''', (model, topic, TOPIC_TOP_MEETINGS))
+        results.append({
+            'id': topic,
+            'keywords': labels[topic],
+            'meetings': round(weight, 2),
+            'share': round(weight / grand_total, 4) if grand_total else 0,
+            'chunks_seen': int(counts[topic]),
+            'trend': trends.get(topic, [0.0] * len(weeks)),
+            'top_meetings': [{'meeting_id': row[0], 'title': row[1], 'weight': round(row[2], 2)}
+                             for row in cursor.fetchall()]
+        })
+    
+    return {'model': model, 'weeks': weeks, 'topics': results}
+
+@app.route('/analytics/topics', methods=['GET'])
+def get_topic_analytics():
+    """Topics across the meeting archive and how they trend week by week
     
-    cursor.execute('SELECT AVG(duration_minutes) FROM meetings WHERE duration_minutes > 0')
-    avg_duration = cursor.fetchone()[0] or 0
+    Cached per process until the corpus version changes, so repeated
+    dashboard loads cost one read of corpus_version.
+    """
+    model = app.config['EMBEDDING_MODEL']
+    conn = get_db_connection()
+    database, key = current_database(), (model, get_corpus_version(conn))
+    with _topics_cache_lock:
+        cached_key, payload = _topics_cache.get(database, (None, None))
+        if cached_key != key:
+            payload = None
     
+    cache_status = 'HIT' if payload is not None else 'MISS'
+    if payload is None:
+        payload = load_topic_stats(conn, model)
+        with _topics_cache_lock:
+            _topics_cache[database] = (key, payload)
+    conn.close()
+    
+    response = jsonify(payload)
+    response.headers['X-Cache'] = cache_status
+    return response
+
+@app.route('/reindex', methods=['GET'])
+def get_reindex_status():
+    """Progress of the embedding re-index towards the configured model"""
+    conn = get_db_connection()
+    pending = count_stale_meetings(conn)
+    cursor = conn.cursor()
     cursor.execute('''
-        SELECT COUNT(*) FROM meeting_embeddings me
-        JOIN meetings m ON me.meeting_id = m.id
+        SELECT model, chunk_size, COUNT(DISTINCT meeting_id), COUNT(*)
+        FROM meeting_embeddings GROUP BY model, chunk_size
     ''')
-    total_searchable_chunks = cursor.fetchone()[0]
+    versions = [{'model': row[0], 'chunk_size': row[1], 'meetings': row[2], 'chunks': row[3]}
+                for row in cursor.fetchall()]
+    conn.close()
     
+    with _reindex_lock:
+        state = dict(reindex_state())
+    
+    return jsonify(dict(
+        state,
+        target_model=app.config['EMBEDDING_MODEL'],
+        target_chunk_size=app.config['EMBEDDING_CHUNK_SIZE'],
+        pending_meetings=pending,
+        index_versions=versions
+    ))
+
+@app.route('/reindex', methods=['POST'])
+def start_reindex():
+    """Start a background re-index of meetings embedded with an older model or chunking"""
+    started = start_reindex_job()
+    return jsonify({
+        'started': started,
+        'message': 'Re-index started' if started else 'Re-index already running'
+    }), 202 if started else 409
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Expose pipeline, HTTP, SQLite and OpenAI metrics in Prometheus text format (summed over all workers)"""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+def preload_search_index() -> int:
+    """Load the search index up front (before forking workers); returns chunks loaded"""
+    conn = get_db_connection()
+    SEARCH_INDEX.refresh(conn)
     conn.close()
+    return SEARCH_INDEX.chunks
+
+@app.route('/ready', methods=['GET'])
+def readiness():
+    """Readiness probe: 200 once the database is reachable and the search index is loaded"""
+    checks = {}
+    index = current_search_index()
+    try:
+        conn = get_db_connection()
+        conn.execute('SELECT 1 FROM meetings LIMIT 1')
+        checks['database'] = 'ok'
+        
+        # Loads the index on the first probe when it was not preloaded
+        index.refresh(conn)
+        conn.close()
+    except sqlite3.Error as e:
+        checks['database'] = str(e)
+    
+    checks['search_index'] = 'ok' if index.loaded else 'not loaded'
+    checks['openai_api_key'] = 'ok' if OPENAI_RUNNER.has_api_key() else 'missing'
+    ready = all(status == 'ok' for status in checks.values())
     
     return jsonify({
-        'total_meetings': total_meetings,
-        'average_duration_minutes': round(avg_duration, 2),
-        'searchable_chunks': total_searchable_chunks,
-        'apis_integrated': ['Whisper', 'GPT-4', 'Embeddings', 'DALL-E 3']
-    })
+        'status': 'ready' if ready else 'unavailable',
+        'checks': checks,
+        'search_chunks': index.chunks,
+        'open_shards': len(SHARDS),
+        'ingest': {
+            'in_flight_minutes': round(INGEST_ADMISSION.in_flight_minutes, 2),
+            'budget_minutes': INGEST_ADMISSION.budget_minutes,
+            'queued': INGEST_ADMISSION.queued
+        },
+        'pid': os.getpid()
+    }), 200 if ready else 503
 
 if __name__ == '__main__':
     init_database()
@@ -0,0 +1,202 @@
+"""
+Local audio preprocessing for KIU Meeting Intelligence System
+
+Shrinks a recording before it is sent to Whisper: it is downmixed to mono,
+resampled to 16kHz (Whisper's own input rate, so nothing it would use is
+lost), and silence is removed with an energy-based voice activity detector
+in NumPy. Leading and trailing silence is trimmed and long pauses are
+shortened, while a Timeline keeps Whisper's timestamps mappable back to the
+original recording. WAV files are decoded with the standard library; other
+formats need ffmpeg on PATH and are otherwise left untouched.
+"""
+import bisect
+import os
+import shutil
+import subprocess
+import tempfile
+import wave
+from typing import List, Optional, Tuple
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03  # VAD frame length
+VAD_FLOOR_DB = -45.0  # frames quieter than this (dBFS) are never speech
+VAD_MARGIN_DB = 10.0  # speech must be this much louder than the noise floor
+VAD_RANGE_DB = 20.0  # ...but the threshold stays this far below the loudest frames
+VAD_PAD_SECONDS = 0.3  # kept around speech so word onsets and tails are not clipped
+SILENCE_MAX_SECONDS = 2.0  # pauses longer than this are shortened...
+SILENCE_KEEP_SECONDS = 1.0  # ...to this, so speaker turn gaps are still visible
+WAV_HEADER_BYTES = 44
+
+class Timeline:
+    """Maps times in the preprocessed audio back to the original recording"""
+
+    def __init__(self, pieces: List[Tuple[float, float]]):
+        self._processed = [processed for processed, _ in pieces]  # start of each kept piece
+        self._original = [original for _, original in pieces]
+
+    def to_original(self, seconds: float, end: bool = False) -> float:
+        """Original time of a point; an end exactly at a cut stays with the piece before it"""
+        i = max((bisect.bisect_left if end else bisect.bisect_right)(self._processed, seconds) - 1, 0)
+        return round(self._original[i] + seconds - self._processed[i], 3)
+
+class PreparedAudio:
+    """Result of prepare_audio: the file to transcribe plus before/after sizes"""
+
+    def __init__(self, speech_path: str, normalized_path: Optional[str], timeline: Timeline,
+                 original_bytes: int, original_seconds: float, speech_seconds: float):
+        self.speech_path = speech_path
+        self.normalized_path = normalized_path
+        self.timeline = timeline
+        self.original_bytes = original_bytes
+        self.speech_bytes = os.path.getsize(speech_path)
+        self.original_seconds = original_seconds
+        self.speech_seconds = speech_seconds
+
+    def discard(self, keep_normalized: bool = True):
+        """Remove the temporary speech file (and the normalized copy unless kept)"""
+        for path in (self.speech_path, None if keep_normalized else self.normalized_path):
+            if path and os.path.exists(path):
+                os.remove(path)
+
+def decode_audio(path: str):
+    """Mono float32 samples at SAMPLE_RATE, or None if the file cannot be decoded here"""
+    import numpy as np
+
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg:
+        pcm = subprocess.run([ffmpeg, '-nostdin', '-loglevel', 'error', '-i', path, '-ac', '1',
+                              '-ar', str(SAMPLE_RATE), '-f', 's16le', '-'],
+                             check=True, stdout=subprocess.PIPE).stdout
+        return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768
+
+    if not path.lower().endswith('.wav'):
+        return None
+    with wave.open(path, 'rb') as source:
+        channels, width, rate = source.getnchannels(), source.getsampwidth(), source.getframerate()
+        frames = source.readframes(source.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 3:
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = ((raw[:, 0] | raw[:, 1] << 8 | raw[:, 2] << 16) << 8 >> 8).astype(np.float32) / 2 ** 23
+    else:
+        dtype = {2: np.int16, 4: np.int32}[width]
+        samples = np.frombuffer(frames, dtype=dtype).astype(np.float32) / np.iinfo(dtype).max
+    samples = samples[:len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+    return resample(samples, rate, SAMPLE_RATE)
+
+def resample(samples, source_rate: int, target_rate: int = SAMPLE_RATE):
+    """Resample mono audio; whole-number ratios average each block as a simple low-pass"""
+    import numpy as np
+
+    if source_rate == target_rate or len(samples) == 0:
+        return samples.astype(np.float32)
+    if source_rate % target_rate == 0:
+        factor = source_rate // target_rate
+        return samples[:len(samples) // factor * factor].reshape(-1, factor).mean(axis=1).astype(np.float32)
+
+    count = int(len(samples) * target_rate / source_rate)
+    positions = np.arange(count) * (source_rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+def speech_frames(samples, rate: int = SAMPLE_RATE):
+    """Boolean speech flag per FRAME_SECONDS frame, padded by VAD_PAD_SECONDS"""
+    import numpy as np
+
+    frame = int(rate * FRAME_SECONDS)
+    count = len(samples) // frame
+    if count == 0:
+        return np.zeros(0, dtype=bool)
+    rms = np.sqrt(np.mean(samples[:count * frame].reshape(count, frame) ** 2, axis=1))
+    level = 20 * np.log10(np.maximum(rms, 1e-10))
+
+    # The quietest tenth of the recording approximates the room's noise floor;
+    # in wall-to-wall speech it is speech too, hence the cap below the loud frames
+    noise, loud = np.percentile(level, [10, 90])
+    threshold = max(VAD_FLOOR_DB, min(float(noise) + VAD_MARGIN_DB, float(loud) - VAD_RANGE_DB))
+    speech = level > threshold
+
+    pad = int(round(VAD_PAD_SECONDS / FRAME_SECONDS))
+    if pad and speech.any():
+        speech = np.convolve(speech, np.ones(2 * pad + 1), mode='same') > 0
+    return speech
+
+def kept_ranges(speech, frame: int) -> List[Tuple[int, int]]:
+    """Sample ranges to keep: speech runs, whole short pauses and the edges of long ones
+
+    Leading and trailing silence is dropped entirely.
+    """
+    runs = []
+    start = None
+    for i, is_speech in enumerate(list(speech) + [False]):
+        if is_speech and start is None:
+            start = i
+        elif not is_speech and start is not None:
+            runs.append([start, i])
+            start = None
+
+    max_gap = int(round(SILENCE_MAX_SECONDS / FRAME_SECONDS))
+    half_pause = int(round(SILENCE_KEEP_SECONDS / 2 / FRAME_SECONDS))
+    merged = []
+    for run in runs:
+        if merged and run[0] - merged[-1][1] <= max_gap:
+            merged[-1][1] = run[1]
+            continue
+        if merged:
+            merged[-1][1] += half_pause
+            run[0] -= half_pause
+        merged.append(run)
+    return [(start * frame, end * frame) for start, end in merged]
+
+def write_wav(path: str, samples, rate: int = SAMPLE_RATE):
+    import numpy as np
+
+    pcm = (np.clip(samples, -1, 1) * 32767).astype('<i2')
+    with wave.open(path, 'wb') as target:
+        target.setnchannels(1)
+        target.setsampwidth(2)
+        target.setframerate(rate)
+        target.writeframes(pcm.tobytes())
+
+def prepare_audio(path: str, keep_normalized: bool = False) -> Optional[PreparedAudio]:
+    """Write a mono 16kHz speech-only copy of a recording for transcription
+
+    Returns None when the file cannot be decoded, holds no detectable
+    speech, or would not get smaller. With keep_normalized, a mono 16kHz
+    copy of the full recording is also written next to the original
+    (same timeline, so it can replace it for playback) if that is smaller.
+    """
+    import numpy as np
+
+    samples = decode_audio(path)
+    if samples is None:
+        return None
+    speech = speech_frames(samples)
+    frame = int(SAMPLE_RATE * FRAME_SECONDS)
+    ranges = kept_ranges(speech, frame)
+    if not ranges:
+        return None
+
+    original_bytes = os.path.getsize(path)
+    speech_samples = sum(end - start for start, end in ranges)
+    if WAV_HEADER_BYTES + 2 * speech_samples >= original_bytes:
+        return None
+
+    pieces = []
+    processed = 0
+    for start, end in ranges:
+        pieces.append((processed / SAMPLE_RATE, start / SAMPLE_RATE))
+        processed += end - start
+
+    handle, speech_path = tempfile.mkstemp(suffix='.wav', prefix='speech_')
+    os.close(handle)
+    write_wav(speech_path, np.concatenate([samples[start:end] for start, end in ranges]))
+
+    normalized_path = None
+    if keep_normalized and WAV_HEADER_BYTES + 2 * len(samples) < original_bytes:
+        normalized_path = os.path.splitext(path)[0] + '.16k.wav'
+        write_wav(normalized_path, samples)
+
+    return PreparedAudio(speech_path, normalized_path, Timeline(pieces), original_bytes,
+                         len(samples) / SAMPLE_RATE, speech_samples / SAMPLE_RATE)
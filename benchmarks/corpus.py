@@ -0,0 +1,72 @@
+"""
+Synthetic corpus generation for the benchmark suite
+
+Writes N meetings x M embedded chunks straight into the meetings database,
+bypassing the AI pipeline, so search and listing can be measured at corpus
+sizes that would be too slow or expensive to ingest for real.
+"""
+import json
+import random
+
+import numpy as np
+
+from app import summary_snippet
+
+VOCABULARY = (
+    "budget roadmap release hiring customer mobile backend launch review quarter "
+    "marketing design security migration onboarding pricing analytics partner "
+    "deadline feedback infrastructure retention strategy research compliance"
+).split()
+
+OWNERS = ['Alice', 'Bob', 'Charlie', 'Dana', 'Eve', 'Frank']
+
+def synthetic_text(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(words))
+
+def generate_corpus(conn, meetings: int, chunks_per_meeting: int, embedding_dim: int = 1536,
+                    chunk_words: int = 160, seed: int = 0) -> int:
+    """Insert synthetic meetings with unit-norm embeddings; returns meetings written"""
+    rng = random.Random(seed)
+    vectors = np.random.default_rng(seed)
+    cursor = conn.cursor()
+
+    for _ in range(meetings):
+        chunks = [synthetic_text(rng, chunk_words) for _ in range(chunks_per_meeting)]
+        action_items = [{
+            'task': synthetic_text(rng, 4),
+            'owner': rng.choice(OWNERS),
+            'deadline': 'Next week',
+            'priority': rng.choice(['High', 'Medium', 'Low'])
+        } for _ in range(rng.randint(0, 4))]
+
+        summary = synthetic_text(rng, 60)
+        cursor.execute('''
+            INSERT INTO meetings (title, transcription, summary, summary_snippet, action_items, decisions,
+                                attendees, duration_minutes, audio_file_path, visual_summary_path, completion_seq)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(completion_seq), 0) + 1 FROM meetings))
+        ''', (
+            f"{rng.choice(VOCABULARY).title()} {rng.choice(VOCABULARY)} sync",
+            ' '.join(chunks),
+            summary,
+            summary_snippet(summary),
+            json.dumps(action_items),
+            json.dumps([]),
+            ', '.join(rng.sample(OWNERS, 3)),
+            rng.randint(5, 90),
+            '',
+            ''
+        ))
+        meeting_id = cursor.lastrowid
+
+        embeddings = vectors.standard_normal((chunks_per_meeting, embedding_dim))
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        cursor.executemany('''
+            INSERT INTO meeting_embeddings (meeting_id, text_chunk, embedding, chunk_index)
+            VALUES (?, ?, ?, ?)
+        ''', [(meeting_id, chunk, embedding.tobytes(), i)
+              for i, (chunk, embedding) in enumerate(zip(chunks, embeddings))])
+
+    # Invalidate cached search results, as ingest does
+    cursor.execute('UPDATE corpus_version SET version = version + 1 WHERE id = 1')
+    conn.commit()
+    return meetings
@@ -0,0 +1,193 @@
+"""
+Local stand-in for the OpenAI API used by the benchmark suite
+
+Implements just enough of the Whisper, Chat Completions, Embeddings and
+Images endpoints for app.py to run end to end, with configurable latency
+and error rates so throughput can be measured without network calls or
+API spend.
+
+Usage:
+    python benchmarks/fake_openai.py --port 8099 --latency-ms 50 --error-rate 0.01
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# 1x1 transparent PNG served as the "generated" visual summary
+TINY_PNG = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6360000002000100e221bc330000000049454e44ae426082'
+)
+
+SAMPLE_TRANSCRIPT = (
+    "Welcome everyone to the weekly sync. We reviewed the product roadmap, agreed to "
+    "prioritize the mobile release and assigned follow-up tasks for the budget review. "
+)
+
+class FakeOpenAIConfig:
+    """Behaviour knobs shared by all request handlers"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 embedding_dim: int = 1536, transcript_words: int = 600,
+                 audio_seconds: float = 1800, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.embedding_dim = embedding_dim
+        self.transcript_words = transcript_words
+        self.audio_seconds = audio_seconds
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            self.requests += 1
+            failed = self.random.random() < self.error_rate
+            self.errors += failed
+            return failed
+
+    def delay(self):
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        time.sleep(max(0.0, self.latency_ms + jitter) / 1000)
+
+def fake_embedding(text: str, dim: int) -> list:
+    """Deterministic pseudo-embedding so identical inputs map to identical vectors"""
+    seed = int.from_bytes(hashlib.sha256(text.encode('utf-8')).digest()[:8], 'little')
+    vector = np.random.default_rng(seed).standard_normal(dim)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+def fake_transcript(words: int) -> str:
+    sample = SAMPLE_TRANSCRIPT.split()
+    return ' '.join(sample[i % len(sample)] for i in range(words))
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Request handler emulating the subset of the OpenAI REST API app.py uses"""
+
+    config: FakeOpenAIConfig = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith('/images/'):
+            self._send(200, TINY_PNG, 'image/png')
+        else:
+            self._send_json(404, {'error': {'message': 'Not found'}})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.config.delay()
+        if self.config.should_fail():
+            self._send_json(500, {'error': {'message': 'Injected failure', 'type': 'server_error'}})
+            return
+
+        routes = {
+            '/v1/audio/transcriptions': self._transcription,
+            '/v1/chat/completions': self._chat,
+            '/v1/embeddings': self._embeddings,
+            '/v1/images/generations': self._image,
+        }
+        handler = routes.get(self.path.split('?')[0])
+        if handler is None:
+            self._send_json(404, {'error': {'message': f'Unknown endpoint {self.path}'}})
+            return
+        self._send_json(200, handler(body))
+
+    def _transcription(self, body: bytes) -> dict:
+        text = fake_transcript(self.config.transcript_words)
+        return {'text': text, 'duration': self.config.audio_seconds, 'language': 'english'}
+
+    def _chat(self, body: bytes) -> dict:
+        payload = json.loads(body)
+        prompt_tokens = sum(len(m.get('content', '')) for m in payload.get('messages', [])) // 4
+        message = {'role': 'assistant', 'content': 'The team aligned on the roadmap and assigned follow-ups.'}
+
+        if payload.get('functions'):
+            message['content'] = None
+            message['function_call'] = {
+                'name': 'extract_action_items',
+                'arguments': json.dumps({'action_items': [
+                    {'task': 'Prepare budget review', 'owner': 'Alice', 'deadline': 'Friday', 'priority': 'High'},
+                    {'task': 'Ship mobile release', 'owner': 'Bob', 'deadline': 'Next sprint', 'priority': 'Medium'},
+                ]})
+            }
+
+        return {
+            'id': 'chatcmpl-fake',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': payload.get('model', 'gpt-4'),
+            'choices': [{'index': 0, 'message': message, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': 40,
+                      'total_tokens': prompt_tokens + 40}
+        }
+
+    def _embeddings(self, body: bytes) -> dict:
+        payload = json.loads(body)
+        inputs = payload['input'] if isinstance(payload['input'], list) else [payload['input']]
+        tokens = sum(len(str(text)) for text in inputs) // 4
+        return {
+            'object': 'list',
+            'model': payload.get('model', 'text-embedding-ada-002'),
+            'data': [{'object': 'embedding', 'index': i,
+                      'embedding': fake_embedding(str(text), self.config.embedding_dim)}
+                     for i, text in enumerate(inputs)],
+            'usage': {'prompt_tokens': tokens, 'total_tokens': tokens}
+        }
+
+    def _image(self, body: bytes) -> dict:
+        host, port = self.server.server_address[:2]
+        return {'created': int(time.time()),
+                'data': [{'url': f'http://{host}:{port}/images/{time.time_ns()}.png'}]}
+
+    def _send_json(self, status: int, payload: dict):
+        self._send(status, json.dumps(payload).encode('utf-8'), 'application/json')
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def start_server(config: FakeOpenAIConfig = None, host: str = '127.0.0.1', port: int = 0):
+    """Start the fake API on a background thread; returns (server, base_url)"""
+    handler = type('ConfiguredHandler', (FakeOpenAIHandler,), {'config': config or FakeOpenAIConfig()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f'http://{host}:{port}/v1/'
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local OpenAI stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--embedding-dim', type=int, default=1536)
+    args = parser.parse_args()
+
+    config = FakeOpenAIConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.embedding_dim)
+    server, base_url = start_server(config, args.host, args.port)
+    print(f"🧪 Fake OpenAI API listening on {base_url}")
+    print(f"   Set OPENAI_BASE_URL={base_url} to point the app at it")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+HTTP load generator for comparing serving modes
+
+Drives a running server (``python run.py dev`` or ``python run.py prod``)
+with concurrent keep-alive clients and reports throughput and latency per
+endpoint. Used to produce the serving numbers in the README.
+
+Usage:
+    python benchmarks/load_test.py --url http://127.0.0.1:5000 --clients 32 --duration 20
+    python benchmarks/load_test.py --endpoints /meetings,/analytics --output prod.json
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+from run_benchmarks import latency_summary
+
+DEFAULT_ENDPOINTS = '/meetings,/analytics,/ready,search'
+
+def request_for(endpoint: str):
+    """(method, path, body) for an endpoint name; 'search' posts a query"""
+    if endpoint == 'search':
+        return 'POST', '/search', json.dumps({'query': 'budget review roadmap'})
+    return 'GET', endpoint, None
+
+def client_loop(host: str, port: int, endpoints: list, deadline: float, samples: dict, errors: dict):
+    connection = http.client.HTTPConnection(host, port, timeout=60)
+    i = 0
+    while time.perf_counter() < deadline:
+        endpoint = endpoints[i % len(endpoints)]
+        method, path, body = request_for(endpoint)
+        headers = {'Content-Type': 'application/json', 'Accept-Encoding': 'gzip'} if body else {'Accept-Encoding': 'gzip'}
+        start = time.perf_counter()
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=60)
+            ok = False
+        elapsed = time.perf_counter() - start
+        if ok:
+            samples[endpoint].append(elapsed)
+        else:
+            errors[endpoint] += 1
+        i += 1
+    connection.close()
+
+def run_load(url: str, endpoints: list, clients: int, duration: float) -> dict:
+    target = urlsplit(url)
+    samples = {endpoint: [] for endpoint in endpoints}
+    errors = {endpoint: 0 for endpoint in endpoints}
+    deadline = time.perf_counter() + duration
+
+    # Stagger the starting endpoint so every endpoint sees concurrent load
+    threads = [threading.Thread(target=client_loop, args=(
+        target.hostname, target.port or 80, endpoints[i % len(endpoints):] + endpoints[:i % len(endpoints)],
+        deadline, samples, errors)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(values) for values in samples.values())
+    return {
+        'url': url,
+        'clients': clients,
+        'duration_seconds': round(elapsed, 2),
+        'requests': total,
+        'errors': sum(errors.values()),
+        'requests_per_second': round(total / elapsed, 1),
+        'endpoints': {endpoint: dict(latency_summary(values), errors=errors[endpoint])
+                      for endpoint, values in samples.items() if values},
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test a running meeting intelligence server')
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--endpoints', default=DEFAULT_ENDPOINTS,
+                        help="comma-separated GET paths; 'search' posts to /search")
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--output', help='write JSON results to this file')
+    args = parser.parse_args(argv)
+
+    endpoints = [endpoint.strip() for endpoint in args.endpoints.split(',') if endpoint.strip()]
+    print(f"🚀 {args.clients} clients against {args.url} for {args.duration:g}s...")
+    results = run_load(args.url, endpoints, args.clients, args.duration)
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+    return results
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for KIU Meeting Intelligence System
+
+Runs the real Flask app in-process against a local OpenAI stand-in and a
+synthetic corpus, and writes JSON results that can be diffed between
+releases.
+
+Scenarios:
+    startup     cold process start: importing app.py and `run.py help`
+    ingest      /upload-meeting throughput and latency
+    search      /search p50/p99 latency versus corpus size
+    listing     /meetings first-page p50/p99 latency versus corpus size
+
+Usage:
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --scenarios search --corpus-sizes 100,1000,5000
+    python benchmarks/run_benchmarks.py --output new.json --compare old.json
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_corpus, synthetic_text
+from fake_openai import FakeOpenAIConfig, start_server
+
+SCENARIOS = ('startup', 'ingest', 'search', 'listing')
+
+STARTUP_COMMANDS = {
+    'import_app': [sys.executable, '-c', 'import app'],
+    'run_help': [sys.executable, os.path.join(ROOT, 'run.py'), 'help'],
+}
+
+def latency_summary(samples: list) -> dict:
+    """Summarize latencies (seconds) as milliseconds"""
+    values = np.array(samples) * 1000
+    return {
+        'count': len(samples),
+        'mean_ms': round(float(values.mean()), 3),
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p99_ms': round(float(np.percentile(values, 99)), 3),
+        'max_ms': round(float(values.max()), 3),
+    }
+
+def configure_app(workdir: str, base_url: str):
+    """Point app.py at a scratch database and the fake OpenAI server"""
+    import openai
+    from app import OPENAI_RUNNER, app, init_database
+
+    openai.api_key = 'sk-benchmark'
+    openai.base_url = base_url
+    openai.max_retries = 0
+    OPENAI_RUNNER.reset()
+
+    os.makedirs(workdir, exist_ok=True)
+    app.config['TESTING'] = True
+    app.config['DATABASE'] = os.path.join(workdir, 'benchmark.db')
+    app.config['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+    init_database()
+    return app
+
+def bench_startup(workdir: str, runs: int) -> dict:
+    """Time fresh interpreter starts; each run pays the full import cost"""
+    os.makedirs(workdir, exist_ok=True)
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    results = {}
+    for name, command in STARTUP_COMMANDS.items():
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, cwd=workdir, env=env, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            samples.append(time.perf_counter() - start)
+        results[name] = latency_summary(samples)
+    return results
+
+def bench_ingest(app, meetings: int, concurrency: int, audio_kb: int) -> dict:
+    """Upload meetings through the full pipeline and measure throughput"""
+    audio = os.urandom(audio_kb * 1024)
+
+    def upload(i):
+        start = time.perf_counter()
+        with app.test_client() as client:
+            response = client.post('/upload-meeting', data={
+                'title': f'Benchmark meeting {i}',
+                'attendees': 'Alice, Bob',
+                'audio_file': (io.BytesIO(audio), f'bench_{i}.mp3')
+            })
+        return time.perf_counter() - start, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(upload, range(meetings)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, status in results if status == 200]
+    return {
+        'meetings': meetings,
+        'concurrency': concurrency,
+        'audio_kb': audio_kb,
+        'succeeded': len(latencies),
+        'failed': meetings - len(latencies),
+        'wall_seconds': round(elapsed, 3),
+        'meetings_per_minute': round(len(latencies) / elapsed * 60, 2),
+        'latency': latency_summary(latencies) if latencies else None,
+    }
+
+def bench_requests(app, method: str, path: str, payloads: list) -> dict:
+    latencies = []
+    with app.test_client() as client:
+        for payload in payloads:
+            start = time.perf_counter()
+            response = client.open(path, method=method, json=payload)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise RuntimeError(f'{method} {path} returned {response.status_code}')
+    return latency_summary(latencies)
+
+def bench_corpus(app, scenarios: list, corpus_sizes: list, chunks_per_meeting: int,
+                 queries: int, embedding_dim: int) -> dict:
+    """Grow a synthetic corpus and time search/listing at each size"""
+    import random
+    from app import DEFAULT_PAGE_SIZE, get_db_connection, rebuild_analytics_stats
+
+    rng = random.Random(42)
+    query_payloads = [{'query': synthetic_text(rng, 5)} for _ in range(queries)]
+    results = {name: [] for name in scenarios}
+    generated = 0
+
+    for size in sorted(corpus_sizes):
+        conn = get_db_connection()
+        generate_corpus(conn, size - generated, chunks_per_meeting, embedding_dim, seed=size)
+        rebuild_analytics_stats(conn)
+        conn.commit()
+        conn.close()
+        generated = size
+
+        point = {'corpus_meetings': size, 'corpus_chunks': size * chunks_per_meeting}
+        if 'search' in scenarios:
+            results['search'].append(dict(point, **bench_requests(app, 'POST', '/search', query_payloads)))
+        if 'listing' in scenarios:
+            # The first page the dashboard requests
+            results['listing'].append(dict(point, **bench_requests(app, 'GET', f'/meetings?limit={DEFAULT_PAGE_SIZE}',
+                                                                   [None] * queries)))
+
+    return results
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def flatten(value, prefix: str = '') -> dict:
+    """Flatten nested results into dotted keys for comparison"""
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = ((str(entry.get('corpus_meetings', i)) if isinstance(entry, dict) else str(i), entry)
+                 for i, entry in enumerate(value))
+    else:
+        return {prefix: value}
+    flat = {}
+    for key, child in items:
+        flat.update(flatten(child, f'{prefix}.{key}' if prefix else key))
+    return flat
+
+def compare_results(baseline: dict, current: dict):
+    """Print the relative change of every numeric metric present in both runs"""
+    old, new = flatten(baseline['scenarios']), flatten(current['scenarios'])
+    print(f"\n📊 Comparison against {baseline['meta'].get('git_commit', 'baseline')}")
+    for key in sorted(set(old) & set(new)):
+        before, after = old[key], new[key]
+        if not isinstance(before, (int, float)) or not isinstance(after, (int, float)) or not before:
+            continue
+        change = (after - before) / before * 100
+        print(f"   {key:<50} {before:>12.3f} -> {after:>12.3f}  ({change:+.1f}%)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the meeting intelligence endpoints')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help='comma-separated subset of: ' + ', '.join(SCENARIOS))
+    parser.add_argument('--startup-runs', type=int, default=5)
+    parser.add_argument('--ingest-meetings', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--audio-kb', type=int, default=512)
+    parser.add_argument('--corpus-sizes', default='100,1000')
+    parser.add_argument('--chunks-per-meeting', type=int, default=10)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--embedding-dim', type=int, default=1536)
+    parser.add_argument('--latency-ms', type=float, default=0, help='fake API latency per call')
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of fake API calls that fail')
+    parser.add_argument('--output', help='write JSON results to this file')
+    parser.add_argument('--compare', help='baseline JSON results to diff against')
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    for name in ('app', 'httpx'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    config = FakeOpenAIConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.embedding_dim)
+    server, base_url = start_server(config)
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'params': vars(args),
+        },
+        'scenarios': {}
+    }
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # Visual summaries are written relative to the working directory
+        os.chdir(workdir)
+        try:
+            if 'startup' in scenarios:
+                print(f"⏱️  Timing cold start ({args.startup_runs} runs)...")
+                results['scenarios']['startup'] = bench_startup(
+                    os.path.join(workdir, 'startup'), args.startup_runs)
+
+            if 'ingest' in scenarios:
+                print(f"🚀 Ingesting {args.ingest_meetings} meetings ({args.concurrency} concurrent)...")
+                app = configure_app(os.path.join(workdir, 'ingest'), base_url)
+                results['scenarios']['ingest'] = bench_ingest(
+                    app, args.ingest_meetings, args.concurrency, args.audio_kb)
+
+            corpus_scenarios = [name for name in scenarios if name in ('search', 'listing')]
+            if corpus_scenarios:
+                sizes = [int(size) for size in args.corpus_sizes.split(',')]
+                print(f"🔍 Measuring {', '.join(corpus_scenarios)} at corpus sizes {sizes}...")
+                app = configure_app(os.path.join(workdir, 'corpus'), base_url)
+                results['scenarios'].update(bench_corpus(
+                    app, corpus_scenarios, sizes, args.chunks_per_meeting,
+                    args.queries, args.embedding_dim))
+        finally:
+            os.chdir(cwd)
+            server.shutdown()
+
+    results['meta']['fake_api'] = {'requests': config.requests, 'injected_errors': config.errors}
+    print(json.dumps(results['scenarios'], indent=2))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_results(json.load(f), results)
+
+    return results
+
+if __name__ == '__main__':
+    main()
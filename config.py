@@ -20,10 +20,64 @@ class Config:
     # Database Configuration
     DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///meetings.db')
     
+    # Multi-tenant Sharding (one SQLite file per tenant)
+    TENANT_DATA_FOLDER = os.getenv('TENANT_DATA_FOLDER', 'tenants')
+    TENANT_MAX_OPEN_SHARDS = int(os.getenv('TENANT_MAX_OPEN_SHARDS', 32))
+    
     # Upload Configuration
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 104857600))  # 100MB
     ALLOWED_EXTENSIONS = {'mp3', 'wav', 'm4a'}
+    VISUALS_FOLDER = os.getenv('VISUALS_FOLDER', 'static/visuals')  # the dashboard loads visuals from /static/visuals
+    
+    # Embeddings Configuration
+    EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'text-embedding-ada-002')
+    EMBEDDING_CHUNK_SIZE = int(os.getenv('EMBEDDING_CHUNK_SIZE', 1000))
+    REINDEX_BATCH_SIZE = int(os.getenv('REINDEX_BATCH_SIZE', 10))
+    REINDEX_PAUSE_SECONDS = float(os.getenv('REINDEX_PAUSE_SECONDS', 1.0))
+    
+    # Transcript and Audio Configuration
+    SPEAKER_LABELS = os.getenv('SPEAKER_LABELS', 'True').lower() == 'true'
+    AUDIO_CACHE_MAX_AGE = int(os.getenv('AUDIO_CACHE_MAX_AGE', 24 * 3600))
+    AUDIO_PREPROCESS = os.getenv('AUDIO_PREPROCESS', 'False').lower() == 'true'
+    
+    # Chat Model Routing
+    MODEL_ROUTES = os.getenv('MODEL_ROUTES', '')
+    MODEL_ESCALATION = os.getenv('MODEL_ESCALATION', '')
+    
+    # Checkpointed Pipeline
+    RESUME_AFTER_MINUTES = int(os.getenv('RESUME_AFTER_MINUTES', 30))
+    
+    # Topic Clustering Configuration
+    TOPIC_COUNT = int(os.getenv('TOPIC_COUNT', 12))
+    
+    # Task Ledger Configuration
+    TASK_MATCH_THRESHOLD = float(os.getenv('TASK_MATCH_THRESHOLD', 0.9))
+    
+    # Ingest Admission Control (per process)
+    INGEST_BUDGET_MINUTES = float(os.getenv('INGEST_BUDGET_MINUTES', 180))
+    INGEST_MAX_QUEUED = int(os.getenv('INGEST_MAX_QUEUED', 2))
+    INGEST_QUEUE_TIMEOUT = float(os.getenv('INGEST_QUEUE_TIMEOUT', 30))
+    
+    # Fine-tuning Export Configuration
+    FINE_TUNE_EXPORT_PATH = os.getenv('FINE_TUNE_EXPORT_PATH', os.path.join('exports', 'fine_tune.jsonl'))
+    
+    # Analytics Configuration
+    ANALYTICS_CACHE_TTL = int(os.getenv('ANALYTICS_CACHE_TTL', 30))  # seconds
+    
+    # Search Result Cache Configuration
+    SEARCH_CACHE_SHARED = os.getenv('SEARCH_CACHE_SHARED', 'False').lower() == 'true'
+    
+    # Compression and Static Caching Configuration
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))  # bytes
+    STATIC_CACHE_MAX_AGE = int(os.getenv('STATIC_CACHE_MAX_AGE', 365 * 24 * 3600))  # seconds
+    
+    # Retention and Storage Tiering Configuration (0 days disables a rule)
+    AUDIO_COLD_FOLDER = os.getenv('AUDIO_COLD_FOLDER', '')  # default: <UPLOAD_FOLDER>/cold
+    AUDIO_COLD_AFTER_DAYS = int(os.getenv('AUDIO_COLD_AFTER_DAYS', 30))
+    AUDIO_RETENTION_DAYS = int(os.getenv('AUDIO_RETENTION_DAYS', 0))
+    MEETING_RETENTION_DAYS = int(os.getenv('MEETING_RETENTION_DAYS', 0))
+    DROP_AUDIO_AFTER_TRANSCRIPTION = os.getenv('DROP_AUDIO_AFTER_TRANSCRIPTION', 'False').lower() == 'true'
     
     # API Rate Limiting (for production)
     RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'False').lower() == 'true'
@@ -36,7 +90,7 @@ class Config:
         
         # Create necessary directories
         os.makedirs(Config.UPLOAD_FOLDER, exist_ok=True)
-        os.makedirs('static/visuals', exist_ok=True)
+        os.makedirs(Config.VISUALS_FOLDER, exist_ok=True)
         
         return True
 
@@ -127,7 +127,7 @@ def create_sample_data():
     print("📊 Creating sample demonstration data...")
     
     try:
-        from app import init_database
+        from app import init_database, get_db_connection, rebuild_analytics_stats
         import json
         
         # Initialize the actual database
@@ -186,7 +186,7 @@ def create_sample_data():
         ]
         
         # Insert sample data into database
-        conn = sqlite3.connect('meetings.db')
+        conn = get_db_connection()
         cursor = conn.cursor()
         
         for meeting in sample_meetings:
@@ -204,6 +204,8 @@ def create_sample_data():
                 datetime.now().isoformat()
             ))
         
+        # Sample rows bypass the ingest pipeline, so refresh the aggregates
+        rebuild_analytics_stats(conn)
         conn.commit()
         conn.close()
         
@@ -0,0 +1,199 @@
+"""
+Bulk import of meeting recording archives for KIU Meeting Intelligence System
+
+Walks a directory tree, deduplicates recordings by content hash and runs
+each new file through the ingest pipeline on a bounded worker pool.
+Progress is checkpointed in the import_files table, so an interrupted
+import resumes where it stopped when the same command is run again.
+"""
+import contextvars
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from app import ALLOWED_EXTENSIONS, get_db_connection, logger, process_meeting_audio
+
+HASH_BLOCK_SIZE = 1024 * 1024
+RECORD_BATCH_SIZE = 50  # checkpoint rows written per transaction
+
+def init_import_tables():
+    """Create the import checkpoint table"""
+    conn = get_db_connection()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS import_files (
+            path TEXT PRIMARY KEY,
+            size INTEGER,
+            mtime REAL,
+            audio_hash TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            meeting_id INTEGER,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_import_files_hash ON import_files (audio_hash)')
+    conn.commit()
+    conn.close()
+
+def find_recordings(root: str) -> Iterator[str]:
+    """Yield supported audio files under root in a stable order"""
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            if '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS:
+                yield os.path.join(directory, filename)
+
+def file_hash(path: str) -> str:
+    """SHA-256 of the file contents, read in 1MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def title_from_path(path: str) -> str:
+    """Derive a meeting title from a recording's filename"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return ' '.join(stem.replace('_', ' ').replace('-', ' ').split()).title() or 'Imported Meeting'
+
+class ImportCheckpoint:
+    """Per-file import state backed by the import_files table
+
+    Finished files are read once per run, and checkpoint rows are written in
+    batches of RECORD_BATCH_SIZE; flush() writes what is left.
+    """
+
+    def __init__(self, batch_size: int = RECORD_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._hash_locks = {}
+        self._finished = {}
+        self._pending = []
+
+    def load(self):
+        """Read the files earlier runs finished (imported or duplicate)"""
+        conn = get_db_connection()
+        self._finished = {path: (size, mtime) for path, size, mtime in conn.execute(
+            "SELECT path, size, mtime FROM import_files WHERE status IN ('done', 'duplicate')")}
+        conn.close()
+
+    def is_unchanged_and_done(self, path: str, size: int, mtime: float) -> bool:
+        return self._finished.get(path) == (size, mtime)
+
+    @contextmanager
+    def hash_lock(self, audio_hash: str):
+        """Hold while a file is checked and ingested; a copy waits until the first has finished or failed"""
+        with self._lock:
+            lock = self._hash_locks.setdefault(audio_hash, threading.Lock())
+        with lock:
+            yield
+
+    def imported_meeting(self, audio_hash: str) -> Optional[int]:
+        """Id of the completed meeting with this audio, if any
+
+        A meeting whose pipeline did not finish is not a duplicate: importing
+        the file again resumes it from its checkpoints.
+        """
+        conn = get_db_connection()
+        row = conn.execute("SELECT id FROM meetings WHERE audio_hash = ? AND status = 'complete' LIMIT 1",
+                           (audio_hash,)).fetchone()
+        conn.close()
+        return row[0] if row else None
+
+    def record(self, path: str, size: int, mtime: float, audio_hash: str, status: str,
+               meeting_id: int = None, error: str = None):
+        with self._lock:
+            self._pending.append((path, size, mtime, audio_hash, status, meeting_id, error))
+            if len(self._pending) < self.batch_size:
+                return
+            rows, self._pending = self._pending, []
+        self._write(rows)
+
+    def flush(self):
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if rows:
+            self._write(rows)
+
+    def _write(self, rows):
+        conn = get_db_connection()
+        conn.executemany('''
+            INSERT INTO import_files (path, size, mtime, audio_hash, status, meeting_id, attempts, error)
+            VALUES (?, ?, ?, ?, ?, ?, 1, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                size = excluded.size, mtime = excluded.mtime, audio_hash = excluded.audio_hash,
+                status = excluded.status, meeting_id = excluded.meeting_id,
+                attempts = attempts + 1, error = excluded.error, updated_at = CURRENT_TIMESTAMP
+        ''', rows)
+        conn.commit()
+        conn.close()
+
+def import_file(path: str, checkpoint: ImportCheckpoint, attendees: str = '') -> Dict:
+    """Hash, dedupe and ingest a single recording"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    result = {'path': path, 'bytes': stat.st_size}
+
+    if checkpoint.is_unchanged_and_done(path, stat.st_size, stat.st_mtime):
+        result['status'] = 'skipped'
+        return result
+
+    audio_hash = file_hash(path)
+    with checkpoint.hash_lock(audio_hash):
+        existing = checkpoint.imported_meeting(audio_hash)
+        if existing is not None:
+            checkpoint.record(path, stat.st_size, stat.st_mtime, audio_hash, 'duplicate', existing)
+            result.update(status='duplicate', meeting_id=existing)
+            return result
+
+        try:
+            meeting_id = process_meeting_audio(path, title_from_path(path), attendees, audio_hash)
+        except Exception as e:
+            checkpoint.record(path, stat.st_size, stat.st_mtime, audio_hash, 'failed', error=str(e))
+            result.update(status='failed', error=str(e))
+            return result
+
+    checkpoint.record(path, stat.st_size, stat.st_mtime, audio_hash, 'done', meeting_id)
+    result.update(status='imported', meeting_id=meeting_id)
+    return result
+
+def import_directory(root: str, workers: int = 4, attendees: str = '', limit: int = None,
+                     progress=None) -> Dict:
+    """Import every new recording under root; safe to re-run to resume"""
+    init_import_tables()
+    checkpoint = ImportCheckpoint()
+    checkpoint.load()
+    paths = list(find_recordings(root))[:limit]
+
+    summary = {'files': len(paths), 'imported': 0, 'duplicate': 0, 'skipped': 0,
+               'failed': 0, 'bytes_imported': 0}
+    start = time.perf_counter()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            # Each worker runs in a copy of this context so it writes to the same shard
+            futures = [pool.submit(contextvars.copy_context().run, import_file, path, checkpoint, attendees)
+                       for path in paths]
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                summary[result['status']] += 1
+                if result['status'] == 'imported':
+                    summary['bytes_imported'] += result['bytes']
+                elif result['status'] == 'failed':
+                    logger.error(f"Import failed for {result['path']}: {result['error']}")
+                if progress:
+                    progress(done, len(paths), result, time.perf_counter() - start)
+    finally:
+        # Also on interrupt, so a re-run skips what this one finished
+        checkpoint.flush()
+
+    elapsed = time.perf_counter() - start
+    summary['elapsed_seconds'] = round(elapsed, 2)
+    summary['files_per_minute'] = round(summary['imported'] / elapsed * 60, 2) if elapsed else 0
+    summary['mb_per_minute'] = round(summary['bytes_imported'] / (1024 * 1024) / elapsed * 60, 2) if elapsed else 0
+    return summary
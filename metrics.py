@@ -0,0 +1,303 @@
+"""
+Lightweight Prometheus-style metrics for KIU Meeting Intelligence System
+
+Values live in the memory of each process. Under the pre-forked production
+server every worker also writes a snapshot of its values to a shared
+directory every few seconds, and /metrics sums the snapshots of all
+workers, so a scrape sees the whole server whichever worker answers.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    """Render a Prometheus label set, e.g. {stage="whisper",le="0.5"}"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonically increasing counter with optional labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        return self._values.get(key, 0)
+
+    def dump(self) -> List[List]:
+        """JSON-serializable values: [[label values], value] per series"""
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def collect(self, others: List[List[List]] = ()) -> List[str]:
+        """Rendered series, with the dumped values of other processes added in"""
+        with self._lock:
+            values = dict(self._values)
+        for dumped in others:
+            for key, value in dumped:
+                values[tuple(key)] = values.get(tuple(key), 0) + value
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+                for key, value in sorted(values.items())]
+
+class Gauge(Counter):
+    """Value that can go up and down, e.g. a queue depth"""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+class Histogram:
+    """Cumulative histogram of observed values (latencies in seconds)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(float(bound) for bound in sorted(buckets)) + (float('inf'),)
+        self._series: Dict[Tuple[str, ...], Dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            series = self._series.setdefault(key, {
+                'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0
+            })
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][i] += 1
+                    break
+            series['sum'] += value
+            series['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock duration of the enclosed block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        return self._series.get(key, {}).get('count', 0)
+
+    def dump(self) -> List[List]:
+        """JSON-serializable values: [[label values], bucket counts, sum, count] per series"""
+        with self._lock:
+            return [[list(key), list(series['counts']), series['sum'], series['count']]
+                    for key, series in self._series.items()]
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def collect(self, others: List[List[List]] = ()) -> List[str]:
+        """Rendered series, with the dumped values of other processes added in"""
+        with self._lock:
+            merged = {key: dict(series, counts=list(series['counts'])) for key, series in self._series.items()}
+        for dumped in others:
+            for key, counts, total, count in dumped:
+                series = merged.setdefault(tuple(key), {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+                series['counts'] = [mine + theirs for mine, theirs in zip(series['counts'], counts)]
+                series['sum'] += total
+                series['count'] += count
+        lines = []
+        for key, series in sorted(merged.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['counts']):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(series["sum"])}')
+            lines.append(f'{self.name}_count{labels} {series["count"]}')
+        return lines
+
+class Registry:
+    """Collection of metrics rendered together at /metrics"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Every metric's kind and dumped values, keyed by name"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: {'kind': metric.kind, 'values': metric.dump()} for metric in metrics}
+
+    def reset(self):
+        """Zero every metric, e.g. in a worker that inherited its parent's values through fork"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+    def render(self, others: List[Dict[str, Dict[str, Any]]] = ()) -> str:
+        """Render all metrics in the Prometheus text exposition format, summed with other processes' snapshots"""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.collect([other[metric.name]['values'] for other in others if metric.name in other]))
+        return '\n'.join(lines) + '\n'
+
+def _add_values(mine: List, theirs: List) -> List:
+    """Element-wise sum of two dumped series values (a counter value, or bucket counts, sum and count)"""
+    return [[a + b for a, b in zip(x, y)] if isinstance(x, list) else x + y for x, y in zip(mine, theirs)]
+
+class MultiProcess:
+    """Metrics shared by pre-forked worker processes through a directory of JSON snapshots
+
+    Each process writes <pid>.json every flush_seconds (and when it exits).
+    When a worker dies, the master folds its counters and histograms into
+    dead.json and drops its gauges, so totals survive worker restarts while
+    gauges only count live workers.
+    """
+
+    DEAD_FILE = 'dead.json'
+
+    def __init__(self, directory: str, registry: Registry, flush_seconds: float = 5.0):
+        self.directory = directory
+        self.registry = registry
+        self.flush_seconds = flush_seconds
+        os.makedirs(directory, exist_ok=True)
+
+    def clear(self):
+        """Remove every snapshot; for a server starting up, whose counters start from zero"""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json') or entry.name.endswith('.tmp'):
+                os.remove(entry.path)
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f'{pid}.json')
+
+    def _write(self, path: str, snapshot: Dict):
+        with open(path + '.tmp', 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(path + '.tmp', path)
+
+    def _read(self, path: str) -> Dict:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def flush(self):
+        """Write this process's current values"""
+        self._write(self._path(os.getpid()), self.registry.snapshot())
+
+    def start_worker(self):
+        """Call in a freshly forked worker: forget the parent's values and flush periodically"""
+        self.registry.reset()
+
+        def run():
+            while True:
+                time.sleep(self.flush_seconds)
+                self.flush()
+
+        threading.Thread(target=run, name='metrics-flush', daemon=True).start()
+
+    def mark_process_dead(self, pid: int):
+        """Fold a dead worker's counters and histograms into dead.json and drop its gauges (master only)"""
+        path = self._path(pid)
+        snapshot = self._read(path)
+        if not snapshot:
+            return
+        dead_path = os.path.join(self.directory, self.DEAD_FILE)
+        totals = self._read(dead_path)
+        for name, entry in snapshot.items():
+            if entry['kind'] == 'gauge':
+                continue
+            merged = {tuple(item[0]): item[1:] for item in totals.get(name, {}).get('values', [])}
+            for key, *value in entry['values']:
+                key = tuple(key)
+                merged[key] = _add_values(merged[key], value) if key in merged else value
+            totals[name] = {'kind': entry['kind'], 'values': [[list(key)] + value for key, value in merged.items()]}
+        self._write(dead_path, totals)
+        os.remove(path)
+
+    def render(self) -> str:
+        """This process's values summed with every other snapshot in the directory"""
+        own = os.path.basename(self._path(os.getpid()))
+        others = [self._read(entry.path) for entry in os.scandir(self.directory)
+                  if entry.name.endswith('.json') and entry.name != own]
+        return self.registry.render(others)
+
+REGISTRY = Registry()
+MULTIPROCESS: Optional[MultiProcess] = None
+
+def enable_multiprocess(directory: str, flush_seconds: float = 5.0) -> MultiProcess:
+    """Share the default registry between pre-forked workers; call once in the master before forking"""
+    global MULTIPROCESS
+    MULTIPROCESS = MultiProcess(directory, REGISTRY, flush_seconds)
+    MULTIPROCESS.clear()
+    return MULTIPROCESS
+
+def render() -> str:
+    """The /metrics body: the whole server's values when worker processes share them"""
+    return MULTIPROCESS.render() if MULTIPROCESS else REGISTRY.render()
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def counter(name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+    """Create (or fetch) a counter in the default registry"""
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+def gauge(name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+    """Create (or fetch) a gauge in the default registry"""
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+def histogram(name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+              buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+    """Create (or fetch) a histogram in the default registry"""
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
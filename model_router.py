@@ -0,0 +1,108 @@
+"""
+Chat model routing for KIU Meeting Intelligence System
+
+Picks the chat model for each analysis task (summary, extraction) from an
+ordered list of rules matched against the transcript's estimated token
+count and the meeting type, so a 3-minute standup does not go to the
+largest model. Output that fails validation is retried one step up an
+escalation ladder of models, cheapest first.
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+CHARS_PER_TOKEN = 4  # rough average for English text; good enough to pick a tier
+ROUTINE_MEETING = re.compile(r'\b(stand-?up|daily|scrum|sync|check-?in|1:1|one-on-one)\b', re.IGNORECASE)
+PRIORITIES = {'high', 'medium', 'low'}
+
+# Rules are tried in order; a rule matches when every condition it names holds
+DEFAULT_ROUTES = {
+    'summary': [
+        {'max_tokens': 6000, 'model': 'gpt-4o-mini'},
+        {'model': 'gpt-4'},
+    ],
+    'extraction': [
+        {'max_tokens': 1500, 'model': 'gpt-4o-mini'},
+        {'meeting_type': 'routine', 'max_tokens': 6000, 'model': 'gpt-4o-mini'},
+        {'model': 'gpt-4'},
+    ],
+}
+DEFAULT_ESCALATION = ['gpt-4o-mini', 'gpt-4']
+
+class OutputValidationError(ValueError):
+    """A model's response cannot be used as the task's structured output"""
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text or '') // CHARS_PER_TOKEN)
+
+def meeting_type(title: str) -> str:
+    """'routine' for recurring check-ins recognizable from the title, otherwise 'general'"""
+    return 'routine' if ROUTINE_MEETING.search(title or '') else 'general'
+
+class ModelRouter:
+    """Rule-based choice of model per task, with an escalation ladder for invalid output"""
+
+    def __init__(self, routes: Dict[str, List[Dict[str, Any]]] = None, escalation: List[str] = None):
+        self.routes = routes or DEFAULT_ROUTES
+        self.escalation = escalation or DEFAULT_ESCALATION
+
+    @classmethod
+    def from_config(cls, routes: str = '', escalation: str = '') -> 'ModelRouter':
+        """Build a router from MODEL_ROUTES (JSON, merged over the defaults per task) and MODEL_ESCALATION"""
+        merged = dict(DEFAULT_ROUTES)
+        if routes:
+            merged.update(json.loads(routes))
+        ladder = [model.strip() for model in escalation.split(',') if model.strip()]
+        return cls(merged, ladder or None)
+
+    def route(self, task: str, tokens: int, kind: str = 'general') -> Tuple[str, str]:
+        """(model, reason) for a task; the reason names the rule that matched"""
+        for number, rule in enumerate(self.routes[task]):
+            if 'max_tokens' in rule and tokens > rule['max_tokens']:
+                continue
+            if 'meeting_type' in rule and kind != rule['meeting_type']:
+                continue
+            return rule['model'], f'rule_{number}'
+        return self.escalation[-1], 'fallback'
+
+    def escalate(self, model: str) -> Optional[str]:
+        """The next model up the ladder, or None once the strongest has been tried"""
+        if model not in self.escalation:
+            return None
+        position = self.escalation.index(model)
+        return self.escalation[position + 1] if position + 1 < len(self.escalation) else None
+
+def validate_summary(choice) -> str:
+    content = choice.message.content
+    if not isinstance(content, str) or not content.strip():
+        raise OutputValidationError('empty summary')
+    return content
+
+def validate_extraction(choice) -> Dict[str, List[Dict]]:
+    """Parsed function call arguments: {'action_items': [...]} or {'decisions': [...]}, {} when none"""
+    function_call = choice.message.function_call
+    if not function_call:
+        return {}
+    if choice.finish_reason == 'length':
+        raise OutputValidationError('function call truncated')
+    try:
+        arguments = json.loads(function_call.arguments)
+    except (TypeError, ValueError) as e:
+        raise OutputValidationError(f'arguments are not JSON: {e}')
+
+    if function_call.name == 'extract_action_items':
+        items = arguments.get('action_items', []) if isinstance(arguments, dict) else None
+        if not isinstance(items, list) or not all(
+                isinstance(item, dict) and isinstance(item.get('task'), str) and item['task'].strip()
+                and (not item.get('priority') or str(item['priority']).lower() in PRIORITIES)
+                for item in items):
+            raise OutputValidationError('malformed action items')
+        return {'action_items': items}
+    if function_call.name == 'extract_decisions':
+        decisions = arguments.get('decisions', []) if isinstance(arguments, dict) else None
+        if not isinstance(decisions, list) or not all(
+                isinstance(decision, dict) and isinstance(decision.get('decision'), str) and decision['decision'].strip()
+                for decision in decisions):
+            raise OutputValidationError('malformed decisions')
+        return {'decisions': decisions}
+    raise OutputValidationError(f'unknown function {function_call.name}')
@@ -0,0 +1,172 @@
+"""
+Retention policy and audio storage tiering for KIU Meeting Intelligence System
+
+Applies the configured limits so disk and database size stay bounded:
+meetings older than MEETING_RETENTION_DAYS are deleted, uploaded audio
+older than AUDIO_COLD_AFTER_DAYS is compressed into the cold folder, audio
+older than AUDIO_RETENTION_DAYS is dropped, and files no meeting refers to
+are swept. Only files inside the upload, cold and visuals folders are ever
+touched, so recordings imported in place are left alone. Meant to be run
+periodically, e.g. ``python run.py retention`` from cron. Rules apply to
+the current shard (``--tenant``); the upload, cold and visuals folders are
+shared by every shard, so the orphan sweep checks all of them.
+"""
+import gzip
+import os
+import shutil
+import subprocess
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+from app import (all_databases, app, cold_audio_folder, current_database, delete_meeting,
+                 get_db_connection, is_managed_file, logger, remove_unreferenced_files, vacuum_database,
+                 visual_thumbnail_path)
+
+COLD_AUDIO_BITRATE = '24k'  # mono Opus; plenty for speech
+ORPHAN_GRACE_SECONDS = 24 * 3600  # never sweep files an in-flight ingest may still claim
+COPY_BLOCK_SIZE = 1024 * 1024
+
+def cutoff(days: int) -> str:
+    """created_at value (UTC, SQLite format) for 'older than days'"""
+    return (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+
+def archive_audio(path: str, cold_folder: str) -> str:
+    """Compress a recording into the cold folder and return its new path
+
+    Transcodes to mono Opus when ffmpeg is on PATH, otherwise gzips the
+    original bytes. The source file is left for the caller to remove once
+    the new path is committed.
+    """
+    os.makedirs(cold_folder, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    ffmpeg = shutil.which('ffmpeg')
+
+    if ffmpeg:
+        target = os.path.join(cold_folder, stem + '.ogg')
+        subprocess.run([ffmpeg, '-nostdin', '-loglevel', 'error', '-y', '-i', path, '-ac', '1',
+                        '-c:a', 'libopus', '-b:a', COLD_AUDIO_BITRATE, '-f', 'ogg', target + '.tmp'],
+                       check=True)
+    else:
+        target = os.path.join(cold_folder, os.path.basename(path) + '.gz')
+        with open(path, 'rb') as source, gzip.open(target + '.tmp', 'wb') as destination:
+            shutil.copyfileobj(source, destination, COPY_BLOCK_SIZE)
+
+    os.replace(target + '.tmp', target)
+    return target
+
+def delete_expired_meetings(summary: Dict):
+    days = app.config['MEETING_RETENTION_DAYS']
+    if days <= 0:
+        return
+    conn = get_db_connection()
+    meeting_ids = [row[0] for row in conn.execute(
+        'SELECT id FROM meetings WHERE created_at < ? ORDER BY id', (cutoff(days),))]
+    conn.close()
+
+    for meeting_id in meeting_ids:
+        removed = delete_meeting(meeting_id)
+        if removed:
+            summary['meetings_deleted'] += 1
+            summary['bytes_freed'] += removed['bytes_freed']
+
+def archive_old_audio(summary: Dict):
+    days = app.config['AUDIO_COLD_AFTER_DAYS']
+    if days <= 0:
+        return
+    conn = get_db_connection()
+    rows = conn.execute('''
+        SELECT id, audio_file_path FROM meetings
+        WHERE audio_tier = 'hot' AND audio_file_path IS NOT NULL AND status = 'complete' AND created_at < ?
+    ''', (cutoff(days),)).fetchall()
+
+    for meeting_id, path in rows:
+        if not os.path.exists(path) or not is_managed_file(path, app.config['UPLOAD_FOLDER']):
+            continue
+        try:
+            size = os.path.getsize(path)
+            cold_path = archive_audio(path, cold_audio_folder())
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.error(f"Error archiving audio for meeting {meeting_id}: {str(e)}")
+            continue
+
+        conn.execute("UPDATE meetings SET audio_file_path = ?, audio_tier = 'cold' WHERE id = ?",
+                     (cold_path, meeting_id))
+        conn.commit()
+        remove_unreferenced_files(conn, [path], app.config['UPLOAD_FOLDER'])
+        summary['audio_archived'] += 1
+        summary['bytes_freed'] += size - os.path.getsize(cold_path)
+    conn.close()
+
+def drop_expired_audio(summary: Dict):
+    days = app.config['AUDIO_RETENTION_DAYS']
+    if days <= 0:
+        return
+    conn = get_db_connection()
+    rows = conn.execute('''
+        SELECT id, audio_file_path FROM meetings
+        WHERE audio_tier != 'dropped' AND audio_file_path IS NOT NULL AND status = 'complete' AND created_at < ?
+    ''', (cutoff(days),)).fetchall()
+
+    folders = (app.config['UPLOAD_FOLDER'], cold_audio_folder())
+    for meeting_id, path in rows:
+        if not is_managed_file(path, *folders):
+            continue
+        conn.execute("UPDATE meetings SET audio_file_path = NULL, audio_tier = 'dropped' WHERE id = ?",
+                     (meeting_id,))
+        conn.commit()
+        summary['audio_dropped'] += 1
+        summary['bytes_freed'] += remove_unreferenced_files(conn, [path], *folders)
+    conn.close()
+
+def sweep_orphaned_files(summary: Dict):
+    """Remove uploads, cold audio and visuals that no meeting or pipeline checkpoint in any shard refers to"""
+    referenced = set()
+    for database in all_databases():
+        conn = get_db_connection(database)
+        rows = conn.execute('''
+            SELECT audio_file_path, visual_summary_path FROM meetings
+            UNION ALL
+            SELECT NULL, json_extract(output, '$.path') FROM pipeline_checkpoints WHERE stage = 'visual'
+        ''').fetchall()
+        conn.close()
+        for audio_path, visual_path in rows:
+            for path in (audio_path, visual_path, visual_thumbnail_path(visual_path) if visual_path else None):
+                if path:
+                    referenced.add(os.path.realpath(path))
+
+    folders = (app.config['UPLOAD_FOLDER'], cold_audio_folder(),
+               app.config['VISUALS_FOLDER'], os.path.join(app.config['VISUALS_FOLDER'], 'thumbs'))
+    stale_before = time.time() - ORPHAN_GRACE_SECONDS
+    orphans = []
+    for folder in folders:
+        if not os.path.isdir(folder):
+            continue
+        for entry in os.scandir(folder):
+            if (entry.is_file() and not entry.name.startswith('.') and entry.stat().st_mtime < stale_before
+                    and os.path.realpath(entry.path) not in referenced):
+                orphans.append(entry.path)
+
+    conn = get_db_connection()
+    summary['bytes_freed'] += remove_unreferenced_files(conn, orphans, *folders)
+    summary['orphans_removed'] += sum(1 for path in orphans if not os.path.exists(path))
+    conn.close()
+
+def apply_retention_policy(full_vacuum: bool = False) -> Dict:
+    """Apply every configured retention rule to the current shard, then vacuum it"""
+    database = current_database()
+    summary = {'meetings_deleted': 0, 'audio_archived': 0, 'audio_dropped': 0,
+               'orphans_removed': 0, 'bytes_freed': 0}
+    db_bytes_before = os.path.getsize(database)
+    start = time.perf_counter()
+
+    delete_expired_meetings(summary)
+    archive_old_audio(summary)
+    drop_expired_audio(summary)
+    sweep_orphaned_files(summary)
+    summary['db_pages_freed'] = vacuum_database(full=full_vacuum)['pages_freed']
+
+    summary['db_bytes_before'] = db_bytes_before
+    summary['db_bytes_after'] = os.path.getsize(database)
+    summary['elapsed_seconds'] = round(time.perf_counter() - start, 2)
+    return summary
@@ -2,10 +2,13 @@
 """
 Production run script for KIU Meeting Intelligence System
 """
+import multiprocessing
 import os
 import sys
+import tempfile
 from flask import Flask
-from app import app, init_database
+import metrics
+from app import app, init_database, preload_search_index
 from config import config, Config
 
 def create_app(config_name=None):
@@ -35,6 +38,29 @@ def create_app(config_name=None):
     
     return app
 
+def tenant_name(value):
+    """argparse type for --tenant"""
+    import argparse
+    from shards import valid_tenant
+    
+    if not valid_tenant(value):
+        raise argparse.ArgumentTypeError(f"invalid tenant name: {value!r} (lowercase letters, digits, '-' and '_')")
+    return value
+
+def tenant_scope(tenant, create=False):
+    """Run a command against a tenant's shard, or the default database when tenant is None
+    
+    Exits when the tenant has no shard yet, unless create is set.
+    """
+    from app import open_tenant_shard
+    from shards import UnknownTenantError, use_shard
+    
+    try:
+        return use_shard(open_tenant_shard(tenant, create=create) if tenant else None)
+    except UnknownTenantError:
+        print(f"❌ Unknown tenant: {tenant} (create it with: python run.py create-tenant {tenant})")
+        sys.exit(1)
+
 def run_development():
     """Run in development mode"""
     print("🚀 Starting KIU Meeting Intelligence System in development mode...")
@@ -49,20 +75,213 @@ def run_development():
         threaded=True
     )
 
+def production_options():
+    """Gunicorn settings for production mode, overridable through the environment"""
+    return {
+        'bind': f"0.0.0.0:{int(os.getenv('PORT', 5000))}",
+        'workers': int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1)),
+        'threads': int(os.getenv('WEB_THREADS', 4)),
+        'worker_class': 'gthread',
+        # Workers fork from the master's loaded app, so SIGHUP does not pick up new code (USR2 does)
+        'preload_app': True,
+        # Uploads run the whole AI pipeline inside the request
+        'timeout': int(os.getenv('WEB_TIMEOUT', 300)),
+        'graceful_timeout': int(os.getenv('WEB_GRACEFUL_TIMEOUT', 30)),
+        'keepalive': 5,
+        'max_requests': int(os.getenv('WEB_MAX_REQUESTS', 1000)),
+        'max_requests_jitter': 100,
+        'accesslog': os.getenv('WEB_ACCESS_LOG', '-') or None,
+        'pidfile': os.getenv('WEB_PIDFILE'),
+        'pre_fork': before_fork,
+        'post_fork': after_fork,
+        'worker_exit': lambda server, worker: metrics.MULTIPROCESS and metrics.MULTIPROCESS.flush(),
+        'child_exit': lambda server, worker: metrics.MULTIPROCESS and metrics.MULTIPROCESS.mark_process_dead(worker.pid),
+    }
+
+def before_fork(server, worker):
+    """Keep the master's index current so re-forked workers share it"""
+    preload_search_index()
+    if metrics.MULTIPROCESS:
+        # Values the master counted while loading; workers start from zero
+        metrics.MULTIPROCESS.flush()
+
+def after_fork(server, worker):
+    if metrics.MULTIPROCESS:
+        metrics.MULTIPROCESS.start_worker()
+
 def run_production():
-    """Run in production mode"""
+    """Run in production mode on gunicorn (pre-forked workers x threads)"""
     print("🚀 Starting KIU Meeting Intelligence System in production mode...")
     
     app = create_app('production')
     
-    # In production, you should use a proper WSGI server
-    # This is just for demonstration
-    app.run(
-        host='0.0.0.0',
-        port=int(os.getenv('PORT', 5000)),
-        debug=False,
-        threaded=True
-    )
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("⚠️  gunicorn is not installed (it is not available on Windows)")
+        print("   Falling back to the single-process development server")
+        app.run(
+            host='0.0.0.0',
+            port=int(os.getenv('PORT', 5000)),
+            debug=False,
+            threaded=True
+        )
+        return
+    
+    # Workers share their metrics through snapshot files, so any worker can answer /metrics
+    metrics_directory = os.getenv('METRICS_MULTIPROC_DIR') or tempfile.mkdtemp(prefix='kiu-metrics-')
+    metrics.enable_multiprocess(metrics_directory, float(os.getenv('METRICS_FLUSH_SECONDS', 5)))
+    
+    # Load the search index before forking so workers share it copy-on-write
+    chunks = preload_search_index()
+    print(f"✅ Search index preloaded ({chunks} chunks)")
+    
+    # openai is imported lazily; import it once here rather than in every worker
+    import openai
+    
+    class ProductionServer(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+        
+        def load_config(self):
+            for key, value in self.options.items():
+                if value is not None:
+                    self.cfg.set(key, value)
+        
+        def load(self):
+            return self.application
+    
+    options = production_options()
+    print(f"🌐 Serving on {options['bind']} with {options['workers']} workers x {options['threads']} threads")
+    print("   SIGHUP gracefully restarts workers on the loaded code; to deploy new code send SIGUSR2,")
+    print("   then SIGQUIT to the old master once the new one (<pidfile>.2) is serving")
+    ProductionServer(app, options).run()
+
+def run_import(argv):
+    """Bulk import a directory tree of meeting recordings"""
+    import argparse
+    from importer import import_directory
+    
+    parser = argparse.ArgumentParser(prog='run.py import', description='Bulk import meeting recordings')
+    parser.add_argument('directory', help='directory to scan recursively for .mp3/.wav/.m4a files')
+    parser.add_argument('--workers', type=int, default=4, help='concurrent pipeline workers (default: 4)')
+    parser.add_argument('--attendees', default='', help='attendees recorded for every imported meeting')
+    parser.add_argument('--limit', type=int, help='import at most this many files')
+    parser.add_argument('--tenant', type=tenant_name, help='work on this tenant\'s shard instead of the default database')
+    args = parser.parse_args(argv)
+    
+    if not os.path.isdir(args.directory):
+        print(f"❌ Not a directory: {args.directory}")
+        return 1
+    
+    create_app()
+    print(f"📦 Importing recordings from {args.directory} with {args.workers} workers...")
+    
+    def progress(done, total, result, elapsed):
+        icons = {'imported': '✅', 'duplicate': '♻️ ', 'skipped': '⏭️ ', 'failed': '❌'}
+        print(f"{icons[result['status']]} [{done}/{total}] {result['status']:<9} {result['path']} "
+              f"({done / elapsed * 60:.1f} files/min)")
+    
+    with tenant_scope(args.tenant, create=True):
+        summary = import_directory(args.directory, args.workers, args.attendees, args.limit, progress)
+    
+    print(f"""
+📊 Import finished in {summary['elapsed_seconds']}s
+   Files found:      {summary['files']}
+   Imported:         {summary['imported']}
+   Duplicates:       {summary['duplicate']}
+   Already imported: {summary['skipped']}
+   Failed:           {summary['failed']}
+   Throughput:       {summary['files_per_minute']} files/min, {summary['mb_per_minute']} MB/min""")
+    
+    if summary['failed']:
+        print("⚠️  Re-run the same command to retry failed files")
+    return 1 if summary['failed'] else 0
+
+def run_reindex():
+    """Re-embed meetings indexed with an older embedding model or chunk size"""
+    from app import reindex_embeddings
+    
+    create_app()
+    print(f"🔄 Re-indexing embeddings with {app.config['EMBEDDING_MODEL']} "
+          f"({app.config['EMBEDDING_CHUNK_SIZE']}-char chunks)...")
+    result = reindex_embeddings()
+    print(f"✅ Re-indexed {result['processed']} meetings ({result['failed']} failed)")
+    return 1 if result['failed'] else 0
+
+def run_resume(argv):
+    """Finish meetings whose ingest pipeline failed or was interrupted"""
+    import argparse
+    from app import resume_unfinished_meetings
+    
+    parser = argparse.ArgumentParser(prog='run.py resume', description='Resume unfinished meetings')
+    parser.add_argument('--all', action='store_true',
+                        help='also resume meetings that are still making progress (only when no server is running)')
+    parser.add_argument('--tenant', type=tenant_name, help='work on this tenant\'s shard instead of the default database')
+    args = parser.parse_args(argv)
+    
+    create_app()
+    print("🔁 Resuming unfinished meetings from their last checkpoint...")
+    
+    def progress(result):
+        if result['status'] == 'resumed':
+            print(f"✅ Meeting {result['meeting_id']} completed")
+        elif result['status'] == 'skipped':
+            print(f"⏭️  Meeting {result['meeting_id']} is being processed elsewhere")
+        else:
+            print(f"❌ Meeting {result['meeting_id']} failed again: {result['error']}")
+    
+    with tenant_scope(args.tenant):
+        summary = resume_unfinished_meetings(include_recent=args.all, progress=progress)
+    print(f"""
+📊 Resume finished in {summary['elapsed_seconds']}s
+   Unfinished meetings: {summary['meetings']}
+   Completed:           {summary['resumed']}
+   Skipped:             {summary['skipped']}
+   Failed:              {summary['failed']}""")
+    return 1 if summary['failed'] else 0
+
+def run_retention(argv):
+    """Apply the retention policy: expire meetings, tier and drop audio, vacuum"""
+    import argparse
+    from retention import apply_retention_policy
+    
+    parser = argparse.ArgumentParser(prog='run.py retention', description='Apply the retention policy')
+    parser.add_argument('--full-vacuum', action='store_true',
+                        help='rewrite the whole database file (needed once for databases created before incremental vacuum)')
+    parser.add_argument('--tenant', type=tenant_name, help='work on this tenant\'s shard instead of the default database')
+    args = parser.parse_args(argv)
+    
+    create_app()
+    print("🧹 Applying retention policy...")
+    with tenant_scope(args.tenant):
+        summary = apply_retention_policy(full_vacuum=args.full_vacuum)
+    
+    print(f"""
+📊 Retention finished in {summary['elapsed_seconds']}s
+   Meetings deleted: {summary['meetings_deleted']}
+   Audio archived:   {summary['audio_archived']}
+   Audio dropped:    {summary['audio_dropped']}
+   Orphaned files:   {summary['orphans_removed']}
+   Disk freed:       {summary['bytes_freed'] / (1024 * 1024):.1f} MB
+   Database:         {summary['db_bytes_before'] / (1024 * 1024):.1f} MB -> {summary['db_bytes_after'] / (1024 * 1024):.1f} MB""")
+    return 0
+
+def run_create_tenant(argv):
+    """Create a tenant's database shard (requests only open existing shards)"""
+    import argparse
+    from app import open_tenant_shard
+    
+    parser = argparse.ArgumentParser(prog='run.py create-tenant', description='Create a tenant database shard')
+    parser.add_argument('tenant', type=tenant_name, help='tenant name (lowercase letters, digits, - and _)')
+    args = parser.parse_args(argv)
+    
+    create_app()
+    shard = open_tenant_shard(args.tenant, create=True)
+    print(f"✅ Tenant {args.tenant} ready at {shard.path}")
+    return 0
 
 def run_tests():
     """Run the test suite"""
@@ -83,39 +302,41 @@ def run_tests():
     
     return exit_code
 
+# Distributions checked by `run.py check` (probed through package metadata, not imported)
+REQUIRED_PACKAGES = ('flask', 'openai', 'numpy', 'pandas', 'scikit-learn', 'requests', 'pytest')
+
 def check_requirements():
     """Check if all requirements are satisfied"""
+    from importlib import metadata
+    
     print("🔍 Checking requirements...")
     
-    try:
-        import flask
-        import openai
-        import sqlite3
-        import numpy
-        import pandas
-        import sklearn
-        import requests
-        import pytest
-        
-        print("✅ All required packages are installed")
-        
-        # Check OpenAI API key
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            print("⚠️  OPENAI_API_KEY not found in environment variables")
-            print("   Please create a .env file with your OpenAI API key")
-            return False
-        elif api_key.startswith('sk-'):
-            print("✅ OpenAI API key format looks correct")
-        else:
-            print("⚠️  OpenAI API key format might be incorrect")
-        
-        return True
-        
-    except ImportError as e:
-        print(f"❌ Missing requirement: {e}")
+    missing = []
+    for package in REQUIRED_PACKAGES:
+        try:
+            metadata.version(package)
+        except metadata.PackageNotFoundError:
+            missing.append(package)
+    
+    if missing:
+        print(f"❌ Missing requirement: {', '.join(missing)}")
         print("   Please run: pip install -r requirements.txt")
         return False
+    
+    print("✅ All required packages are installed")
+    
+    # Check OpenAI API key
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        print("⚠️  OPENAI_API_KEY not found in environment variables")
+        print("   Please create a .env file with your OpenAI API key")
+        return False
+    elif api_key.startswith('sk-'):
+        print("✅ OpenAI API key format looks correct")
+    else:
+        print("⚠️  OpenAI API key format might be incorrect")
+    
+    return True
 
 def print_help():
     """Print usage help"""
@@ -127,8 +348,13 @@ Usage:
 
 Commands:
     dev         Run in development mode (default)
-    prod        Run in production mode  
+    prod        Run in production mode (gunicorn, preforked workers)
     test        Run test suite
+    import      Bulk import a directory of recordings (resumable)
+    reindex     Re-embed meetings after changing EMBEDDING_MODEL/EMBEDDING_CHUNK_SIZE
+    resume      Finish meetings whose processing failed or was interrupted
+    retention   Expire old meetings, archive/drop old audio and vacuum the database
+    create-tenant  Create a tenant's database shard (X-Tenant requests need an existing shard)
     check       Check requirements and configuration
     help        Show this help message
 
@@ -137,11 +363,27 @@ Examples:
     python run.py dev          # Run in development mode
     python run.py test         # Run tests
     python run.py check        # Check setup
+    python run.py import archive/ --workers 8   # Backfill recordings
+    python run.py retention    # Run nightly from cron
+    python run.py resume       # Finish meetings left behind by a crash
+    python run.py create-tenant sales             # Add a tenant
+    python run.py import archive/ --tenant sales   # Import into one tenant's shard (created if new)
     
 Environment Variables:
     OPENAI_API_KEY             # Your OpenAI API key (required)
     FLASK_ENV                  # Environment (development/production)
     SECRET_KEY                 # Flask secret key
+    EMBEDDING_MODEL            # Embedding model for new vectors
+    EMBEDDING_CHUNK_SIZE       # Transcript chunk size in characters
+    MEETING_RETENTION_DAYS     # Delete meetings older than this (default: 0, keep forever)
+    AUDIO_COLD_AFTER_DAYS      # Compress uploaded audio into the cold folder after this (default: 30)
+    AUDIO_RETENTION_DAYS       # Delete audio older than this (default: 0, keep forever)
+    DROP_AUDIO_AFTER_TRANSCRIPTION  # Delete uploads once a meeting is processed (default: False)
+    RESUME_AFTER_MINUTES       # Idle time after which 'resume' treats a meeting as interrupted (default: 30)
+    DATABASE_URL               # Default database (default: sqlite:///meetings.db)
+    TENANT_DATA_FOLDER         # Folder of per-tenant database shards (default: tenants)
+    WEB_CONCURRENCY            # Production worker processes (default: 2 x CPUs + 1)
+    WEB_THREADS                # Threads per production worker (default: 4)
     
 For more information, see README.md
 """)
@@ -182,6 +424,37 @@ if __name__ == '__main__':
         
         run_production()
     
+    elif command == 'reindex':
+        if not check_requirements():
+            print("❌ Requirements not satisfied")
+            sys.exit(1)
+        
+        sys.exit(run_reindex())
+    
+    elif command == 'import':
+        if not check_requirements():
+            print("❌ Requirements not satisfied")
+            sys.exit(1)
+        
+        sys.exit(run_import(sys.argv[2:]))
+    
+    elif command == 'resume':
+        if not check_requirements():
+            print("❌ Requirements not satisfied")
+            sys.exit(1)
+        
+        sys.exit(run_resume(sys.argv[2:]))
+    
+    elif command == 'retention':
+        if not check_requirements():
+            print("❌ Requirements not satisfied")
+            sys.exit(1)
+        
+        sys.exit(run_retention(sys.argv[2:]))
+    
+    elif command == 'create-tenant':
+        sys.exit(run_create_tenant(sys.argv[2:]))
+    
     else:
         print(f"❌ Unknown command: {command}")
         print_help()
@@ -0,0 +1,79 @@
+"""
+Search result cache for KIU Meeting Intelligence System
+
+An in-process LRU of /search results with a TTL, optionally backed by a
+search_cache table in SQLite so every worker process shares hits. Each
+entry records the corpus version it was computed against, and a lookup
+against any other version misses, so a cached result can never outlive a
+change to the indexed meetings.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query"""
+    return ' '.join(query.casefold().split())
+
+class SearchResultCache:
+    """LRU + TTL cache of search results keyed by query, parameters and corpus version"""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (corpus version, stored at, results)
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: int, conn=None) -> Optional[List]:
+        """Cached results for this corpus version, checking SQLite when conn is given"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version and now - entry[1] < self.ttl:
+                self._entries.move_to_end(key)
+                return entry[2]
+            if entry:
+                del self._entries[key]
+
+        if conn is None:
+            return None
+        row = conn.execute(
+            'SELECT results, created_at FROM search_cache WHERE cache_key = ? AND corpus_version = ? AND created_at > ?',
+            (key, version, now - self.ttl)
+        ).fetchone()
+        if row is None:
+            return None
+
+        results = json.loads(row[0])
+        self._remember(key, version, row[1], results)
+        return results
+
+    def put(self, key: str, version: int, results: List, conn=None):
+        """Store results, sharing them through SQLite when conn is given"""
+        now = time.time()
+        self._remember(key, version, now, results)
+        if conn is not None:
+            conn.execute('''
+                INSERT INTO search_cache (cache_key, corpus_version, results, created_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    corpus_version = excluded.corpus_version, results = excluded.results,
+                    created_at = excluded.created_at
+            ''', (key, version, json.dumps(results), now))
+            # Entries for older corpus versions can never be hit again
+            conn.execute('DELETE FROM search_cache WHERE corpus_version < ? OR created_at <= ?',
+                         (version, now - self.ttl))
+            conn.commit()
+
+    def _remember(self, key: str, version: int, stored_at: float, results: List):
+        with self._lock:
+            self._entries[key] = (version, stored_at, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,105 @@
+"""
+In-memory semantic search index for KIU Meeting Intelligence System
+
+Holds every chunk embedding as a normalized float32 matrix per embedding
+model, so a query is one matrix-vector product instead of a scan that
+decodes every BLOB in meeting_embeddings. The index checks a cheap
+signature of the table before each search and only reads rows added since
+it was last loaded, so it stays current when other processes ingest
+meetings. Loading it before the server forks lets every worker share the
+matrices copy-on-write.
+"""
+import threading
+from typing import Dict, List, Tuple
+
+class SearchIndex:
+    """Normalized chunk embeddings grouped by model, refreshed from SQLite"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signature = None
+        self._max_id = 0
+        self._count = 0
+        self._models: Dict[str, Tuple] = {}  # model -> (row ids, normalized float32 matrix)
+
+    @property
+    def loaded(self) -> bool:
+        return self._signature is not None
+
+    @property
+    def chunks(self) -> int:
+        return self._count
+
+    def models(self) -> List[str]:
+        return sorted(self._models)
+
+    def refresh(self, conn) -> bool:
+        """Bring the index up to date with meeting_embeddings; returns True if it changed"""
+        database = conn.execute('PRAGMA database_list').fetchone()[2]
+        signature = (database,) + tuple(conn.execute('SELECT MAX(id), COUNT(*) FROM meeting_embeddings').fetchone())
+        if signature == self._signature:
+            return False
+
+        with self._lock:
+            if signature == self._signature:
+                return False
+            max_id, count = signature[1] or 0, signature[2]
+
+            # Rows are only appended by ingest; anything else (deletes,
+            # re-indexing, another database) means the whole index is rebuilt
+            incremental = self.loaded and self._signature[0] == database and max_id >= self._max_id
+            rows = conn.execute(
+                'SELECT id, model, embedding FROM meeting_embeddings WHERE id > ? ORDER BY id',
+                (self._max_id if incremental else 0,)
+            ).fetchall()
+            if incremental and self._count + len(rows) != count:
+                incremental = False
+                rows = conn.execute('SELECT id, model, embedding FROM meeting_embeddings ORDER BY id').fetchall()
+
+            import numpy as np
+
+            models = dict(self._models) if incremental else {}
+            for model, ids, vectors in self._group(rows):
+                if model in models:
+                    old_ids, old_vectors = models[model]
+                    ids, vectors = np.concatenate([old_ids, ids]), np.vstack([old_vectors, vectors])
+                models[model] = (ids, vectors)
+
+            self._models = models
+            self._max_id, self._count, self._signature = max_id, count, signature
+            return True
+
+    @staticmethod
+    def _group(rows):
+        import numpy as np
+
+        by_model: Dict[str, List] = {}
+        for row_id, model, blob in rows:
+            by_model.setdefault(model, []).append((row_id, blob))
+
+        for model, entries in by_model.items():
+            ids = np.array([row_id for row_id, _ in entries], dtype=np.int64)
+            vectors = np.vstack([np.frombuffer(blob, dtype=np.float64) for _, blob in entries]).astype(np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.where(norms == 0, 1, norms)
+            yield model, ids, vectors
+
+    def search(self, model: str, query_embedding, top_k: int = 10) -> List[Tuple[int, float]]:
+        """Return (embedding row id, cosine similarity) for the closest chunks"""
+        entry = self._models.get(model)
+        if entry is None:
+            return []
+        ids, vectors = entry
+
+        import numpy as np
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0 or query.shape[0] != vectors.shape[1]:
+            return []
+        scores = vectors @ (query / norm)
+
+        top_k = min(top_k, len(scores))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+        return [(int(ids[i]), float(scores[i])) for i in best]
@@ -0,0 +1,110 @@
+"""
+Per-tenant database shards for KIU Meeting Intelligence System
+
+Each tenant (a team or workspace) keeps its meetings in its own SQLite
+file with its own in-memory search index, so one tenant's bulk import only
+ever holds its own write lock. A shard file is only created on request
+(``python run.py create-tenant`` or an import with ``--tenant``); requests
+open existing shards on first use, and an LRU bounds how many stay open
+with their search index in memory. The shard a request works on is carried in a
+context variable: asyncio tasks and asyncio.to_thread inherit it, plain
+threads need contextvars.copy_context().
+"""
+import contextvars
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+from search_index import SearchIndex
+
+SQLITE_URL_PREFIX = 'sqlite:///'
+TENANT_PATTERN = re.compile(r'^[a-z0-9][a-z0-9_-]{0,63}$')  # also a safe file name
+
+_current_shard = contextvars.ContextVar('current_shard', default=None)
+
+def sqlite_path(url: str) -> str:
+    """Database file of a sqlite:/// URL (DATABASE_URL); other databases are not supported"""
+    if not url.startswith(SQLITE_URL_PREFIX):
+        raise ValueError(f'Only sqlite:/// database URLs are supported, got {url!r}')
+    return url[len(SQLITE_URL_PREFIX):]
+
+def valid_tenant(tenant: str) -> bool:
+    return bool(TENANT_PATTERN.match(tenant or ''))
+
+class UnknownTenantError(LookupError):
+    """No shard exists for this tenant (and none was asked to be created)"""
+
+class Shard:
+    """One tenant's database file and its search index"""
+
+    def __init__(self, tenant: str, path: str):
+        self.tenant = tenant
+        self.path = path
+        self.index = SearchIndex()
+        self.ready = False
+        self.lock = threading.Lock()
+
+class ShardManager:
+    """Lazily opened shards; the least recently used is closed beyond max_open"""
+
+    def __init__(self, max_open: int = 32):
+        self.max_open = max_open
+        self._lock = threading.Lock()
+        self._open = OrderedDict()  # path -> Shard, least recently used first
+        self._initialized = set()  # paths whose schema this process already created or migrated
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    def tenants(self) -> List[str]:
+        with self._lock:
+            return [shard.tenant for shard in self._open.values()]
+
+    def open(self, tenant: str, path: str, initialize: Callable[[Shard], None], create: bool = False) -> Shard:
+        """The shard for a tenant, initialized (schema created or migrated) on first use
+
+        A shard reopened after eviction is not initialized again. Raises
+        UnknownTenantError when its file does not exist, unless create is set.
+        """
+        with self._lock:
+            shard = self._open.get(path)
+            if shard is None:
+                if not create and not os.path.exists(path):
+                    raise UnknownTenantError(tenant)
+                shard = self._open[path] = Shard(tenant, path)
+                while len(self._open) > self.max_open:
+                    # Requests still holding an evicted shard finish with it; its index is freed after
+                    self._open.popitem(last=False)
+            else:
+                self._open.move_to_end(path)
+
+        # Initialized outside the manager lock so a new shard never stalls requests for open ones
+        if not shard.ready:
+            with shard.lock:
+                if not shard.ready:
+                    if path not in self._initialized:
+                        initialize(shard)
+                        with self._lock:
+                            self._initialized.add(path)
+                    shard.ready = True
+        return shard
+
+def current_shard() -> Optional[Shard]:
+    """The shard of the current request or job; None means the default database"""
+    return _current_shard.get()
+
+@contextmanager
+def use_shard(shard: Optional[Shard]):
+    """Run a block against a shard (None: the default database)"""
+    token = _current_shard.set(shard)
+    try:
+        yield shard
+    finally:
+        _current_shard.reset(token)
+
+def set_current_shard(shard: Optional[Shard]):
+    """Switch the current context to a shard; for request hooks, which set it for every request"""
+    _current_shard.set(shard)
@@ -4,6 +4,15 @@
 let currentMeetings = [];
 let isLoading = false;
 
+// Meeting list: pages are fetched on demand and only the visible rows are in the DOM
+const MEETINGS_PAGE_SIZE = 50;
+const MEETING_ROW_HEIGHT = 280;  // px; .meeting-card height plus its bottom margin
+const MEETING_OVERSCAN_ROWS = 3;
+let meetingsNextCursor = null;
+let meetingsExhausted = false;
+let meetingsFetching = false;
+let meetingsRenderQueued = false;
+
 // DOM Ready
 document.addEventListener('DOMContentLoaded', function() {
     initializeApp();
@@ -14,6 +23,10 @@ function initializeApp() {
     loadMeetings();
     loadAnalytics();
     
+    // Re-render the visible window as the meeting list scrolls or reflows
+    document.getElementById('meetingsViewport').addEventListener('scroll', scheduleMeetingsRender, { passive: true });
+    window.addEventListener('resize', scheduleMeetingsRender);
+    
     // Add enter key support for search
     document.getElementById('searchQuery').addEventListener('keypress', function(e) {
         if (e.key === 'Enter') {
@@ -142,6 +155,10 @@ async function handleFileUpload(event) {
                 scrollToSection('meetings');
             }, 1000);
             
+        } else if (response.status === 429) {
+            // Ingest is at capacity; the file was not kept, so the form stays filled in
+            showAlert(`The server is busy processing other meetings. Please try again in ${result.retry_after} seconds.`, 'warning');
+            progressContainer.style.display = 'none';
         } else {
             throw new Error(result.error || 'Upload failed');
         }
@@ -157,26 +174,56 @@ async function handleFileUpload(event) {
     }
 }
 
-// Load Meetings
+// Load Meetings (first page; later pages load as the list scrolls)
 async function loadMeetings() {
+    currentMeetings = [];
+    meetingsNextCursor = null;
+    meetingsExhausted = false;
+    document.getElementById('meetingsViewport').scrollTop = 0;
+    await loadMoreMeetings();
+}
+
+async function loadMoreMeetings() {
+    if (meetingsFetching || meetingsExhausted) return;
+    meetingsFetching = true;
+    
     try {
-        const response = await fetch('/meetings');
-        const meetings = await response.json();
+        const cursor = meetingsNextCursor ? `&cursor=${meetingsNextCursor}` : '';
+        const response = await fetch(`/meetings?limit=${MEETINGS_PAGE_SIZE}${cursor}`);
+        const page = await response.json();
         
-        currentMeetings = meetings;
-        displayMeetings(meetings);
+        currentMeetings = currentMeetings.concat(page.items);
+        meetingsNextCursor = page.next_cursor;
+        meetingsExhausted = page.next_cursor === null;
+        displayMeetings(currentMeetings);
         
     } catch (error) {
         console.error('Error loading meetings:', error);
         showAlert('Error loading meetings', 'error');
+    } finally {
+        meetingsFetching = false;
     }
 }
 
-// Display Meetings
+function scheduleMeetingsRender() {
+    if (meetingsRenderQueued) return;
+    meetingsRenderQueued = true;
+    requestAnimationFrame(() => {
+        meetingsRenderQueued = false;
+        displayMeetings(currentMeetings);
+    });
+}
+
+// Display Meetings (renders only the rows inside the scroll viewport)
 function displayMeetings(meetings) {
+    const viewport = document.getElementById('meetingsViewport');
+    const spacer = document.getElementById('meetingsSpacer');
     const container = document.getElementById('meetingsList');
     
     if (meetings.length === 0) {
+        spacer.style.height = '';
+        container.style.position = 'static';
+        container.style.transform = '';
         container.innerHTML = `
             <div class="col-12">
                 <div class="text-center py-5">
@@ -192,7 +239,25 @@ function displayMeetings(meetings) {
         return;
     }
     
-    container.innerHTML = meetings.map(meeting => `
+    // Matches the col-lg-6 breakpoint used by the cards
+    const columns = window.innerWidth >= 992 ? 2 : 1;
+    const rows = Math.ceil(meetings.length / columns);
+    const firstRow = Math.max(0, Math.floor(viewport.scrollTop / MEETING_ROW_HEIGHT) - MEETING_OVERSCAN_ROWS);
+    const lastRow = Math.min(rows, Math.ceil((viewport.scrollTop + viewport.clientHeight) / MEETING_ROW_HEIGHT) + MEETING_OVERSCAN_ROWS);
+    
+    spacer.style.height = `${rows * MEETING_ROW_HEIGHT}px`;
+    container.style.position = '';
+    container.style.transform = `translateY(${firstRow * MEETING_ROW_HEIGHT}px)`;
+    container.innerHTML = meetings.slice(firstRow * columns, lastRow * columns).map(meetingCard).join('');
+    
+    // Fetch the next page before the user reaches the end of what is loaded
+    if (lastRow >= rows - MEETING_OVERSCAN_ROWS) {
+        loadMoreMeetings();
+    }
+}
+
+function meetingCard(meeting) {
+    return `
         <div class="col-lg-6 col-md-12">
             <div class="meeting-card">
                 <h5 class="meeting-title">${escapeHtml(meeting.title)}</h5>
@@ -200,26 +265,53 @@ function displayMeetings(meetings) {
                     <i class="fas fa-calendar me-2"></i>
                     ${formatDate(meeting.created_at)}
                     ${meeting.duration_minutes ? `<span class="ms-3"><i class="fas fa-clock me-1"></i>${meeting.duration_minutes} min</span>` : ''}
-                    ${meeting.attendees ? `<span class="ms-3"><i class="fas fa-users me-1"></i>${meeting.attendees}</span>` : ''}
+                    ${meeting.attendees ? `<span class="ms-3"><i class="fas fa-users me-1"></i>${escapeHtml(meeting.attendees)}</span>` : ''}
                 </div>
                 <div class="meeting-summary">
-                    ${meeting.summary ? truncateText(meeting.summary, 150) : 'Processing...'}
+                    ${meeting.summary_snippet ? escapeHtml(meeting.summary_snippet) : 'Processing...'}
                 </div>
                 <div class="meeting-actions">
                     <button class="btn btn-primary btn-sm" onclick="showMeetingDetails(${meeting.id})">
                         <i class="fas fa-eye me-1"></i>View Details
                     </button>
-                    <button class="btn btn-outline-secondary btn-sm" onclick="searchSimilarMeetings('${escapeHtml(meeting.title)}')">
+                    <button class="btn btn-outline-secondary btn-sm" onclick="findSimilarMeetings(${meeting.id}, '${escapeHtml(meeting.title)}')">
                         <i class="fas fa-search me-1"></i>Find Similar
                     </button>
+                    <button class="btn btn-outline-danger btn-sm" onclick="deleteMeeting(${meeting.id}, '${escapeHtml(meeting.title)}')">
+                        <i class="fas fa-trash me-1"></i>Delete
+                    </button>
                 </div>
             </div>
         </div>
-    `).join('');
+    `;
+}
+
+// Delete Meeting
+async function deleteMeeting(meetingId, title) {
+    if (!confirm(`Delete "${title}"? Its transcript, audio and visual summary will be removed permanently.`)) {
+        return;
+    }
+    
+    try {
+        const response = await fetch(`/meeting/${meetingId}`, { method: 'DELETE' });
+        const result = await response.json();
+        
+        if (!response.ok) {
+            throw new Error(result.error || 'Delete failed');
+        }
+        
+        showAlert('Meeting deleted', 'success');
+        await loadMeetings();
+        await loadAnalytics();
+        
+    } catch (error) {
+        console.error('Delete error:', error);
+        showAlert(`Could not delete meeting: ${error.message}`, 'danger');
+    }
 }
 
 // Show Meeting Details Modal
-async function showMeetingDetails(meetingId) {
+async function showMeetingDetails(meetingId, startTime = null) {
     try {
         const response = await fetch(`/meeting/${meetingId}`);
         const meeting = await response.json();
@@ -270,14 +362,24 @@ async function showMeetingDetails(meetingId) {
                     ` : ''}
                     
                     <h6><i class="fas fa-microphone me-2"></i>Full Transcript</h6>
-                    <div class="transcript-text">
-                        ${meeting.transcription || 'Transcript not available'}
-                    </div>
+                    ${meeting.audio_url ? `
+                        <audio id="meetingAudio" class="w-100 mb-2" controls preload="none"
+                               src="${meeting.audio_url}${startTime !== null ? `#t=${startTime}` : ''}"></audio>
+                    ` : ''}
+                    <div class="transcript-text" id="transcriptText"></div>
+                    <button class="btn btn-sm btn-outline-secondary mt-2" id="transcriptMoreBtn" style="display: none;">
+                        <i class="fas fa-chevron-down me-1"></i>Load more
+                    </button>
                 </div>
                 <div class="col-md-4">
                     ${meeting.visual_summary_path ? `
                         <h6><i class="fas fa-image me-2"></i>Visual Summary</h6>
-                        <img src="${meeting.visual_summary_path}" alt="Visual Summary" class="visual-summary img-fluid">
+                        <a href="${meeting.visual_summary_path}" target="_blank">
+                            <picture>
+                                ${meeting.visual_thumbnail_path ? `<source srcset="${meeting.visual_thumbnail_path}" type="image/webp">` : ''}
+                                <img src="${meeting.visual_summary_path}" alt="Visual Summary" class="visual-summary img-fluid" loading="lazy">
+                            </picture>
+                        </a>
                     ` : ''}
                     
                     <h6 class="mt-4"><i class="fas fa-info-circle me-2"></i>Meeting Info</h6>
@@ -294,12 +396,107 @@ async function showMeetingDetails(meetingId) {
         const modal = new bootstrap.Modal(document.getElementById('meetingModal'));
         modal.show();
         
+        // The transcript is fetched page by page after the modal opens
+        loadTranscriptSegments(meeting.id, 0);
+        
+        // Opened from a search hit: the #t= fragment makes the browser request
+        // only the byte range around that moment
+        if (startTime !== null) {
+            seekMeetingAudio(startTime);
+        }
+        
     } catch (error) {
         console.error('Error loading meeting details:', error);
         showAlert('Error loading meeting details: ' + error.message, 'error');
     }
 }
 
+// Load speaker-labelled transcript segments from a point in time into the details modal
+async function loadTranscriptSegments(meetingId, from) {
+    const container = document.getElementById('transcriptText');
+    const moreBtn = document.getElementById('transcriptMoreBtn');
+    if (!container) return;
+    
+    try {
+        moreBtn.disabled = true;
+        const response = await fetch(`/meeting/${meetingId}/transcript?from=${from}`);
+        const page = await response.json();
+        
+        if (!response.ok) {
+            throw new Error(page.error || 'Failed to load transcript');
+        }
+        
+        // Meetings processed before segments were stored only have plain text
+        if (from === 0 && page.segments.length === 0) {
+            moreBtn.disabled = false;
+            return loadTranscriptPage(meetingId, 0);
+        }
+        
+        let lastSpeaker = container.dataset.lastSpeaker || null;
+        container.insertAdjacentHTML('beforeend', page.segments.map(segment => {
+            const speaker = segment.speaker && segment.speaker !== lastSpeaker
+                ? `<strong>${escapeHtml(segment.speaker)}:</strong> ` : '';
+            lastSpeaker = segment.speaker;
+            return `
+                <div class="transcript-segment">
+                    <span class="transcript-time" onclick="seekMeetingAudio(${segment.start})">[${formatTimestamp(segment.start)}]</span>
+                    ${speaker}${escapeHtml(segment.text)}
+                </div>
+            `;
+        }).join(''));
+        container.dataset.lastSpeaker = lastSpeaker || '';
+        
+        if (page.next_from !== null) {
+            moreBtn.style.display = 'inline-block';
+            moreBtn.onclick = () => loadTranscriptSegments(meetingId, page.next_from);
+        } else {
+            moreBtn.style.display = 'none';
+        }
+        
+    } catch (error) {
+        console.error('Error loading transcript:', error);
+        container.insertAdjacentText('beforeend', ' [Error loading transcript]');
+    } finally {
+        moreBtn.disabled = false;
+    }
+}
+
+// Load one page of a meeting transcript into the details modal
+async function loadTranscriptPage(meetingId, offset) {
+    const container = document.getElementById('transcriptText');
+    const moreBtn = document.getElementById('transcriptMoreBtn');
+    if (!container) return;
+    
+    try {
+        moreBtn.disabled = true;
+        const response = await fetch(`/meeting/${meetingId}/transcript?offset=${offset}`);
+        const page = await response.json();
+        
+        if (!response.ok) {
+            throw new Error(page.error || 'Failed to load transcript');
+        }
+        
+        if (offset === 0 && !page.text) {
+            container.textContent = 'Transcript not available';
+        } else {
+            container.insertAdjacentText('beforeend', page.text);
+        }
+        
+        if (page.next_offset !== null) {
+            moreBtn.style.display = 'inline-block';
+            moreBtn.onclick = () => loadTranscriptPage(meetingId, page.next_offset);
+        } else {
+            moreBtn.style.display = 'none';
+        }
+        
+    } catch (error) {
+        console.error('Error loading transcript:', error);
+        container.insertAdjacentText('beforeend', ' [Error loading transcript]');
+    } finally {
+        moreBtn.disabled = false;
+    }
+}
+
 // Semantic Search
 async function performSearch() {
     const query = document.getElementById('searchQuery').value.trim();
@@ -371,6 +568,7 @@ function displaySearchResults(results, query) {
                 <div class="search-result-title">
                     ${escapeHtml(result.meeting_title)}
                     <span class="similarity-score">${Math.round(result.similarity * 100)}% match</span>
+                    ${result.start_time !== null && result.start_time !== undefined ? `<span class="text-muted small ms-2"><i class="fas fa-clock me-1"></i>at ${formatTimestamp(result.start_time)}</span>` : ''}
                 </div>
                 <div class="search-result-excerpt">
                     ${highlightQuery(result.text_chunk, query, 200)}
@@ -379,19 +577,97 @@ function displaySearchResults(results, query) {
                     <button class="btn btn-sm btn-outline-primary" onclick="showMeetingDetails(${result.meeting_id})">
                         <i class="fas fa-eye me-1"></i>View Meeting
                     </button>
+                    ${result.start_time !== null && result.start_time !== undefined ? `
+                        <button class="btn btn-sm btn-outline-secondary ms-1" onclick="showMeetingDetails(${result.meeting_id}, ${result.start_time})">
+                            <i class="fas fa-play me-1"></i>Play from ${formatTimestamp(result.start_time)}
+                        </button>
+                    ` : ''}
                 </div>
             </div>
         `).join('')}
     `;
 }
 
-// Search Similar Meetings
-function searchSimilarMeetings(title) {
-    document.getElementById('searchQuery').value = title;
+// Seek the details modal's player and start playback
+function seekMeetingAudio(seconds) {
+    const audio = document.getElementById('meetingAudio');
+    if (!audio) return;
+    
+    const play = () => {
+        audio.currentTime = seconds;
+        audio.play().catch(() => {});  // autoplay may be blocked until the user interacts
+    };
+    if (audio.readyState >= 1) {
+        play();
+    } else {
+        audio.addEventListener('loadedmetadata', play, { once: true });
+        audio.preload = 'metadata';
+        audio.load();
+    }
+}
+
+// Similar Meetings (precomputed neighbors, no embedding call)
+async function findSimilarMeetings(meetingId, title) {
+    const container = document.getElementById('searchResults');
     scrollToSection('search');
-    setTimeout(() => {
-        performSearch();
-    }, 500);
+    container.innerHTML = `
+        <div class="text-center py-3">
+            <div class="spinner-border text-primary" role="status">
+                <span class="visually-hidden">Loading...</span>
+            </div>
+        </div>
+    `;
+    
+    try {
+        const response = await fetch(`/meeting/${meetingId}/similar`);
+        const data = await response.json();
+        
+        if (!response.ok) {
+            throw new Error(data.error || 'Lookup failed');
+        }
+        
+        if (data.similar.length === 0) {
+            container.innerHTML = `
+                <div class="alert alert-info">
+                    <i class="fas fa-info-circle me-2"></i>
+                    No similar meetings found for "${escapeHtml(title)}" yet.
+                </div>
+            `;
+            return;
+        }
+        
+        container.innerHTML = `
+            <div class="mb-3">
+                <h5>Similar Meetings (${data.similar.length})</h5>
+                <small class="text-muted">Meetings most like: "${escapeHtml(title)}"</small>
+            </div>
+            ${data.similar.map(meeting => `
+                <div class="search-result">
+                    <div class="search-result-title">
+                        ${escapeHtml(meeting.title)}
+                        <span class="similarity-score">${Math.round(meeting.similarity * 100)}% match</span>
+                    </div>
+                    <div class="search-result-excerpt">
+                        ${escapeHtml(truncateText(meeting.summary || '', 200))}
+                    </div>
+                    <div class="mt-2">
+                        <button class="btn btn-sm btn-outline-primary" onclick="showMeetingDetails(${meeting.meeting_id})">
+                            <i class="fas fa-eye me-1"></i>View Meeting
+                        </button>
+                    </div>
+                </div>
+            `).join('')}
+        `;
+        
+    } catch (error) {
+        console.error('Similar meetings error:', error);
+        container.innerHTML = `
+            <div class="alert alert-danger">
+                <i class="fas fa-exclamation-triangle me-2"></i>
+                Could not load similar meetings: ${error.message}
+            </div>
+        `;
+    }
 }
 
 // Load Analytics
@@ -402,11 +678,39 @@ async function loadAnalytics() {
         
         displayAnalytics(analytics);
         
+        const topicsResponse = await fetch('/analytics/topics');
+        displayTopics(await topicsResponse.json());
+        
     } catch (error) {
         console.error('Error loading analytics:', error);
     }
 }
 
+// Display Topics
+function displayTopics(data) {
+    const container = document.getElementById('analyticsTopics');
+    if (!data.topics || data.topics.length === 0) {
+        container.innerHTML = '';
+        return;
+    }
+    
+    container.innerHTML = `
+        <div class="col-12">
+            <h5 class="mb-3"><i class="fas fa-tags me-2"></i>Topics</h5>
+            <ul class="list-group">
+                ${data.topics.map(topic => `
+                    <li class="list-group-item d-flex justify-content-between align-items-center">
+                        <span>${topic.keywords.map(word => `<span class="badge bg-secondary me-1">${escapeHtml(word)}</span>`).join('')}</span>
+                        <small class="text-muted">
+                            ${topic.meetings} meetings, ${topic.trend.length ? topic.trend[topic.trend.length - 1] : 0} in ${escapeHtml(data.weeks[data.weeks.length - 1] || '')}
+                        </small>
+                    </li>
+                `).join('')}
+            </ul>
+        </div>
+    `;
+}
+
 // Display Analytics
 function displayAnalytics(analytics) {
     const container = document.getElementById('analyticsCards');
@@ -451,6 +755,14 @@ function escapeHtml(text) {
     return div.innerHTML;
 }
 
+function formatTimestamp(seconds) {
+    const total = Math.floor(seconds);
+    const hours = Math.floor(total / 3600);
+    const minutes = String(Math.floor((total % 3600) / 60)).padStart(hours ? 2 : 1, '0');
+    const secs = String(total % 60).padStart(2, '0');
+    return hours ? `${hours}:${minutes}:${secs}` : `${minutes}:${secs}`;
+}
+
 function truncateText(text, maxLength) {
     if (!text || text.length <= maxLength) return text;
     return text.substring(0, maxLength) + '...';
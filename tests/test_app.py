@@ -4,9 +4,10 @@ Test cases for KIU Meeting Intelligence System
 import pytest
 import os
 import tempfile
+import io
 import json
 import sqlite3
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import sys
 
 # Add the parent directory to the path to import the app
@@ -16,9 +17,15 @@ from app import app, init_database
 from config import TestingConfig
 
 @pytest.fixture
-def client():
+def client(tmp_path, monkeypatch):
     """Create a test client"""
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')  # the API itself is mocked; the client only needs a key
     app.config.from_object(TestingConfig)
+    app.config['DATABASE'] = str(tmp_path / 'test_meetings.db')
+    app.config['UPLOAD_FOLDER'] = str(tmp_path / 'uploads')
+    app.config['VISUALS_FOLDER'] = str(tmp_path / 'visuals')
+    app.config['TENANT_DATA_FOLDER'] = str(tmp_path / 'tenants')
+    app.config['FINE_TUNE_EXPORT_PATH'] = str(tmp_path / 'exports' / 'fine_tune.jsonl')
     
     with app.test_client() as client:
         with app.app_context():
@@ -28,10 +35,10 @@ def client():
 @pytest.fixture
 def mock_openai():
     """Mock OpenAI API responses"""
-    with patch('openai.audio.transcriptions.create') as mock_transcribe, \
-         patch('openai.chat.completions.create') as mock_chat, \
-         patch('openai.embeddings.create') as mock_embeddings, \
-         patch('openai.images.generate') as mock_images:
+    with patch('openai.resources.audio.AsyncTranscriptions.create', new_callable=AsyncMock) as mock_transcribe, \
+         patch('openai.resources.chat.AsyncCompletions.create', new_callable=AsyncMock) as mock_chat, \
+         patch('openai.resources.AsyncEmbeddings.create', new_callable=AsyncMock) as mock_embeddings, \
+         patch('openai.resources.AsyncImages.generate', new_callable=AsyncMock) as mock_images:
         
         # Mock Whisper transcription
         mock_transcribe.return_value = MagicMock(
@@ -66,6 +73,33 @@ def mock_openai():
             'images': mock_images
         }
 
+@pytest.fixture
+def upload_meeting(client, mock_openai):
+    """Upload a fake recording through /upload-meeting and return the new meeting's id
+    
+    action_items and embedding set what the mocked extraction and embeddings
+    calls return for this upload.
+    """
+    def upload(title, audio=b'fake audio data', extension='mp3', tenant=None, action_items=None, embedding=None):
+        if action_items is not None:
+            function_call = MagicMock()
+            function_call.name = 'extract_action_items'
+            function_call.arguments = json.dumps({'action_items': action_items})
+            mock_openai['chat'].return_value.choices[0].message.function_call = function_call
+        if embedding is not None:
+            mock_openai['embeddings'].return_value = MagicMock(data=[MagicMock(embedding=embedding)])
+        
+        with tempfile.NamedTemporaryFile(suffix=f'.{extension}') as temp_file:
+            temp_file.write(audio)
+            temp_file.seek(0)
+            response = client.post('/upload-meeting', headers={'X-Tenant': tenant} if tenant else {}, data={
+                'title': title,
+                'audio_file': (temp_file, f'{title}.{extension}')
+            })
+        assert response.status_code == 200, response.data
+        return json.loads(response.data)['meeting_id']
+    return upload
+
 class TestBasicRoutes:
     """Test basic application routes"""
     
@@ -93,6 +127,646 @@ class TestBasicRoutes:
         assert 'searchable_chunks' in data
         assert 'apis_integrated' in data
 
+class TestCompressionAndCaching:
+    """Test response compression, hashed static URLs and visual thumbnails"""
+    
+    def test_compression_threshold(self, client):
+        """Test only responses above COMPRESSION_MIN_SIZE are compressed"""
+        import gzip
+        small = client.get('/meetings', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in small.headers
+        assert 'Accept-Encoding' in small.headers['Vary']
+        
+        page = client.get('/', headers={'Accept-Encoding': 'gzip'})
+        assert page.headers['Content-Encoding'] == 'gzip'
+        assert b'KIU Meeting Intelligence' in gzip.decompress(page.data)
+        assert 'Content-Encoding' not in client.get('/').headers
+    
+    def test_refused_encodings_not_used(self, client):
+        """Test an encoding listed with q=0 is never chosen, and codings are matched whole"""
+        import gzip
+        import app as app_module
+        fake_brotli = MagicMock()
+        fake_brotli.compress.return_value = b'brotli data'
+        with patch.object(app_module, 'brotli', fake_brotli):
+            assert client.get('/', headers={'Accept-Encoding': 'br'}).headers['Content-Encoding'] == 'br'
+            
+            page = client.get('/', headers={'Accept-Encoding': 'br;q=0, gzip'})
+            assert page.headers['Content-Encoding'] == 'gzip'
+            assert b'KIU Meeting Intelligence' in gzip.decompress(page.data)
+            assert client.get('/', headers={'Accept-Encoding': 'br;q=0, *'}).headers['Content-Encoding'] == 'gzip'
+            
+            for header in ('br;q=0, gzip;q=0', 'x-gzip-broken', 'identity'):
+                assert 'Content-Encoding' not in client.get('/', headers={'Accept-Encoding': header}).headers
+    
+    def test_static_urls_hashed_and_cached(self, client):
+        """Test static assets get content-hashed URLs with long-lived caching"""
+        import gzip
+        import re
+        page = client.get('/').data.decode()
+        url = re.search(r'/static/js/app\.js\?v=[0-9a-f]+', page).group(0)
+        
+        response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.cache_control.max_age == 365 * 24 * 3600
+        assert response.cache_control.immutable
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert b'showMeetingDetails' in gzip.decompress(response.data)
+        response.close()
+        
+        unversioned = client.get('/static/js/app.js')
+        assert not unversioned.cache_control.immutable
+        unversioned.close()
+    
+    def test_static_compression_cached(self, client):
+        """Test a static file is compressed once and served from the cache until it changes"""
+        import gzip
+        import app as app_module
+        app_module._static_compressed.clear()
+        bodies = []
+        with patch.object(app_module.gzip, 'compress', wraps=gzip.compress) as compress:
+            for _ in range(3):
+                response = client.get('/static/css/style.css', headers={'Accept-Encoding': 'gzip'})
+                bodies.append(response.data)
+                response.close()
+        assert compress.call_count == 1
+        assert bodies[0] == bodies[1] == bodies[2]
+        assert b'{' in gzip.decompress(bodies[0])
+    
+    @patch('requests.get')
+    def test_visual_thumbnail(self, mock_requests, client, mock_openai):
+        """Test a WebP thumbnail is generated with the visual summary, and only served by GET"""
+        Image = pytest.importorskip('PIL.Image')
+        image_bytes = io.BytesIO()
+        Image.new('RGB', (1024, 1024), 'steelblue').save(image_bytes, 'PNG')
+        mock_requests.return_value.content = image_bytes.getvalue()
+        
+        with tempfile.NamedTemporaryFile(suffix='.wav') as temp_file:
+            temp_file.write(b'fake audio data')
+            temp_file.seek(0)
+            meeting_id = json.loads(client.post('/upload-meeting', data={
+                'title': 'Thumbnail Meeting',
+                'audio_file': (temp_file, 'thumb.wav')
+            }).data)['meeting_id']
+        
+        meeting = json.loads(client.get(f'/meeting/{meeting_id}').data)
+        assert meeting['visual_thumbnail_path'].endswith('.webp')
+        with Image.open(meeting['visual_thumbnail_path']) as thumbnail:
+            assert thumbnail.format == 'WEBP'
+            assert max(thumbnail.size) <= 384
+        
+        os.remove(meeting['visual_thumbnail_path'])
+        assert json.loads(client.get(f'/meeting/{meeting_id}').data)['visual_thumbnail_path'] is None
+        assert not os.path.exists(meeting['visual_thumbnail_path'])
+
+class TestAnalytics:
+    """Test materialized analytics"""
+    
+    @patch('requests.get')
+    def test_analytics_updated_on_ingest(self, mock_requests, client, mock_openai):
+        """Test aggregates are maintained by the ingest pipeline"""
+        mock_requests.return_value.content = b'fake image data'
+        
+        function_call = MagicMock()
+        function_call.name = 'extract_action_items'
+        function_call.arguments = json.dumps({'action_items': [
+            {'task': 'Draft budget', 'owner': 'Alice', 'priority': 'High'},
+            {'task': 'Book venue', 'owner': 'Alice', 'priority': 'Low'}
+        ]})
+        mock_openai['chat'].return_value.choices[0].message.function_call = function_call
+        
+        with tempfile.NamedTemporaryFile(suffix='.mp3') as temp_file:
+            temp_file.write(b'fake audio data')
+            temp_file.seek(0)
+            client.post('/upload-meeting', data={
+                'title': 'Budget Meeting',
+                'attendees': 'Alice',
+                'audio_file': (temp_file, 'budget.mp3')
+            })
+        
+        data = json.loads(client.get('/analytics').data)
+        assert data['total_meetings'] == 1
+        assert data['average_duration_minutes'] == 30
+        assert data['searchable_chunks'] == 1
+        assert data['total_action_items'] == 2
+        assert data['meetings_per_week'][-1]['meetings'] == 1
+        assert data['action_items_per_owner'] == [{'owner': 'Alice', 'action_items': 2}]
+        assert data['api_spend_usd'] > 0
+    
+    @patch('requests.get')
+    def test_rebuild_matches_incremental(self, mock_requests, client, mock_openai):
+        """Test rebuilding the aggregates reproduces the incremental values"""
+        from app import get_db_connection, rebuild_analytics_stats, load_analytics_stats
+        mock_requests.return_value.content = b'fake image data'
+        
+        for name in ('first.mp3', 'second.mp3'):
+            with tempfile.NamedTemporaryFile(suffix='.mp3') as temp_file:
+                temp_file.write(b'fake audio data')
+                temp_file.seek(0)
+                client.post('/upload-meeting', data={
+                    'title': 'Weekly Sync',
+                    'audio_file': (temp_file, name)
+                })
+        
+        incremental = load_analytics_stats()
+        conn = get_db_connection()
+        rebuild_analytics_stats(conn)
+        conn.commit()
+        conn.close()
+        
+        assert load_analytics_stats() == incremental
+        assert incremental['total_meetings'] == 2
+
+class TestTopics:
+    """Test topic clustering over chunk embeddings"""
+    
+    def _store(self, title, chunks):
+        from app import store_meeting_data, store_meeting_embeddings
+        meeting_id = store_meeting_data(title, ' '.join(text for text, _ in chunks),
+                                        {'summary': title, 'action_items': [], 'decisions': []}, '', 30, None, None)
+        store_meeting_embeddings(meeting_id, {
+            'model': app.config['EMBEDDING_MODEL'], 'chunk_size': 1000, 'api_cost': 0,
+            'items': [(index, text, vector) for index, (text, vector) in enumerate(chunks)]
+        })
+        return meeting_id
+    
+    def test_topics_seeded_then_updated_incrementally(self, client):
+        """Test centroids are seeded once enough chunks exist, then each ingest is one mini-batch"""
+        app.config['TOPIC_COUNT'] = 2
+        budget = ('Quarterly budget forecast and spending review', [1.0, 0.1, 0.0])
+        hiring = ('Hiring plan for engineering candidates', [0.0, 0.1, 1.0])
+        
+        first = self._store('Budget 1', [budget, budget])
+        self._store('Hiring 1', [hiring, hiring])
+        self._store('Budget 2', [budget, budget])
+        assert json.loads(client.get('/analytics/topics').data)['topics'] == []
+        self._store('Hiring 2', [hiring, hiring])
+        
+        response = client.get('/analytics/topics')
+        assert response.headers['X-Cache'] == 'MISS'
+        data = json.loads(response.data)
+        assert len(data['weeks']) == 1
+        budget_topic = next(topic for topic in data['topics'] if 'budget' in topic['keywords'])
+        hiring_topic = next(topic for topic in data['topics'] if 'hiring' in topic['keywords'])
+        assert budget_topic['meetings'] == hiring_topic['meetings'] == 2.0
+        assert budget_topic['share'] == 0.5 and budget_topic['trend'] == [2.0]
+        assert [meeting['title'] for meeting in budget_topic['top_meetings']] == ['Budget 2', 'Budget 1']
+        assert client.get('/analytics/topics').headers['X-Cache'] == 'HIT'
+        
+        conn = sqlite3.connect(app.config['DATABASE'])
+        before = conn.execute('SELECT meeting_id, topic_id, weight FROM meeting_topics ORDER BY meeting_id').fetchall()
+        seen = dict(conn.execute('SELECT topic_id, chunks FROM topics').fetchall())
+        mixed = self._store('Budget and hiring', [budget, hiring])
+        after = conn.execute('SELECT meeting_id, topic_id, weight FROM meeting_topics ORDER BY meeting_id').fetchall()
+        assert after[:len(before)] == before
+        assert [weight for meeting_id, _, weight in after if meeting_id == mixed] == [0.5, 0.5]
+        assert {topic: chunks - seen[topic] for topic, chunks in conn.execute('SELECT topic_id, chunks FROM topics')} \
+            == {budget_topic['id']: 1, hiring_topic['id']: 1}
+        conn.close()
+        
+        response = client.get('/analytics/topics')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert [topic['meetings'] for topic in json.loads(response.data)['topics']] == [2.5, 2.5]
+        
+        client.delete(f'/meeting/{first}')
+        assert [topic['meetings'] for topic in json.loads(client.get('/analytics/topics').data)['topics']] \
+            == [2.5, 1.5]
+        
+        # A deleted meeting's chunks and words come back out of its topics
+        conn = sqlite3.connect(app.config['DATABASE'])
+        terms = json.loads(conn.execute('SELECT terms FROM topics WHERE topic_id = ?', (budget_topic['id'],)).fetchone()[0])
+        assert terms['quarterly'] == 3
+        client.delete(f'/meeting/{mixed}')
+        assert dict(conn.execute('SELECT topic_id, chunks FROM topics').fetchall()) == seen
+        terms = json.loads(conn.execute('SELECT terms FROM topics WHERE topic_id = ?', (budget_topic['id'],)).fetchone()[0])
+        assert terms['quarterly'] == 2
+        conn.close()
+
+class TestMetrics:
+    """Test instrumentation and the /metrics endpoint"""
+    
+    def test_metrics_format(self):
+        """Test histograms and counters render in Prometheus text format"""
+        from metrics import Registry, Counter, Histogram
+        registry = Registry()
+        calls = registry.register(Counter('calls_total', 'Calls', ('kind',)))
+        latency = registry.register(Histogram('latency_seconds', 'Latency', buckets=(0.1, 1)))
+        calls.inc(kind='a')
+        calls.inc(2, kind='a')
+        latency.observe(0.5)
+        
+        text = registry.render()
+        assert '# TYPE calls_total counter' in text
+        assert 'calls_total{kind="a"} 3' in text
+        assert 'latency_seconds_bucket{le="0.1"} 0' in text
+        assert 'latency_seconds_bucket{le="1.0"} 1' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 1' in text
+        assert 'latency_seconds_count 1' in text
+    
+    def test_metrics_summed_across_workers(self, tmp_path):
+        """Test each worker's snapshot is added in, and a dead worker keeps its counters but not its gauges"""
+        from metrics import Counter, Gauge, Histogram, MultiProcess, Registry
+        registry = Registry()
+        calls = registry.register(Counter('calls_total', 'Calls', ('kind',)))
+        queued = registry.register(Gauge('queued', 'Queued'))
+        latency = registry.register(Histogram('latency_seconds', 'Latency', buckets=(0.1, 1)))
+        shared = MultiProcess(str(tmp_path), registry)
+        
+        # Another worker: same metrics, flushed under its own pid
+        calls.inc(2, kind='a')
+        queued.set(3)
+        latency.observe(0.5)
+        shared.flush()
+        os.replace(tmp_path / f'{os.getpid()}.json', tmp_path / '4242.json')
+        registry.reset()
+        
+        calls.inc(kind='a')
+        queued.set(1)
+        latency.observe(0.05)
+        text = shared.render()
+        assert 'calls_total{kind="a"} 3' in text
+        assert 'queued 4' in text
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text and 'latency_seconds_count 2' in text
+        
+        shared.mark_process_dead(4242)
+        text = shared.render()
+        assert 'calls_total{kind="a"} 3' in text
+        assert 'queued 1' in text
+        assert 'latency_seconds_count 2' in text
+    
+    @patch('requests.get')
+    def test_pipeline_stages_exported(self, mock_requests, client, mock_openai):
+        """Test an upload records per-stage timings and OpenAI counters"""
+        from app import PIPELINE_STAGE_SECONDS
+        mock_requests.return_value.content = b'fake image data'
+        before = PIPELINE_STAGE_SECONDS.count(stage='transcription')
+        
+        with tempfile.NamedTemporaryFile(suffix='.mp3') as temp_file:
+            temp_file.write(b'fake audio data')
+            temp_file.seek(0)
+            client.post('/upload-meeting', data={
+                'title': 'Metrics Meeting',
+                'audio_file': (temp_file, 'metrics.mp3')
+            })
+        
+        assert PIPELINE_STAGE_SECONDS.count(stage='transcription') == before + 1
+        
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain')
+        text = response.data.decode()
+        for stage in ('upload_save', 'transcription', 'analysis_extraction', 'analysis_summary',
+                      'visual_generation', 'image_download', 'db_write', 'embeddings'):
+            assert f'meeting_pipeline_stage_seconds_count{{stage="{stage}"}}' in text
+        assert 'http_request_duration_seconds_count{method="POST",endpoint="/upload-meeting",status="200"}' in text
+        assert 'sqlite_query_duration_seconds_count{operation="INSERT"}' in text
+        assert 'openai_bytes_total{operation="transcription",direction="sent"}' in text
+
+class TestModelRouting:
+    """Test per-task chat model routing and escalation on invalid output"""
+    
+    def test_routes_by_length_and_meeting_type(self):
+        """Test rules match on estimated tokens and meeting type, and config overrides them"""
+        from model_router import ModelRouter, estimate_tokens, meeting_type
+        router = ModelRouter()
+        assert estimate_tokens('x' * 4001) == 1001
+        assert meeting_type('Daily Standup') == 'routine' and meeting_type('Async design review') == 'general'
+        
+        assert router.route('summary', 500)[0] == 'gpt-4o-mini'
+        assert router.route('extraction', 3000, 'general') == ('gpt-4', 'rule_2')
+        assert router.route('extraction', 3000, 'routine') == ('gpt-4o-mini', 'rule_1')
+        assert router.escalate('gpt-4o-mini') == 'gpt-4' and router.escalate('gpt-4') is None
+        
+        custom = ModelRouter.from_config('{"summary": [{"model": "gpt-3.5-turbo"}]}', 'gpt-3.5-turbo, gpt-4o')
+        assert custom.route('summary', 50000)[0] == 'gpt-3.5-turbo'
+        assert custom.route('extraction', 100)[0] == 'gpt-4o-mini'
+        assert custom.escalate('gpt-3.5-turbo') == 'gpt-4o'
+    
+    @patch('requests.get')
+    def test_invalid_extraction_escalates(self, mock_requests, client, mock_openai):
+        """Test a standup goes to the small model and malformed function calls are retried on a stronger one"""
+        from app import ANALYSIS_MODEL_ESCALATIONS, ANALYSIS_MODEL_SECONDS
+        mock_requests.return_value.content = b'fake image data'
+        escalations = ANALYSIS_MODEL_ESCALATIONS.value(task='extraction', from_model='gpt-4o-mini', to_model='gpt-4')
+        
+        async def chat(model, messages, functions=None, **kwargs):
+            function_call = None
+            if functions:
+                function_call = MagicMock()
+                function_call.name = 'extract_action_items'
+                function_call.arguments = '{"action_items": [{"task": "Ship' if model == 'gpt-4o-mini' else \
+                    json.dumps({'action_items': [{'task': 'Ship the release', 'owner': 'Alice', 'priority': 'High'}]})
+            return MagicMock(choices=[MagicMock(message=MagicMock(content='Standup summary.', function_call=function_call))])
+        mock_openai['chat'].side_effect = chat
+        
+        with tempfile.NamedTemporaryFile(suffix='.mp3') as temp_file:
+            temp_file.write(b'fake audio data')
+            temp_file.seek(0)
+            meeting_id = json.loads(client.post('/upload-meeting', data={
+                'title': 'Daily Standup',
+                'audio_file': (temp_file, 'standup.mp3')
+            }).data)['meeting_id']
+        
+        models = [(call.kwargs['model'], 'functions' in call.kwargs) for call in mock_openai['chat'].call_args_list]
+        assert sorted(models) == [('gpt-4', True), ('gpt-4o-mini', False), ('gpt-4o-mini', True)]
+        details = json.loads(client.get(f'/meeting/{meeting_id}').data)
+        assert details['summary'] == 'Standup summary.'
+        assert [item['task'] for item in details['action_items']] == ['Ship the release']
+        assert ANALYSIS_MODEL_ESCALATIONS.value(task='extraction', from_model='gpt-4o-mini', to_model='gpt-4') \
+            == escalations + 1
+        assert ANALYSIS_MODEL_SECONDS.count(task='extraction', model='gpt-4') >= 1
+        text = client.get('/metrics').data.decode()
+        assert 'analysis_model_routes_total{task="summary",model="gpt-4o-mini",reason="rule_0"}' in text
+        assert 'analysis_model_cost_usd_total{task="extraction",model="gpt-4"}' in text
+    
+    @patch('requests.get')
+    def test_summary_routed_on_text_sent(self, mock_requests, client, mock_openai):
+        """Test a long transcript's summary is routed on the part of it the summary model is given"""
+        from app import SUMMARY_TRANSCRIPT_CHARS
+        mock_requests.return_value.content = b'fake image data'
+        mock_openai['transcribe'].return_value.text = 'We reviewed the roadmap in detail. ' * 1000
+        
+        with tempfile.NamedTemporaryFile(suffix='.mp3') as temp_file:
+            temp_file.write(b'fake audio data')
+            temp_file.seek(0)
+            assert client.post('/upload-meeting', data={
+                'title': 'Quarterly planning',
+                'audio_file': (temp_file, 'planning.mp3')
+            }).status_code == 200
+        
+        calls = {'functions' in call.kwargs: call.kwargs for call in mock_openai['chat'].call_args_list}
+        assert calls[True]['model'] == 'gpt-4'
+        assert calls[False]['model'] == 'gpt-4o-mini'
+        assert len(calls[False]['messages'][1]['content']) < SUMMARY_TRANSCRIPT_CHARS + 100
+
+class TestBenchmarks:
+    """Test the benchmark harness against the local OpenAI stand-in"""
+    
+    def test_benchmark_smoke(self, tmp_path, monkeypatch):
+        """Test a tiny run of every scenario produces diffable JSON"""
+        import openai
+        monkeypatch.syspath_prepend(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+        import run_benchmarks
+        
+        for name in ('api_key', 'base_url', 'max_retries'):
+            monkeypatch.setattr(openai, name, getattr(openai, name))
+        monkeypatch.setitem(app.config, 'DATABASE', app.config['DATABASE'])
+        monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', app.config['UPLOAD_FOLDER'])
+        
+        output = tmp_path / 'results.json'
+        run_benchmarks.main([
+            '--startup-runs', '1', '--ingest-meetings', '2', '--concurrency', '2', '--audio-kb', '4',
+            '--corpus-sizes', '5,10', '--chunks-per-meeting', '2', '--queries', '3',
+            '--embedding-dim', '8', '--output', str(output)
+        ])
+        
+        results = json.loads(output.read_text())
+        assert results['scenarios']['startup']['import_app']['count'] == 1
+        assert results['scenarios']['ingest']['succeeded'] == 2
+        assert [point['corpus_meetings'] for point in results['scenarios']['search']] == [5, 10]
+        assert results['scenarios']['listing'][-1]['p99_ms'] >= 0
+
+class TestStartup:
+    """Test cold start stays within the import-time budget"""
+    
+    # Importing app.py took ~0.8s with eager openai/numpy imports and ~0.2s lazily
+    IMPORT_TIME_BUDGET_SECONDS = 0.6
+    
+    def test_import_time_budget(self, tmp_path):
+        """Test importing the app defers heavy modules and stays within budget"""
+        import subprocess
+        code = ("import sys, time; start = time.perf_counter(); import app; "
+                "print(time.perf_counter() - start); "
+                "print(','.join(m for m in ('openai', 'httpx', 'numpy', 'PIL', 'requests') if m in sys.modules))")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        
+        # The first run may compile bytecode; time the best of three warm starts
+        timings = []
+        for _ in range(3):
+            output = subprocess.run([sys.executable, '-c', code], cwd=str(tmp_path), env=env,
+                                    capture_output=True, text=True, check=True).stdout.splitlines()
+            timings.append(float(output[0]))
+        
+        assert output[1] == ''
+        assert min(timings) < self.IMPORT_TIME_BUDGET_SECONDS
+
+class TestBulkImport:
+    """Test bulk import of recording archives"""
+    
+    @patch('requests.get')
+    def test_import_dedupes_and_resumes(self, mock_requests, client, mock_openai, tmp_path):
+        """Test duplicate recordings are skipped and a re-run imports nothing new"""
+        from importer import import_directory
+        mock_requests.return_value.content = b'fake image data'
+        
+        archive = tmp_path / 'archive'
+        (archive / '2024').mkdir(parents=True)
+        (archive / 'weekly_standup.mp3').write_bytes(b'standup audio')
+        (archive / '2024' / 'standup_copy.mp3').write_bytes(b'standup audio')
+        (archive / '2024' / 'planning.wav').write_bytes(b'planning audio')
+        (archive / 'notes.txt').write_bytes(b'not audio')
+        
+        summary = import_directory(str(archive), workers=2)
+        assert summary['files'] == 3
+        assert summary['imported'] == 2
+        assert summary['duplicate'] == 1
+        assert summary['failed'] == 0
+        
+        meetings = json.loads(client.get('/meetings').data)
+        assert sorted(meeting['title'] for meeting in meetings) == ['Planning', 'Weekly Standup']
+        
+        rerun = import_directory(str(archive), workers=2)
+        assert rerun['imported'] == 0
+        assert rerun['skipped'] == 3
+    
+    @patch('requests.get')
+    def test_import_retries_failed_files(self, mock_requests, client, mock_openai, tmp_path):
+        """Test failed files are checkpointed and retried on the next run"""
+        from importer import import_directory
+        mock_requests.return_value.content = b'fake image data'
+        (tmp_path / 'review.m4a').write_bytes(b'review audio')
+        
+        mock_openai['transcribe'].side_effect = Exception("API Error")
+        assert import_directory(str(tmp_path), workers=1)['failed'] == 1
+        
+        mock_openai['transcribe'].side_effect = None
+        assert import_directory(str(tmp_path), workers=1)['imported'] == 1
+    
+    @patch('requests.get')
+    def test_failed_copy_not_a_duplicate(self, mock_requests, client, mock_openai, tmp_path):
+        """Test a copy of a recording that failed is imported, not marked a duplicate of nothing"""
+        from importer import import_directory
+        mock_requests.return_value.content = b'fake image data'
+        (tmp_path / 'a_review.mp3').write_bytes(b'review audio')
+        (tmp_path / 'b_review_copy.mp3').write_bytes(b'review audio')
+        
+        mock_openai['transcribe'].side_effect = [Exception("API Error"), mock_openai['transcribe'].return_value]
+        summary = import_directory(str(tmp_path), workers=1)
+        assert (summary['failed'], summary['imported'], summary['duplicate']) == (1, 1, 0)
+        
+        conn = sqlite3.connect(app.config['DATABASE'])
+        rows = dict(conn.execute("SELECT status, meeting_id FROM import_files"))
+        assert rows['failed'] is None and rows['done'] is not None
+        
+        mock_openai['transcribe'].side_effect = None
+        rerun = import_directory(str(tmp_path), workers=1)
+        assert (rerun['duplicate'], rerun['skipped']) == (1, 1)
+        assert conn.execute("SELECT meeting_id FROM import_files WHERE path LIKE '%a_review.mp3'").fetchone()[0] \
+            == rows['done']
+        conn.close()
+
+class TestReindex:
+    """Test incremental re-indexing after an embedding model change"""
+    
+    @patch('requests.get')
+    def test_reindex_with_dual_read(self, mock_requests, client, mock_openai, monkeypatch):
+        """Test search spans both models mid-migration and reindex converges"""
+        from app import reindex_embeddings
+        mock_requests.return_value.content = b'fake image data'
+        
+        for name in ('old.mp3', 'older.mp3'):
+            with tempfile.NamedTemporaryFile(suffix='.mp3') as temp_file:
+                temp_file.write(b'fake audio data')
+                temp_file.seek(0)
+                client.post('/upload-meeting', data={
+                    'title': 'Roadmap Review',
+                    'audio_file': (temp_file, name)
+                })
+        
+        monkeypatch.setitem(app.config, 'EMBEDDING_MODEL', 'text-embedding-3-small')
+        status = json.loads(client.get('/reindex').data)
+        assert status['pending_meetings'] == 2
+        assert status['index_versions'][0]['model'] == 'text-embedding-ada-002'
+        
+        # Re-index only one meeting, leaving the index half migrated
+        reindex_embeddings(batch_size=1, pause_seconds=0, stop_event=MagicMock(is_set=MagicMock(side_effect=[False, True])))
+        
+        mock_openai['embeddings'].reset_mock()
+        results = json.loads(client.post('/search', json={'query': 'roadmap'}).data)
+        assert len({result['meeting_id'] for result in results}) == 2
+        models = {call.kwargs['model'] for call in mock_openai['embeddings'].call_args_list}
+        assert models == {'text-embedding-ada-002', 'text-embedding-3-small'}
+        
+        assert reindex_embeddings(pause_seconds=0) == {'processed': 1, 'failed': 0}
+        status = json.loads(client.get('/reindex').data)
+        assert status['pending_meetings'] == 0
+        assert [version['model'] for version in status['index_versions']] == ['text-embedding-3-small']
+        assert json.loads(client.get('/analytics').data)['searchable_chunks'] == 2
+
+class TestActionItems:
+    """Test normalized action item and decision queries"""
+    
+    @patch('requests.get')
+    def test_filter_and_paginate(self, mock_requests, client, upload_meeting):
+        """Test filtering by owner/priority/status/due date and cursor pagination"""
+        mock_requests.return_value.content = b'fake image data'
+        upload_meeting('Planning', action_items=[
+            {'task': 'Draft budget', 'owner': 'Alice', 'deadline': '2024-01-15', 'priority': 'High'},
+            {'task': 'Book venue', 'owner': 'Bob', 'deadline': 'Friday', 'priority': 'Low'}
+        ])
+        upload_meeting('Review', action_items=[
+            {'task': 'Review budget', 'owner': 'Alice', 'deadline': '2024-02-01', 'priority': 'High'},
+            {'task': 'Send notes', 'owner': 'Alice', 'priority': 'medium'}
+        ])
+        
+        high = json.loads(client.get('/action-items?owner=alice&priority=High&status=open').data)
+        assert [item['task'] for item in high['items']] == ['Review budget', 'Draft budget']
+        assert high['items'][0]['meeting_title'] == 'Review'
+        
+        due = json.loads(client.get('/action-items?due_before=2024-01-31').data)
+        assert [item['task'] for item in due['items']] == ['Draft budget']
+        
+        first = json.loads(client.get('/action-items?limit=3').data)
+        assert len(first['items']) == 3
+        rest = json.loads(client.get(f"/action-items?limit=3&cursor={first['next_cursor']}").data)
+        assert [item['task'] for item in rest['items']] == ['Draft budget']
+        assert rest['next_cursor'] is None
+        
+        item_id = high['items'][0]['id']
+        assert client.patch(f'/action-items/{item_id}', json={'status': 'done'}).status_code == 200
+        assert client.patch(f'/action-items/{item_id}', json={'status': 'bogus'}).status_code == 400
+        still_open = json.loads(client.get('/action-items?owner=Alice&priority=High&status=open').data)
+        assert [item['task'] for item in still_open['items']] == ['Draft budget']
+    
+    @patch('requests.get')
+    def test_task_ledger_links_repeated_items(self, mock_requests, client, mock_openai, upload_meeting):
+        """Test repeated action items resolve to one task per owner, and the ledger follows deletes"""
+        mock_requests.return_value.content = b'fake image data'
+        directions = {'metrics': [1.0, 0.0, 0.0], 'venue': [0.0, 1.0, 0.0], 'login': [0.0, 0.0, 1.0]}
+        
+        async def embed(model, input):
+            vectors = [next((vector for word, vector in directions.items() if word in text.lower()), [0.5, 0.5, 0.5])
+                       for text in input]
+            return MagicMock(data=[MagicMock(embedding=vector) for vector in vectors])
+        mock_openai['embeddings'].side_effect = embed
+        
+        first = upload_meeting('Standup 1', action_items=[
+            {'task': 'Send the weekly metrics report', 'owner': 'Alice', 'priority': 'Low'},
+            {'task': 'Book venue', 'owner': 'Bob'}
+        ])
+        second = upload_meeting('Standup 2', action_items=[
+            {'task': 'Send weekly metrics to the team', 'owner': ' alice', 'priority': 'High'},
+            {'task': 'Book venue', 'owner': 'Carol'},
+            {'task': 'Fix the login bug', 'owner': 'Alice'}
+        ])
+        
+        alice = json.loads(client.get('/tasks?owner=ALICE').data)['items']
+        assert [task['task'] for task in alice] == ['Fix the login bug', 'Send weekly metrics to the team']
+        repeated = alice[1]
+        assert (repeated['mentions'], repeated['first_meeting_id'], repeated['last_meeting_id']) == (2, first, second)
+        assert repeated['priority'] == 'High'
+        assert len(json.loads(client.get('/tasks?status=open').data)['items']) == 4
+        assert [task['id'] for task in json.loads(client.get('/tasks?min_mentions=2').data)['items']] == [repeated['id']]
+        
+        # Editing one mention moves its task; it is done once every mention is
+        mentions = json.loads(client.get(f"/action-items?task_id={repeated['id']}").data)['items']
+        assert client.patch(f"/action-items/{mentions[0]['id']}", json={'status': 'done'}).status_code == 200
+        assert [task['id'] for task in json.loads(client.get('/tasks?status=in_progress').data)['items']] == [repeated['id']]
+        assert client.patch(f"/action-items/{mentions[1]['id']}", json={'status': 'done'}).status_code == 200
+        assert [task['id'] for task in json.loads(client.get('/tasks?status=done').data)['items']] == [repeated['id']]
+        assert client.patch(f"/action-items/{mentions[1]['id']}", json={'status': 'open'}).status_code == 200
+        
+        assert client.patch(f"/tasks/{repeated['id']}", json={'status': 'done'}).status_code == 200
+        items = json.loads(client.get(f"/action-items?task_id={repeated['id']}").data)['items']
+        assert [(item['meeting_id'], item['status']) for item in items] == [(second, 'done'), (first, 'done')]
+        assert client.patch('/tasks/9999', json={'status': 'done'}).status_code == 404
+        
+        # A done task is closed: mentioning it again starts a new one
+        upload_meeting('Standup 3', action_items=[
+            {'task': 'Send the weekly metrics report', 'owner': 'Alice'}
+        ])
+        assert len(json.loads(client.get('/tasks?owner=alice').data)['items']) == 3
+        
+        client.delete(f'/meeting/{second}')
+        tasks = json.loads(client.get('/tasks').data)['items']
+        assert sorted(task['task'] for task in tasks) == ['Book venue', 'Send the weekly metrics report',
+                                                          'Send the weekly metrics report']
+        reverted = next(task for task in tasks if task['id'] == repeated['id'])
+        assert (reverted['mentions'], reverted['last_meeting_id']) == (1, first)
+        assert (reverted['task'], reverted['priority'], reverted['status']) == ('Send the weekly metrics report', 'Low', 'done')
+    
+    def test_backfill_from_json_columns(self, client):
+        """Test databases from before the normalized tables are backfilled"""
+        from app import get_db_connection, init_database
+        conn = get_db_connection()
+        conn.execute('DROP TABLE action_items')
+        conn.execute('DROP TABLE decisions')
+        conn.execute('''
+            INSERT INTO meetings (title, action_items, decisions) VALUES (?, ?, ?)
+        ''', ('Legacy', json.dumps([{'task': 'Ship it', 'owner': 'Dana', 'priority': 'High'}]),
+              json.dumps([{'decision': 'Adopt SQLite', 'rationale': 'Simple'}])))
+        conn.commit()
+        conn.close()
+        
+        init_database()
+        
+        items = json.loads(client.get('/action-items?owner=Dana').data)['items']
+        assert [item['task'] for item in items] == ['Ship it']
+        decisions = json.loads(client.get('/decisions?q=sqlite').data)['items']
+        assert decisions[0]['decision'] == 'Adopt SQLite'
+        assert decisions[0]['meeting_title'] == 'Legacy'
+
 class TestFileUpload:
     """Test file upload functionality"""
     
@@ -171,8 +845,217 @@ class TestMeetingData:
             detail_data = json.loads(detail_response.data)
             assert detail_data['title'] == 'Strategy Meeting'
             assert detail_data['attendees'] == 'Alice, Bob, Charlie'
-            assert 'transcription' in detail_data
             assert 'summary' in detail_data
+            
+            # The transcript is served separately
+            assert 'transcription' not in detail_data
+            transcript_response = client.get(detail_data['transcript_url'])
+            assert transcript_response.status_code == 200
+            transcript = json.loads(transcript_response.data)
+            assert transcript['text'] == 'This is a test meeting transcript.'
+    
+    @patch('requests.get')
+    def test_transcript_paging_and_compression(self, mock_requests, client, mock_openai):
+        """Test transcript pages by offset/limit and is gzip compressed on request"""
+        import gzip
+        mock_requests.return_value.content = b'fake image data'
+        app.config['COMPRESSION_MIN_SIZE'] = 0
+        
+        with tempfile.NamedTemporaryFile(suffix='.wav') as temp_file:
+            temp_file.write(b'fake audio data')
+            temp_file.seek(0)
+            meeting_id = json.loads(client.post('/upload-meeting', data={
+                'title': 'Long Meeting',
+                'audio_file': (temp_file, 'long.wav')
+            }).data)['meeting_id']
+        
+        page = json.loads(client.get(f'/meeting/{meeting_id}/transcript?offset=5&limit=10').data)
+        assert page['text'] == 'is a test '
+        assert page['total_length'] == 34
+        assert page['next_offset'] == 15
+        
+        last = json.loads(client.get(f'/meeting/{meeting_id}/transcript?offset=30').data)
+        assert last['text'] == 'ipt.'
+        assert last['next_offset'] is None
+        
+        compressed = client.get(f'/meeting/{meeting_id}/transcript', headers={'Accept-Encoding': 'gzip'})
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(compressed.data))['text'] == 'This is a test meeting transcript.'
+        
+        assert client.get('/meeting/999/transcript').status_code == 404
+        assert client.get(f'/meeting/{meeting_id}/transcript?limit=0').status_code == 400
+    
+    @patch('requests.get')
+    def test_segments_time_slices_and_search_timestamps(self, mock_requests, client, mock_openai):
+        """Test Whisper segments are stored with speakers, served by time and mapped to search hits"""
+        mock_requests.return_value.content = b'fake image data'
+        app.config['EMBEDDING_CHUNK_SIZE'] = 12
+        mock_openai['transcribe'].return_value = MagicMock(
+            text='Hello team. Budget is approved? Yes it is. Moving on.',
+            duration=12,
+            segments=[
+                {'start': 0.0, 'end': 2.0, 'text': ' Hello team.'},
+                {'start': 2.5, 'end': 5.0, 'text': ' Budget is approved?'},
+                {'start': 5.0, 'end': 6.5, 'text': ' Yes it is.'},
+                {'start': 9.0, 'end': 12.0, 'text': ' Moving on.'}
+            ]
+        )
+        mock_openai['embeddings'].return_value = MagicMock(data=[MagicMock(embedding=[0.1] * 8)] * 5)
+        
+        with tempfile.NamedTemporaryFile(suffix='.wav') as temp_file:
+            temp_file.write(b'fake audio data')
+            temp_file.seek(0)
+            meeting_id = json.loads(client.post('/upload-meeting', data={
+                'title': 'Segmented',
+                'audio_file': (temp_file, 'segmented.wav')
+            }).data)['meeting_id']
+        
+        # A pause or a question starts a new turn
+        all_segments = json.loads(client.get(f'/meeting/{meeting_id}/transcript?from=0').data)['segments']
+        assert [segment['speaker'] for segment in all_segments] == ['Speaker 1', 'Speaker 1', 'Speaker 2', 'Speaker 1']
+        
+        middle = json.loads(client.get(f'/meeting/{meeting_id}/transcript?from=3&to=8').data)
+        assert [segment['text'] for segment in middle['segments']] == ['Budget is approved?', 'Yes it is.']
+        assert middle['segments'][0]['start'] == 2.5
+        assert json.loads(client.get(f'/meeting/{meeting_id}/transcript?from=7&to=8.5').data)['segments'] == []
+        assert client.get(f'/meeting/{meeting_id}/transcript?from=5&to=2').status_code == 400
+        assert client.get('/meeting/999/transcript?from=0').status_code == 404
+        
+        # Chunks start at characters 0, 12, 24, 36 and 48
+        results = json.loads(client.post('/search', json={'query': 'budget'}).data)
+        assert sorted(result['start_time'] for result in results) == [0.0, 2.5, 2.5, 5.0, 9.0]
+    
+    @patch('requests.get')
+    def test_audio_range_streaming(self, mock_requests, client, mock_openai):
+        """Test recordings are served with Range, If-Range and conditional GET support"""
+        from werkzeug.wsgi import FileWrapper
+        mock_requests.return_value.content = b'fake image data'
+        audio = bytes(range(256)) * 40
+        with tempfile.NamedTemporaryFile(suffix='.wav') as temp_file:
+            temp_file.write(audio)
+            temp_file.seek(0)
+            meeting_id = json.loads(client.post('/upload-meeting', data={
+                'title': 'Playback',
+                'audio_file': (temp_file, 'playback.wav')
+            }).data)['meeting_id']
+        url = json.loads(client.get(f'/meeting/{meeting_id}').data)['audio_url']
+        
+        full = client.get(url)
+        assert full.status_code == 200 and full.data == audio
+        assert full.headers['Accept-Ranges'] == 'bytes'
+        assert full.mimetype == 'audio/wav'
+        assert 'private' in full.headers['Cache-Control']
+        
+        part = client.get(url, headers={'Range': 'bytes=1000-1999'})
+        assert part.status_code == 206
+        assert part.headers['Content-Range'] == f'bytes 1000-1999/{len(audio)}'
+        assert part.data == audio[1000:2000]
+        
+        assert client.get(url, headers={'If-None-Match': full.headers['ETag']}).status_code == 304
+        stale = client.get(url, headers={'Range': 'bytes=0-9', 'If-Range': '"stale"'})
+        assert stale.status_code == 200 and stale.data == audio
+        assert client.get(url, headers={'Range': f'bytes={len(audio)}-'}).status_code == 416
+        
+        # Servers with a file wrapper (gunicorn) get the file positioned at the start of a range ending at EOF
+        offsets = []
+        
+        class RecordingFileWrapper(FileWrapper):
+            def __init__(self, file, buffer_size=8192):
+                offsets.append(file.tell())
+                super().__init__(file, buffer_size)
+        
+        wrapped = client.get(url, headers={'Range': 'bytes=5000-'},
+                             environ_base={'wsgi.file_wrapper': RecordingFileWrapper})
+        assert wrapped.status_code == 206 and offsets[-1] == 5000
+        assert wrapped.data == audio[5000:]
+        
+        bounded = client.get(url, headers={'Range': 'bytes=2048-3071'},
+                             environ_base={'wsgi.file_wrapper': RecordingFileWrapper})
+        assert bounded.status_code == 206 and offsets[-1] == 0  # werkzeug's own range-limited body
+        assert bounded.headers['Content-Length'] == '1024'
+        assert bounded.data == audio[2048:3072] and len(bounded.data) == 1024
+        
+        assert client.get('/meeting/999/audio').status_code == 404
+    
+    @patch('requests.get')
+    def test_audio_preprocessing(self, mock_requests, client, mock_openai):
+        """Test uploads are downmixed, resampled and trimmed before Whisper, keeping original timestamps"""
+        import wave
+        import numpy as np
+        import app as app_module
+        mock_requests.return_value.content = b'fake image data'
+        app.config['AUDIO_PREPROCESS'] = True
+        
+        # Stereo 48kHz: 3s silence, 2s speech, 10s silence, 2s speech, 3s silence
+        rate = 48000
+        noise = lambda seconds: np.random.default_rng(1).normal(0, 0.001, int(rate * seconds))
+        speech = lambda seconds: 0.5 * np.sin(2 * np.pi * 220 * np.arange(int(rate * seconds)) / rate)
+        mono = np.concatenate([noise(3), speech(2), noise(10), speech(2), noise(3)])
+        audio = io.BytesIO()
+        with wave.open(audio, 'wb') as target:
+            target.setnchannels(2)
+            target.setsampwidth(2)
+            target.setframerate(rate)
+            target.writeframes((np.repeat(mono, 2) * 32767).astype('<i2').tobytes())
+        original_bytes = len(audio.getvalue())
+        audio.seek(0)
+        
+        sent = {}
+        async def transcribe(file, **kwargs):
+            with wave.open(file.name, 'rb') as source:
+                sent.update(bytes=os.path.getsize(file.name), channels=source.getnchannels(),
+                            rate=source.getframerate(), seconds=source.getnframes() / source.getframerate())
+            return MagicMock(text='First point. Second point.', duration=sent['seconds'], segments=[
+                {'start': 0.0, 'end': 2.6, 'text': 'First point.'},
+                {'start': 3.6, 'end': 6.2, 'text': 'Second point.'}
+            ])
+        mock_openai['transcribe'].side_effect = transcribe
+        applied = app_module.AUDIO_PREPROCESS_RESULTS.value(result='applied')
+        
+        meeting_id = json.loads(client.post('/upload-meeting', data={
+            'title': 'Preprocessed',
+            'audio_file': (audio, 'stereo.wav')
+        }).data)['meeting_id']
+        
+        assert sent['channels'] == 1 and sent['rate'] == 16000
+        assert sent['bytes'] < original_bytes / 10
+        assert 5 < sent['seconds'] < 8
+        assert app_module.AUDIO_PREPROCESS_RESULTS.value(result='applied') == applied + 1
+        
+        # Timestamps point into the original recording
+        segments = json.loads(client.get(f'/meeting/{meeting_id}/transcript?from=0').data)['segments']
+        assert abs(segments[0]['start'] - 2.7) < 0.1
+        assert abs(segments[1]['start'] - 14.7) < 0.1 and abs(segments[1]['end'] - 17.3) < 0.1
+        
+        # The upload is replaced by the smaller mono 16kHz copy of the full recording
+        conn = sqlite3.connect(app.config['DATABASE'])
+        audio_path = conn.execute('SELECT audio_file_path FROM meetings WHERE id = ?', (meeting_id,)).fetchone()[0]
+        conn.close()
+        assert audio_path.endswith('.16k.wav')
+        assert os.listdir(app.config['UPLOAD_FOLDER']) == [os.path.basename(audio_path)]
+        with wave.open(audio_path, 'rb') as stored:
+            assert stored.getnchannels() == 1 and stored.getnframes() == 20 * 16000
+    
+    def test_meetings_pages_with_snippets(self, client):
+        """Test /meetings pages newest first with server-side summary snippets"""
+        from app import store_meeting_data
+        long_summary = 'The team reviewed the roadmap. ' * 20
+        for i in range(5):
+            store_meeting_data(f'Meeting {i}', 'transcript',
+                               {'summary': long_summary, 'action_items': [], 'decisions': []},
+                               '', 30, '', '')
+        
+        first = json.loads(client.get('/meetings?limit=2').data)
+        assert [item['title'] for item in first['items']] == ['Meeting 4', 'Meeting 3']
+        assert 'summary' not in first['items'][0]
+        snippet = first['items'][0]['summary_snippet']
+        assert len(snippet) <= 153 and snippet.endswith('...') and long_summary.startswith(snippet[:-3])
+        rest = json.loads(client.get(f"/meetings?limit=3&cursor={first['next_cursor']}").data)
+        assert [item['title'] for item in rest['items']] == ['Meeting 2', 'Meeting 1', 'Meeting 0']
+        assert rest['next_cursor'] is None
+        
+        # Without paging parameters the full list is still returned
+        assert len(json.loads(client.get('/meetings').data)) == 5
     
     def test_meeting_not_found(self, client):
         """Test retrieving non-existent meeting"""
@@ -221,6 +1104,575 @@ class TestSemanticSearch:
         data = json.loads(response.data)
         assert isinstance(data, list)
 
+class TestProductionServing:
+    """Test the in-memory search index and readiness endpoint"""
+    
+    def test_search_index_refresh(self, tmp_path):
+        """Test the index appends new rows and rebuilds after deletes"""
+        import numpy as np
+        from search_index import SearchIndex
+        
+        conn = sqlite3.connect(str(tmp_path / 'index.db'))
+        conn.execute('CREATE TABLE meeting_embeddings (id INTEGER PRIMARY KEY, model TEXT, embedding BLOB)')
+        add = lambda vector, model='m': conn.execute(
+            'INSERT INTO meeting_embeddings (model, embedding) VALUES (?, ?)',
+            (model, np.array(vector, dtype=np.float64).tobytes()))
+        add([1, 0, 0]); add([0, 1, 0]); add([0, 0, 1], 'other')
+        
+        index = SearchIndex()
+        assert index.refresh(conn) and index.chunks == 3
+        assert index.models() == ['m', 'other']
+        assert not index.refresh(conn)
+        
+        add([1, 1, 0])
+        assert index.refresh(conn)
+        assert [row_id for row_id, _ in index.search('m', [1, 0.1, 0], 2)] == [1, 4]
+        
+        conn.execute('DELETE FROM meeting_embeddings WHERE id = 1')
+        assert index.refresh(conn) and index.chunks == 3
+        assert index.search('m', [1, 0, 0], 1)[0][0] == 4
+        assert index.search('missing', [1, 0, 0]) == []
+        conn.close()
+    
+    @patch('requests.get')
+    def test_readiness_and_indexed_search(self, mock_requests, client, mock_openai):
+        """Test /ready loads the index and search serves newly ingested chunks"""
+        mock_requests.return_value.content = b'fake image data'
+        ready = client.get('/ready')
+        assert ready.status_code == 200
+        assert json.loads(ready.data)['search_chunks'] == 0
+        
+        with tempfile.NamedTemporaryFile(suffix='.mp3') as temp_file:
+            temp_file.write(b'fake audio data')
+            temp_file.seek(0)
+            client.post('/upload-meeting', data={
+                'title': 'Indexed Meeting',
+                'audio_file': (temp_file, 'indexed.mp3')
+            })
+        
+        results = json.loads(client.post('/search', json={'query': 'test meeting'}).data)
+        assert results[0]['meeting_title'] == 'Indexed Meeting'
+        assert results[0]['similarity'] == pytest.approx(1.0, abs=1e-5)
+        assert json.loads(client.get('/ready').data)['search_chunks'] == 1
+
+class TestSearchCache:
+    """Test the /search result cache and its corpus-version invalidation"""
+    
+    @patch('requests.get')
+    def test_cache_hits_until_corpus_changes(self, mock_requests, client, mock_openai, upload_meeting):
+        """Test repeated queries are served from cache until new embeddings land"""
+        mock_requests.return_value.content = b'fake image data'
+        upload_meeting('Budget Review')
+        
+        first = client.post('/search', json={'query': 'budget review'})
+        assert first.headers['X-Cache'] == 'MISS'
+        embedding_calls = mock_openai['embeddings'].call_count
+        
+        repeat = client.post('/search', json={'query': '  Budget   REVIEW '})
+        assert repeat.headers['X-Cache'] == 'HIT'
+        assert json.loads(repeat.data) == json.loads(first.data)
+        assert mock_openai['embeddings'].call_count == embedding_calls
+        
+        assert client.post('/search', json={'query': 'budget review', 'limit': 5}).headers['X-Cache'] == 'MISS'
+        assert client.post('/search', json={'query': 'budget review', 'limit': 0}).status_code == 400
+        
+        upload_meeting('Budget Follow-up')
+        refreshed = client.post('/search', json={'query': 'budget review'})
+        assert refreshed.headers['X-Cache'] == 'MISS'
+        assert len(json.loads(refreshed.data)) == 2
+    
+    @patch('requests.get')
+    def test_shared_cache_in_sqlite(self, mock_requests, client, upload_meeting):
+        """Test results cached by one process are visible to another through SQLite"""
+        from app import SEARCH_CACHE
+        mock_requests.return_value.content = b'fake image data'
+        app.config['SEARCH_CACHE_SHARED'] = True
+        upload_meeting('Shared Cache')
+        
+        assert client.post('/search', json={'query': 'shared'}).headers['X-Cache'] == 'MISS'
+        SEARCH_CACHE.clear()  # as if another worker handled the next request
+        assert client.post('/search', json={'query': 'shared'}).headers['X-Cache'] == 'HIT'
+
+class TestTenantShards:
+    """Test per-tenant database shards and cross-shard search"""
+    
+    @patch('requests.get')
+    def test_tenants_are_isolated_and_searched_together(self, mock_requests, client, mock_openai, upload_meeting):
+        """Test each tenant writes to its own shard and a fan-out search merges them"""
+        from app import open_tenant_shard
+        mock_requests.return_value.content = b'fake image data'
+        for tenant in ('alpha', 'beta'):
+            open_tenant_shard(tenant, create=True)
+        upload_meeting('Alpha Planning', tenant='alpha')
+        upload_meeting('Beta Planning', tenant='beta')
+        
+        assert os.path.exists(os.path.join(app.config['TENANT_DATA_FOLDER'], 'alpha.db'))
+        alpha = json.loads(client.get('/meetings', headers={'X-Tenant': 'alpha'}).data)
+        assert [meeting['title'] for meeting in alpha] == ['Alpha Planning']
+        assert json.loads(client.get('/meetings').data) == []
+        assert client.get('/meetings', headers={'X-Tenant': '../etc'}).status_code == 400
+        
+        # Requests only open existing shards
+        assert client.get('/meetings', headers={'X-Tenant': 'gamma'}).status_code == 404
+        assert client.post('/search', json={'query': 'planning', 'tenants': ['alpha', 'gamma']}).status_code == 404
+        assert not os.path.exists(os.path.join(app.config['TENANT_DATA_FOLDER'], 'gamma.db'))
+        
+        embedding_calls = mock_openai['embeddings'].call_count
+        response = client.post('/search', json={'query': 'planning', 'tenants': ['alpha', 'beta']})
+        assert response.status_code == 200
+        results = json.loads(response.data)
+        assert sorted((result['tenant'], result['meeting_title']) for result in results) == [
+            ('alpha', 'Alpha Planning'), ('beta', 'Beta Planning')]
+        assert mock_openai['embeddings'].call_count == embedding_calls + 1  # embedded once for all shards
+        
+        limited = client.post('/search', json={'query': 'planning', 'tenants': ['alpha', 'beta'], 'limit': 1})
+        assert len(json.loads(limited.data)) == 1
+        assert client.post('/search', json={'query': 'planning', 'tenants': 'alpha'}).status_code == 400
+    
+    @patch('requests.get')
+    def test_fine_tune_exports_kept_per_tenant(self, mock_requests, client, upload_meeting):
+        """Test tenants exporting in turn each get their own complete JSONL file"""
+        from app import open_tenant_shard
+        mock_requests.return_value.content = b'fake image data'
+        exports = {}
+        for tenant in ('alpha', 'beta', 'alpha'):
+            open_tenant_shard(tenant, create=True)
+            upload_meeting(f'{tenant.title()} Export', tenant=tenant)
+            assert client.post('/fine-tune-data', headers={'X-Tenant': tenant}).status_code == 200
+            response = client.get('/fine-tune-data/export', headers={'X-Tenant': tenant})
+            assert response.status_code == 200
+            exports[tenant] = response.data.decode().splitlines()
+        
+        # Two examples per meeting: alpha's second export appended to its own first one
+        assert len(exports['alpha']) == 4 and len(exports['beta']) == 2
+        assert os.path.exists(os.path.join(os.path.dirname(app.config['FINE_TUNE_EXPORT_PATH']), 'beta',
+                                           'fine_tune.jsonl'))
+    
+    def test_reindex_jobs_kept_per_tenant(self, client):
+        """Test a re-index running in one tenant neither blocks nor shows up in another"""
+        import threading
+        import time
+        import app as app_module
+        from app import open_tenant_shard
+        for tenant in ('alpha', 'beta'):
+            open_tenant_shard(tenant, create=True)
+        release = threading.Event()
+        
+        with patch.object(app_module, 'reindex_embeddings', side_effect=lambda: release.wait(5)):
+            assert client.post('/reindex', headers={'X-Tenant': 'alpha'}).status_code == 202
+            assert client.post('/reindex', headers={'X-Tenant': 'alpha'}).status_code == 409
+            beta = json.loads(client.get('/reindex', headers={'X-Tenant': 'beta'}).data)
+            assert not beta['running'] and beta['tenant'] == 'beta'
+            assert client.post('/reindex', headers={'X-Tenant': 'beta'}).status_code == 202
+            release.set()
+        
+        for tenant in ('alpha', 'beta'):
+            for _ in range(50):
+                state = json.loads(client.get('/reindex', headers={'X-Tenant': tenant}).data)
+                if not state['running']:
+                    break
+                time.sleep(0.05)
+            assert state['tenant'] == tenant and state['finished_at']
+    
+    def test_shards_opened_lazily_with_lru(self, tmp_path):
+        """Test shards are initialized once per process and the least recently used is closed"""
+        from shards import ShardManager
+        initialized = []
+        manager = ShardManager(max_open=2)
+        
+        def open_shard(tenant):
+            return manager.open(tenant, str(tmp_path / f'{tenant}.db'), lambda shard: initialized.append(shard.tenant),
+                                create=True)
+        
+        first = open_shard('a')
+        open_shard('b')
+        assert open_shard('a') is first
+        open_shard('c')
+        
+        assert manager.tenants() == ['a', 'c']
+        assert open_shard('b') is not None and manager.tenants() == ['c', 'b']
+        assert initialized == ['a', 'b', 'c']
+
+class TestSimilarMeetings:
+    """Test meeting centroids and the precomputed similar-meetings lists"""
+    
+    def _neighbor_lists(self):
+        conn = sqlite3.connect(app.config['DATABASE'])
+        rows = conn.execute('''
+            SELECT meeting_id, neighbor_id FROM meeting_neighbors ORDER BY meeting_id, similarity DESC
+        ''').fetchall()
+        conn.close()
+        lists = {}
+        for meeting_id, neighbor_id in rows:
+            lists.setdefault(meeting_id, []).append(neighbor_id)
+        return lists
+    
+    @patch('requests.get')
+    def test_similar_meetings_ranked(self, mock_requests, client, upload_meeting):
+        """Test neighbors are ordered by centroid similarity and exclude the meeting itself"""
+        mock_requests.return_value.content = b'fake image data'
+        budget = upload_meeting('Budget', embedding=[1.0, 0.0, 0.0])
+        finance = upload_meeting('Finance', embedding=[0.9, 0.1, 0.0])
+        hiring = upload_meeting('Hiring', embedding=[0.0, 0.0, 1.0])
+        
+        response = client.get(f'/meeting/{budget}/similar')
+        assert response.status_code == 200
+        similar = json.loads(response.data)['similar']
+        assert [item['meeting_id'] for item in similar] == [finance, hiring]
+        assert similar[0]['title'] == 'Finance'
+        assert similar[0]['similarity'] > 0.99
+        
+        assert len(json.loads(client.get(f'/meeting/{hiring}/similar?limit=1').data)['similar']) == 1
+        assert client.get(f'/meeting/{hiring}/similar?limit=0').status_code == 400
+        assert client.get('/meeting/999/similar').status_code == 404
+    
+    @patch('requests.get')
+    def test_incremental_lists_match_rebuild(self, mock_requests, mock_openai, monkeypatch, upload_meeting):
+        """Test lists maintained at ingest and on re-embedding equal a full recomputation"""
+        import app as app_module
+        mock_requests.return_value.content = b'fake image data'
+        monkeypatch.setattr(app_module, 'SIMILAR_MEETINGS_K', 2)
+        
+        directions = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.7, 0.7, 0.0], [0.9, 0.0, 0.4], [0.0, 0.3, 1.0]]
+        ids = [upload_meeting(f'Meeting {i}', embedding=direction)
+               for i, direction in enumerate(directions)]
+        
+        # Moving one meeting must also fix lists that ranked its old centroid
+        mock_openai['embeddings'].return_value = MagicMock(data=[MagicMock(embedding=[0.0, 0.1, 1.0])])
+        app_module.create_meeting_embeddings(ids[0], 'moved transcript', replace_existing=True)
+        incremental = self._neighbor_lists()
+        assert all(len(neighbors) == 2 for neighbors in incremental.values())
+        
+        conn = app_module.get_db_connection()
+        app_module.rebuild_meeting_similarity(conn.cursor())
+        conn.commit()
+        conn.close()
+        assert self._neighbor_lists() == incremental
+
+class TestRetention:
+    """Test meeting deletion, audio tiering and database vacuuming"""
+    
+    def _query(self, sql, params=()):
+        conn = sqlite3.connect(app.config['DATABASE'])
+        rows = conn.execute(sql, params).fetchall()
+        conn.close()
+        return rows
+    
+    @patch('requests.get')
+    def test_delete_meeting_cascades(self, mock_requests, client, upload_meeting):
+        """Test DELETE removes rows, neighbor entries, files and analytics contributions"""
+        import app as app_module
+        mock_requests.return_value.content = b'fake image data'
+        keep = upload_meeting('Keep', action_items=[
+            {'task': 'Ship it', 'owner': 'Alice', 'deadline': 'Friday', 'priority': 'High'}
+        ])
+        doomed = upload_meeting('Doomed')
+        audio_path = self._query('SELECT audio_file_path FROM meetings WHERE id = ?', (doomed,))[0][0]
+        assert os.path.exists(audio_path)
+        client.post('/search', json={'query': 'test meeting'})
+        
+        response = client.delete(f'/meeting/{doomed}')
+        assert response.status_code == 200
+        assert json.loads(response.data)['removed']['action_items'] == 1
+        
+        assert client.get(f'/meeting/{doomed}').status_code == 404
+        assert client.delete(f'/meeting/{doomed}').status_code == 404
+        assert not os.path.exists(audio_path)
+        for table in ('meeting_embeddings', 'action_items', 'decisions', 'meeting_vectors'):
+            assert self._query(f'SELECT COUNT(*) FROM {table} WHERE meeting_id = ?', (doomed,))[0][0] == 0
+        assert self._query('SELECT COUNT(*) FROM meeting_neighbors WHERE ? IN (meeting_id, neighbor_id)',
+                           (doomed,))[0][0] == 0
+        assert json.loads(client.get(f'/meeting/{keep}/similar').data)['similar'] == []
+        
+        # The cached result for the query must not resurface the deleted meeting
+        results = json.loads(client.post('/search', json={'query': 'test meeting'}).data)
+        assert {result['meeting_id'] for result in results} == {keep}
+        
+        incremental = self._query('SELECT * FROM analytics_totals ORDER BY name')
+        owners = self._query('SELECT * FROM analytics_owners ORDER BY owner')
+        conn = app_module.get_db_connection()
+        app_module.rebuild_analytics_stats(conn)
+        conn.commit()
+        conn.close()
+        assert self._query('SELECT * FROM analytics_totals ORDER BY name') == pytest.approx(incremental)
+        assert self._query('SELECT * FROM analytics_owners ORDER BY owner') == owners
+    
+    @patch('requests.get')
+    def test_delete_reverses_spend_in_booked_week(self, mock_requests, client, upload_meeting):
+        """Test deleting a meeting reverses each amount in its week and keeps weeks holding other spend"""
+        import app as app_module
+        mock_requests.return_value.content = b'fake image data'
+        with patch.object(app_module, 'meeting_week', return_value='2024-W01'):
+            first = upload_meeting('First')
+            second = upload_meeting('Second')
+        with patch.object(app_module, 'meeting_week', return_value='2024-W05'):
+            app_module.store_meeting_embeddings(second, {
+                'model': app.config['EMBEDDING_MODEL'], 'chunk_size': app.config['EMBEDDING_CHUNK_SIZE'],
+                'items': [(0, 'Re-embedded chunk', [0.1] * 1536)], 'api_cost': 0.5
+            }, replace_existing=True)
+        
+        weeks = lambda: {week: (meetings, round(spend, 6)) for week, meetings, spend in
+                         self._query('SELECT week, meetings, api_spend FROM analytics_weekly')}
+        before = weeks()
+        assert before['2024-W05'] == (0, 0.5)
+        
+        client.delete(f'/meeting/{first}')
+        after = weeks()
+        assert after['2024-W05'] == (0, 0.5)
+        assert after['2024-W01'][0] == 1 and after['2024-W01'][1] < before['2024-W01'][1]
+        
+        client.delete(f'/meeting/{second}')
+        assert weeks() == {}
+        assert abs(json.loads(client.get('/analytics').data)['api_spend_usd']) < 1e-6
+    
+    @patch('requests.get')
+    def test_retention_policy(self, mock_requests, upload_meeting):
+        """Test old audio is archived to the cold folder, then dropped, then the meeting expires"""
+        from retention import apply_retention_policy
+        mock_requests.return_value.content = b'fake image data'
+        meeting_id = upload_meeting('Quarterly Review', audio=b'RIFF fake audio data ' * 500, extension='wav')
+        hot_path = self._query('SELECT audio_file_path FROM meetings WHERE id = ?', (meeting_id,))[0][0]
+        
+        visual_path = self._query('SELECT visual_summary_path FROM meetings WHERE id = ?', (meeting_id,))[0][0]
+        assert visual_path.startswith(app.config['VISUALS_FOLDER'])
+        os.utime(visual_path, (0, 0))
+        
+        orphan = os.path.join(app.config['UPLOAD_FOLDER'], 'orphan.wav')
+        orphan_visual = os.path.join(app.config['VISUALS_FOLDER'], 'orphan.png')
+        for path in (orphan, orphan_visual):
+            with open(path, 'wb') as f:
+                f.write(b'left behind by a failed ingest')
+            os.utime(path, (0, 0))
+        
+        conn = sqlite3.connect(app.config['DATABASE'])
+        conn.execute("UPDATE meetings SET created_at = datetime('now', '-40 days')")
+        conn.commit()
+        conn.close()
+        
+        summary = apply_retention_policy()
+        assert summary['audio_archived'] == 1 and summary['orphans_removed'] == 2
+        assert os.path.exists(visual_path) and not os.path.exists(orphan_visual)
+        cold_path, tier = self._query('SELECT audio_file_path, audio_tier FROM meetings WHERE id = ?', (meeting_id,))[0]
+        assert tier == 'cold' and os.path.exists(cold_path)
+        assert not os.path.exists(hot_path) and not os.path.exists(orphan)
+        assert summary['bytes_freed'] > 0
+        
+        app.config['AUDIO_RETENTION_DAYS'] = 30
+        assert apply_retention_policy()['audio_dropped'] == 1
+        assert self._query('SELECT audio_file_path, audio_tier FROM meetings')[0] == (None, 'dropped')
+        assert not os.path.exists(cold_path)
+        
+        app.config['MEETING_RETENTION_DAYS'] = 30
+        assert apply_retention_policy()['meetings_deleted'] == 1
+        assert self._query('SELECT COUNT(*) FROM meetings')[0][0] == 0
+    
+    @patch('requests.get')
+    def test_drop_audio_after_transcription(self, mock_requests, upload_meeting):
+        """Test the uploaded recording is removed once the meeting is stored, if configured"""
+        mock_requests.return_value.content = b'fake image data'
+        app.config['DROP_AUDIO_AFTER_TRANSCRIPTION'] = True
+        meeting_id = upload_meeting('Ephemeral')
+        
+        assert self._query('SELECT audio_file_path, audio_tier FROM meetings WHERE id = ?',
+                           (meeting_id,))[0] == (None, 'dropped')
+        assert os.listdir(app.config['UPLOAD_FOLDER']) == []
+    
+    def test_incremental_vacuum(self, client):
+        """Test new databases use incremental auto_vacuum and deleted pages are reclaimed"""
+        from app import vacuum_database
+        conn = sqlite3.connect(app.config['DATABASE'])
+        assert conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+        conn.executemany('INSERT INTO meetings (title, transcription) VALUES (?, ?)',
+                         [('Filler', 'x' * 4000) for _ in range(200)])
+        conn.commit()
+        conn.execute('DELETE FROM meetings')
+        conn.commit()
+        assert conn.execute('PRAGMA freelist_count').fetchone()[0] > 0
+        conn.close()
+        
+        assert vacuum_database()['pages_freed'] > 0
+        conn = sqlite3.connect(app.config['DATABASE'])
+        assert conn.execute('PRAGMA freelist_count').fetchone()[0] == 0
+        conn.close()
+
+class TestCheckpointedPipeline:
+    """Test per-stage checkpoints, meeting status and resuming unfinished meetings"""
+    
+    @patch('requests.get')
+    def test_failed_stage_resumes_from_checkpoints(self, mock_requests, client, mock_openai):
+        """Test a failed embeddings stage is retried without paying for Whisper or GPT-4 again"""
+        mock_requests.return_value.content = b'fake image data'
+        mock_openai['embeddings'].side_effect = Exception('Embeddings unavailable')
+        
+        with tempfile.NamedTemporaryFile(suffix='.wav') as temp_file:
+            temp_file.write(b'fake audio data')
+            temp_file.seek(0)
+            response = client.post('/upload-meeting', data={
+                'title': 'Interrupted',
+                'audio_file': (temp_file, 'interrupted.wav')
+            })
+        assert response.status_code == 500
+        failure = json.loads(response.data)
+        meeting_id = failure['meeting_id']
+        assert failure['resume_url'] == f'/meeting/{meeting_id}/resume'
+        
+        details = json.loads(client.get(f'/meeting/{meeting_id}').data)
+        assert details['status'] == 'visualized' and 'Embeddings unavailable' in details['pipeline_error']
+        assert json.loads(client.get('/meetings').data) == []
+        assert json.loads(client.get('/analytics').data)['total_meetings'] == 0
+        
+        mock_openai['embeddings'].side_effect = None
+        chat_calls = mock_openai['chat'].call_count
+        assert client.post(f'/meeting/{meeting_id}/resume').status_code == 200
+        assert mock_openai['transcribe'].call_count == 1
+        assert mock_openai['chat'].call_count == chat_calls
+        assert mock_openai['images'].call_count == 1
+        
+        details = json.loads(client.get(f'/meeting/{meeting_id}').data)
+        assert details['status'] == 'complete' and details['pipeline_error'] is None
+        assert details['summary'] == 'This is a comprehensive meeting summary.'
+        assert [meeting['id'] for meeting in json.loads(client.get('/meetings').data)] == [meeting_id]
+        assert json.loads(client.get('/analytics').data)['total_meetings'] == 1
+        assert json.loads(client.post('/search', json={'query': 'test'}).data)[0]['meeting_id'] == meeting_id
+        
+        # Resuming a complete meeting is a no-op
+        embedding_calls = mock_openai['embeddings'].call_count
+        assert client.post(f'/meeting/{meeting_id}/resume').status_code == 200
+        assert mock_openai['embeddings'].call_count == embedding_calls
+        conn = sqlite3.connect(app.config['DATABASE'])
+        assert conn.execute('SELECT COUNT(*) FROM pipeline_checkpoints').fetchone()[0] == 0
+        conn.close()
+    
+    @patch('requests.get')
+    def test_resume_sweeps_interrupted_meetings(self, mock_requests, client, mock_openai):
+        """Test the resume sweep only picks up failed or idle meetings, and deleting one leaves analytics alone"""
+        import app as app_module
+        mock_requests.return_value.content = b'fake image data'
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        paths = []
+        for name in ('crashed.wav', 'running.wav', 'abandoned.wav'):
+            paths.append(os.path.join(app.config['UPLOAD_FOLDER'], name))
+            with open(paths[-1], 'wb') as f:
+                f.write(b'fake audio data')
+        crashed, running, abandoned = [app_module.create_pending_meeting(os.path.basename(path), '', path)
+                                       for path in paths]
+        
+        conn = sqlite3.connect(app.config['DATABASE'])
+        conn.execute("UPDATE meetings SET status_updated_at = datetime('now', '-2 hours') WHERE id IN (?, ?)",
+                     (crashed, abandoned))
+        conn.commit()
+        assert app_module.find_unfinished_meetings() == [crashed, abandoned]
+        assert app_module.find_unfinished_meetings(include_recent=True) == [crashed, running, abandoned]
+        
+        assert app_module.delete_meeting(abandoned) is not None
+        summary = app_module.resume_unfinished_meetings()
+        assert summary['meetings'] == 1 and summary['resumed'] == 1
+        assert conn.execute('SELECT id, status FROM meetings ORDER BY id').fetchall() == [
+            (crashed, 'complete'), (running, 'pending')]
+        conn.close()
+        assert json.loads(client.get('/analytics').data)['total_meetings'] == 1
+
+    @patch('requests.get')
+    def test_resume_claims_meeting_once(self, mock_requests, client, mock_openai):
+        """Test a meeting still being processed cannot be resumed twice, nor completed twice"""
+        import app as app_module
+        mock_requests.return_value.content = b'fake image data'
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        path = os.path.join(app.config['UPLOAD_FOLDER'], 'busy.wav')
+        with open(path, 'wb') as f:
+            f.write(b'fake audio data')
+        meeting_id = app_module.create_pending_meeting('Busy', '', path)
+        
+        # Freshly created: its own pipeline is running
+        assert client.post(f'/meeting/{meeting_id}/resume').status_code == 409
+        assert mock_openai['transcribe'].call_count == 0
+        
+        app_module.record_pipeline_error(meeting_id, 'worker died')
+        assert app_module.claim_meeting(meeting_id)
+        assert not app_module.claim_meeting(meeting_id)  # the first claim holds
+        
+        with patch.object(app_module, 'complete_meeting', wraps=app_module.complete_meeting) as complete:
+            app_module.resume_meeting(meeting_id)
+        checkpoints = complete.call_args[0][1]
+        conn = sqlite3.connect(app.config['DATABASE'])
+        items = conn.execute('SELECT COUNT(*) FROM action_items WHERE meeting_id = ?', (meeting_id,)).fetchone()[0]
+        conn.close()
+        
+        # A late second pipeline finishing the same meeting changes nothing
+        assert app_module.complete_meeting(meeting_id, checkpoints) is None
+        conn = sqlite3.connect(app.config['DATABASE'])
+        assert conn.execute('SELECT COUNT(*) FROM action_items WHERE meeting_id = ?',
+                            (meeting_id,)).fetchone()[0] == items
+        conn.close()
+        assert json.loads(client.get('/analytics').data)['total_meetings'] == 1
+
+class TestAdmissionControl:
+    """Test the audio-minute ingest budget, its queue and 429 responses"""
+    
+    def test_shortest_waiting_recording_admitted_first(self):
+        """Test waiters are admitted shortest first, and time out or overflow the queue"""
+        import threading
+        from admission import AdmissionController
+        controller = AdmissionController(budget_minutes=60, max_queued=2)
+        running = controller.acquire(50, timeout=0)
+        assert running is not None and controller.acquire(20, timeout=0) is None
+        
+        admitted = []
+        def wait(minutes):
+            ticket = controller.acquire(minutes, timeout=5)
+            admitted.append(minutes)
+            controller.release(ticket)
+        waiters = [threading.Thread(target=wait, args=(minutes,)) for minutes in (40, 15)]
+        for waiter in waiters:
+            waiter.start()
+            while controller.queued < waiters.index(waiter) + 1:
+                pass
+        
+        # Queue is full, and a 90 minute recording costs the whole budget
+        assert controller.acquire(12, timeout=1) is None
+        assert controller.cost(90) == 60
+        assert controller.retry_after(40) >= 1
+        
+        controller.release(running)
+        for waiter in waiters:
+            waiter.join()
+        assert admitted == [15, 40]
+        assert controller.in_flight_minutes == 0 and controller.queued == 0
+        assert controller.acquire(10, timeout=0.05) is not None
+    
+    @patch('requests.get')
+    def test_upload_rejected_with_retry_after(self, mock_requests, client, mock_openai):
+        """Test uploads over budget get 429 with Retry-After and leave no file behind"""
+        import app as app_module
+        mock_requests.return_value.content = b'fake image data'
+        controller = app_module.INGEST_ADMISSION
+        app.config['INGEST_QUEUE_TIMEOUT'] = 0
+        busy = controller.acquire(controller.budget_minutes, timeout=0)
+        
+        def upload():
+            with tempfile.NamedTemporaryFile(suffix='.mp3') as temp_file:
+                temp_file.write(b'fake audio data')
+                temp_file.seek(0)
+                return client.post('/upload-meeting', data={
+                    'title': 'Busy',
+                    'audio_file': (temp_file, 'busy.mp3')
+                })
+        
+        try:
+            response = upload()
+            assert response.status_code == 429
+            assert int(response.headers['Retry-After']) >= 1
+            assert json.loads(response.data)['retry_after'] == int(response.headers['Retry-After'])
+            assert os.listdir(app.config['UPLOAD_FOLDER']) == []
+            assert json.loads(client.get('/ready').data)['ingest']['in_flight_minutes'] == controller.budget_minutes
+            assert 'ingest_in_flight_audio_minutes ' in client.get('/metrics').data.decode()
+        finally:
+            controller.release(busy)
+        
+        assert upload().status_code == 200
+        assert controller.in_flight_minutes == 0
+        assert 'ingest_queue_depth 0' in client.get('/metrics').data.decode()
+
 class TestFineTuning:
     """Test fine-tuning functionality"""
     
@@ -246,6 +1698,72 @@ class TestFineTuning:
         assert response.status_code == 200
         data = json.loads(response.data)
         assert 'examples_count' in data
+        
+        # A second run only exports meetings added since the first
+        rerun = json.loads(client.post('/fine-tune-data').data)
+        assert rerun['examples_count'] == 0
+        assert rerun['total_examples'] == data['examples_count']
+    
+    @patch('requests.get')
+    def test_fine_tune_export_download(self, mock_requests, client, mock_openai):
+        """Test the JSONL export is chat formatted, incremental and range-able, and GET never writes it"""
+        mock_requests.return_value.content = b'fake image data'
+        assert client.get('/fine-tune-data/export').status_code == 404
+        
+        for name in ('first.mp3', 'second.mp3'):
+            with tempfile.NamedTemporaryFile(suffix='.mp3') as temp_file:
+                temp_file.write(b'fake audio data')
+                temp_file.seek(0)
+                client.post('/upload-meeting', data={
+                    'title': 'Export Meeting',
+                    'audio_file': (temp_file, name)
+                })
+            
+            client.post('/fine-tune-data')
+            response = client.get('/fine-tune-data/export')
+            assert response.status_code == 200
+        
+        lines = response.data.decode().splitlines()
+        assert len(lines) == 4
+        example = json.loads(lines[0])
+        assert [message['role'] for message in example['messages']] == ['system', 'user', 'assistant']
+        assert example['messages'][2]['content'] == 'This is a comprehensive meeting summary.'
+        
+        partial = client.get('/fine-tune-data/export', headers={'Range': 'bytes=10-'})
+        assert partial.status_code == 206
+        assert partial.data == response.data[10:]
+        
+        with tempfile.NamedTemporaryFile(suffix='.mp3') as temp_file:
+            temp_file.write(b'fake audio data')
+            temp_file.seek(0)
+            client.post('/upload-meeting', data={'title': 'Export Meeting', 'audio_file': (temp_file, 'third.mp3')})
+        assert client.get('/fine-tune-data/export').data == response.data
+
+    @patch('requests.get')
+    def test_export_includes_meetings_completed_late(self, mock_requests, client, mock_openai, tmp_path):
+        """Test a meeting created before others but completed after an export is still exported"""
+        from app import create_pending_meeting, get_db_connection, record_pipeline_error
+        mock_requests.return_value.content = b'fake image data'
+        recording = tmp_path / 'late.mp3'
+        recording.write_bytes(b'fake audio data')
+        late = create_pending_meeting('Late Meeting', '', str(recording))
+        record_pipeline_error(late, 'interrupted')
+        
+        with tempfile.NamedTemporaryFile(suffix='.mp3') as temp_file:
+            temp_file.write(b'fake audio data')
+            temp_file.seek(0)
+            client.post('/upload-meeting', data={'title': 'Early Meeting', 'audio_file': (temp_file, 'early.mp3')})
+        assert json.loads(client.post('/fine-tune-data').data)['examples_count'] == 2
+        
+        assert client.post(f'/meeting/{late}/resume').status_code == 200
+        assert json.loads(client.post('/fine-tune-data').data)['examples_count'] == 2
+        
+        conn = get_db_connection()
+        exported = {row[0] for row in conn.execute('SELECT DISTINCT meeting_id FROM fine_tuning_data')}
+        conn.close()
+        assert late in exported
+        with open(app.config['FINE_TUNE_EXPORT_PATH']) as export_file:
+            assert len(export_file.readlines()) == 4
 
 class TestErrorHandling:
     """Test error handling scenarios"""
@@ -255,7 +1773,7 @@ class TestErrorHandling:
         response = client.post('/search', data='invalid json')
         assert response.status_code in [400, 415]  # Bad request or unsupported media type
     
-    @patch('openai.audio.transcriptions.create')
+    @patch('openai.resources.audio.AsyncTranscriptions.create', new_callable=AsyncMock)
     def test_whisper_api_failure(self, mock_transcribe, client):
         """Test handling of Whisper API failure"""
         mock_transcribe.side_effect = Exception("API Error")
@@ -0,0 +1,116 @@
+"""
+Topic clustering for KIU Meeting Intelligence System
+
+Mini-batch k-means (Sculley, 2010) over normalized chunk embeddings, in
+NumPy. Centroids are seeded with k-means++ once enough chunks exist; after
+that every newly ingested meeting is one mini-batch that nudges the
+centroids its chunks are assigned to, so the archive is never refit from
+scratch. Each topic also keeps running counts of the words in its chunks,
+which are used to label it.
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+TERMS_KEPT = 50  # word counts kept per topic
+MIN_LEARNING_RATE = 0.01  # lets old centroids keep following the archive as topics drift
+WORD_PATTERN = re.compile(r"[a-z][a-z'-]{3,}")
+STOPWORDS = frozenset('''
+    about above after again also because been before being between both could does doing down during
+    each even from further going have having here into just know like make more most much need only
+    other over really right same should some still such than that their them then there these they
+    thing things think this those through very want well were what when where which while will with
+    would yeah your yours okay
+'''.split())
+
+def normalize(vectors):
+    """Rows scaled to unit length as float32, so dot products are cosine similarities"""
+    import numpy as np
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+def assign(centroids, vectors):
+    """Index of the nearest centroid for each (normalized) vector"""
+    return (vectors @ centroids.T).argmax(axis=1)
+
+def seed_centroids(vectors, k: int, rng):
+    """k-means++ seeding on cosine distance"""
+    import numpy as np
+
+    centroids = [vectors[rng.integers(len(vectors))]]
+    distances = 1 - vectors @ centroids[0]
+    for _ in range(1, k):
+        weights = np.maximum(distances, 0) ** 2
+        total = weights.sum()
+        choice = rng.choice(len(vectors), p=weights / total) if total > 0 else rng.integers(len(vectors))
+        centroids.append(vectors[choice])
+        distances = np.minimum(distances, 1 - vectors @ vectors[choice])
+    return np.vstack(centroids).astype(np.float32)
+
+def minibatch_update(centroids, counts, batch):
+    """One mini-batch step, in place; returns the batch's labels
+
+    The batch is assigned to the current centroids first. Each centroid
+    then moves towards its points with a per-centroid learning rate of
+    1/(points seen), floored at MIN_LEARNING_RATE, and is renormalized.
+    """
+    import numpy as np
+
+    labels = assign(centroids, batch)
+    for label, vector in zip(labels, batch):
+        counts[label] += 1
+        rate = max(1.0 / counts[label], MIN_LEARNING_RATE)
+        centroids[label] = (1 - rate) * centroids[label] + rate * vector
+    for label in np.unique(labels):
+        centroids[label] /= max(float(np.linalg.norm(centroids[label])), 1e-12)
+    return labels
+
+def fit(vectors, k: int, batch_size: int = 256, iterations: int = 50, seed: int = 0) -> Tuple:
+    """Seed and fit k centroids on a sample of vectors; returns (centroids, counts)"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    centroids = seed_centroids(vectors, k, rng)
+    counts = np.zeros(k, dtype=np.int64)
+    for _ in range(iterations):
+        batch = vectors[rng.choice(len(vectors), size=min(batch_size, len(vectors)), replace=False)]
+        minibatch_update(centroids, counts, batch)
+    return centroids, counts
+
+def distribution(labels) -> Dict[int, float]:
+    """Share of a meeting's chunks in each topic it touches"""
+    shares = Counter(int(label) for label in labels)
+    return {topic: count / len(labels) for topic, count in sorted(shares.items())}
+
+def chunk_terms(text: str) -> Counter:
+    return Counter(word for word in WORD_PATTERN.findall((text or '').lower()) if word not in STOPWORDS)
+
+def terms_by_topic(labels, chunks: List[str]) -> Dict[int, Counter]:
+    """Word counts of a batch of chunks, grouped by the topic each chunk was assigned to"""
+    grouped = {}
+    for label, chunk in zip(labels, chunks):
+        grouped.setdefault(int(label), Counter()).update(chunk_terms(chunk))
+    return grouped
+
+def merge_terms(terms: Dict[str, int], new: Counter) -> Dict[str, int]:
+    """Add word counts to a topic's, keeping only the TERMS_KEPT most frequent"""
+    merged = Counter(terms)
+    merged.update(new)
+    return dict(merged.most_common(TERMS_KEPT))
+
+def subtract_terms(terms: Dict[str, int], removed: Dict[str, int]) -> Dict[str, int]:
+    """Take word counts back out of a topic's, dropping words that reach zero"""
+    remaining = Counter(terms)
+    remaining.subtract(removed)
+    return {word: count for word, count in remaining.most_common() if count > 0}
+
+def keywords(topic_terms: List[Dict[str, int]], count: int = 5) -> List[List[str]]:
+    """Most distinctive words per topic: frequency weighted by how few topics share the word"""
+    spread = Counter(word for terms in topic_terms for word in terms)
+    labels = []
+    for terms in topic_terms:
+        scored = sorted(terms, key=lambda word: (-terms[word] * math.log(1 + len(topic_terms) / spread[word]), word))
+        labels.append(scored[:count])
+    return labels